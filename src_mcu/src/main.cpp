@@ -8,6 +8,45 @@
   DS18B20:
     Temperature
     Pins: DI5
+    The conversion runs in the background, taking ~750 ms at 12-bit
+    resolution. A new conversion is started as soon as the previous one has
+    completed. Each reading reports the latest completed value along with its
+    age, instead of waiting for a fresh conversion.
+
+  Serial commands:
+    id?         Reply with the identity string, ending with the firmware
+                version: "Arduino, Dodecahedron logger, v<FIRMWARE_VERSION>"
+    ?           Reply with a single reading:
+                  millis, ds18_temp, ds18_age, bme280_temp, bme280_humi,
+                  bme280_pres
+    stream <N>  Start pushing a reading every N ms without being asked
+    sample <N>  Start taking a reading every N ms into the ring buffer only,
+                to be fetched later on with `dump`. Clears the ring buffer.
+    halt        Stop pushing or sampling readings
+    dump <S>    Reply with all readings in the ring buffer having a sequence
+                number of S or higher: a text line with the number of
+                readings, followed by that many binary frames
+    fmt bin     Send readings as binary frames, see below
+    fmt txt     Send readings as tab-separated text (default)
+
+  Streaming, sampling and the reply format are reset to their defaults when
+  the host closes the serial port.
+
+  Every reading taken, whether queried, streamed or sampled, gets stored in a
+  ring buffer holding the last `RING_LEN` readings. Hence, the host can stall
+  for a while without losing any data, as long as it catches up with `dump`.
+
+  Binary frame, little-endian and without padding, see also
+  `src_python/dodeca_wire_protocol.py`:
+    sync        2 bytes     0xAA 0x55
+    seq         uint32      Incremented by one for each reading taken
+    millis      uint32      Arduino time [ms]
+    ds18_temp   float32     ['C]
+    ds18_age    uint32      Age of `ds18_temp` [ms]
+    bme280_temp float32     ['C]
+    bme280_humi float32     [%]
+    bme280_pres float32     [Pa]
+    crc         uint16      CRC-16/CCITT-FALSE over `seq` up to `crc`
 
   The RGB LED of the Feather M4 will indicate its status:
   * Blue : We're setting up
@@ -32,6 +71,10 @@
 #include <SPI.h>
 #include <Wire.h>
 
+// Bumped on each change of the serial protocol, see `id?`. Version 2 added
+// `ds18_age` to the readings, the ring buffer and the binary frames.
+#define FIRMWARE_VERSION 2
+
 DvG_SerialCommand sc(Serial); // Instantiate serial command listener
 
 Adafruit_NeoPixel neo(1, PIN_NEOPIXEL, NEO_GRB + NEO_KHZ800);
@@ -43,11 +86,121 @@ OneWire oneWire(PIN_DS18B20);
 DallasTemperature ds18(&oneWire);
 Adafruit_BME280 bme;
 
+#define DS18_CONVERSION_MS 750 // Conversion time at 12-bit resolution
+uint32_t tick_ds18_request = 0; // [ms] Start of the running conversion
+uint32_t tick_ds18_done = 0;    // [ms] Completion of the latest conversion
+
 float ds18_temp(NAN);   // ['C]
 float bme280_temp(NAN); // ['C]
 float bme280_humi(NAN); // [%]
 float bme280_pres(NAN); // [Pa]
 
+// Timed readings, see commands `stream` and `sample`
+bool sampling = false;           // Take readings on our own timer?
+bool streaming = false;          // Also push each timed reading to the host?
+uint32_t sample_interval = 1000; // [ms]
+uint32_t tick_sample = 0;        // [ms] Time of the last timed reading
+
+// Binary framed wire protocol
+bool binary_frames = false;
+
+struct __attribute__((packed)) Frame {
+  uint8_t sync[2];
+  uint32_t seq;
+  uint32_t millis;
+  float ds18_temp;
+  uint32_t ds18_age;
+  float bme280_temp;
+  float bme280_humi;
+  float bme280_pres;
+  uint16_t crc;
+};
+
+// Ring buffer of the last readings, indexed by sequence number
+#define RING_LEN 2048 // 64 kB
+Frame ring[RING_LEN];
+uint32_t seq_next = 0;  // Sequence number of the next reading
+uint32_t seq_first = 0; // Sequence number of the oldest valid reading
+
+// CRC-16/CCITT-FALSE: polynomial 0x1021, initial value 0xFFFF
+uint16_t crc16(const uint8_t *data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (uint8_t i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// -----------------------------------------------------------------------------
+//    take_reading
+// -----------------------------------------------------------------------------
+
+// Read out all sensors and store the reading in the ring buffer
+Frame &take_reading() {
+  Frame &f = ring[seq_next % RING_LEN];
+  uint32_t now = millis();
+
+  bme280_temp = bme.readTemperature();
+  bme280_humi = bme.readHumidity();
+  bme280_pres = bme.readPressure();
+
+  f.sync[0] = 0xAA;
+  f.sync[1] = 0x55;
+  f.seq = seq_next;
+  f.millis = now;
+  f.ds18_temp = ds18_temp;
+  f.ds18_age = now - tick_ds18_done;
+  f.bme280_temp = bme280_temp;
+  f.bme280_humi = bme280_humi;
+  f.bme280_pres = bme280_pres;
+  f.crc = crc16((uint8_t *)&f.seq, offsetof(Frame, crc) - offsetof(Frame, seq));
+
+  seq_next++;
+  if (seq_next - seq_first > RING_LEN) {
+    seq_first = seq_next - RING_LEN;
+  }
+
+  return f;
+}
+
+// -----------------------------------------------------------------------------
+//    send_reading
+// -----------------------------------------------------------------------------
+
+void send_reading(const Frame &f) {
+  if (binary_frames) {
+    Serial.write((const uint8_t *)&f, sizeof(Frame));
+
+  } else {
+    Serial.println(String(f.millis) + '\t' + String(f.ds18_temp, 1) + '\t' +
+                   String(f.ds18_age) + '\t' + String(f.bme280_temp, 1) +
+                   '\t' + String(f.bme280_humi, 1) + '\t' +
+                   String(f.bme280_pres, 0));
+  }
+}
+
+// -----------------------------------------------------------------------------
+//    dump
+// -----------------------------------------------------------------------------
+
+// Send all readings in the ring buffer from sequence number `seq` onwards
+void dump(uint32_t seq) {
+  uint32_t n_readings;
+
+  if ((int32_t)(seq - seq_first) < 0) {
+    seq = seq_first; // Requested readings have already been overwritten
+  }
+  n_readings = ((int32_t)(seq_next - seq) > 0) ? seq_next - seq : 0;
+
+  Serial.println(n_readings);
+  for (; n_readings > 0; n_readings--, seq++) {
+    Serial.write((const uint8_t *)&ring[seq % RING_LEN], sizeof(Frame));
+  }
+}
+
 // -----------------------------------------------------------------------------
 //    setup
 // -----------------------------------------------------------------------------
@@ -59,6 +212,9 @@ void setup() {
 
   Serial.begin(9600);
   ds18.begin();
+  ds18.setWaitForConversion(false);
+  ds18.requestTemperatures();
+  tick_ds18_request = millis();
 
   // BME280
   while (!bme.begin(0x76)) {
@@ -75,6 +231,16 @@ void setup() {
   neo.show();
 }
 
+// -----------------------------------------------------------------------------
+//    start_sampling
+// -----------------------------------------------------------------------------
+
+void start_sampling(uint32_t interval) {
+  sample_interval = (interval > 0) ? interval : 1; // [ms]
+  sampling = true;
+  tick_sample = millis() - sample_interval; // Take the first reading now
+}
+
 // -----------------------------------------------------------------------------
 //    loop
 // -----------------------------------------------------------------------------
@@ -83,6 +249,22 @@ void loop() {
   char *strCmd; // Incoming serial command string
   uint32_t now;
 
+  // Collect the DS18B20 conversion once completed and start the next one
+  now = millis();
+  if (now - tick_ds18_request >= DS18_CONVERSION_MS) {
+    ds18_temp = ds18.getTempCByIndex(0);
+    tick_ds18_done = now;
+    ds18.requestTemperatures();
+    tick_ds18_request = now;
+  }
+
+  if (!Serial) {
+    // Host has closed the serial port
+    sampling = false;
+    streaming = false;
+    binary_frames = false;
+  }
+
   if (sc.available()) {
     strCmd = sc.getCmd();
 
@@ -90,22 +272,59 @@ void loop() {
     neo.show();
 
     if (strcmp(strCmd, "id?") == 0) {
-      Serial.println("Arduino, Dodecahedron logger");
+      Serial.println("Arduino, Dodecahedron logger, v" +
+                     String(FIRMWARE_VERSION));
+
+    } else if (strncmp(strCmd, "stream", 6) == 0) {
+      start_sampling(strtoul(&strCmd[6], NULL, 10));
+      streaming = true;
+
+    } else if (strncmp(strCmd, "sample", 6) == 0) {
+      start_sampling(strtoul(&strCmd[6], NULL, 10));
+      streaming = false;
+      seq_first = seq_next; // Clear the ring buffer
+
+    } else if (strcmp(strCmd, "halt") == 0) {
+      sampling = false;
+      streaming = false;
+
+    } else if (strncmp(strCmd, "dump", 4) == 0) {
+      dump(strtoul(&strCmd[4], NULL, 10));
+
+    } else if (strcmp(strCmd, "fmt bin") == 0) {
+      binary_frames = true;
+
+    } else if (strcmp(strCmd, "fmt txt") == 0) {
+      binary_frames = false;
 
     } else {
-      now = millis();
-      ds18.requestTemperatures();
-      ds18_temp = ds18.getTempCByIndex(0);
-      bme280_temp = bme.readTemperature();
-      bme280_humi = bme.readHumidity();
-      bme280_pres = bme.readPressure();
-
-      Serial.println(String(now) + '\t' + String(ds18_temp, 1) + '\t' +
-                     String(bme280_temp, 1) + '\t' + String(bme280_humi, 1) +
-                     '\t' + String(bme280_pres, 0));
+      send_reading(take_reading());
     }
 
     neo.setPixelColor(0, neo.Color(0, NEO_DIM, 0)); // Green: Idle
     neo.show();
   }
+
+  if (sampling) {
+    now = millis();
+    if (now - tick_sample >= sample_interval) {
+      // Keep a fixed rate without drift, unless we fell behind by more than
+      // a whole interval
+      tick_sample += sample_interval;
+      if (now - tick_sample >= sample_interval) {
+        tick_sample = now;
+      }
+
+      neo.setPixelColor(0, neo.Color(0, NEO_BRIGHT, 0)); // Green: Flash
+      neo.show();
+
+      Frame &f = take_reading();
+      if (streaming) {
+        send_reading(f);
+      }
+
+      neo.setPixelColor(0, neo.Color(0, NEO_DIM, 0)); // Green: Idle
+      neo.show();
+    }
+  }
 }
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Acquisition core of the Twente Dodecahedron control program, shared by the
+GUI of `main.py` and the headless engine of `dodeca_headless.py`.
+
+It holds the parsing of the Arduino readings, the format of the log file and
+the Julabo circulator, and it does not depend on Qt.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import time
+
+import numpy as np
+
+from dvg_debug_functions import print_fancy_traceback as pft
+from dvg_devices import Julabo_circulator_protocol_RS232 as julabo_protocol
+
+from dodeca_align import SampleHistory
+from dodeca_timing import LOGGED_STAGES, DAQTimings
+from dodeca_wire_protocol import FRAME_SIZE, count_dropped, decode_frames
+
+# Version of the firmware in `src_mcu` that this code expects, reported by the
+# Arduino at the end of its identity string, e.g.
+# "Arduino, Dodecahedron logger, v2". Firmware before version 2 reports no
+# version and sends its readings without `ds18_age`.
+FIRMWARE_VERSION = 2
+
+# Format of a row of data in the text log file
+LOG_ROW_FORMAT = "%.3f\t%.1f\t%.1f\t%.1f\t%.1f\t%.2f\t%.2f\t%.3f\t%.3f\n"
+
+# Units and names of the columns of the log file
+LOG_UNITS = (
+    "[s]\t[±0.5 °C]\t[±0.5 °C]\t[±3 pct]\t[±1 mbar]\t[°C]\t[°C]\t[s]\t[s]"
+)
+LOG_COLUMNS = (
+    "time\tDS_temp\tBME_temp\tBME_humi\tBME_pres\tJulabo_setp\tJulabo_bath"
+    "\tDS_age\tJulabo_age"
+)
+
+# Position of the Julabo readings and their age in a row of the log file
+LOG_JULABO_INDICES = (5, 6)
+LOG_JULABO_AGE_INDEX = 8
+
+# Optional columns holding the DAQ timings of each reading, see
+# `dodeca_timing.py`. Named `DAQ_<stage>`, in [ms].
+LOG_TIMINGS_FORMAT = "\t%.3f" * len(LOGGED_STAGES)
+LOG_TIMINGS_UNITS = "\t[ms]" * len(LOGGED_STAGES)
+LOG_TIMINGS_COLUMNS = "".join("\tDAQ_" + stage for stage in LOGGED_STAGES)
+
+# ------------------------------------------------------------------------------
+#   Arduino state
+# ------------------------------------------------------------------------------
+
+
+class State(object):
+    """Reflects the actual readings, parsed into separate variables, of the
+    Arduino. There should only be one instance of the State class.
+    """
+
+    def __init__(self):
+        self.time = np.nan  # [s]
+        self.ds_temp = np.nan  # ['C]
+        self.ds_age = np.nan  # [s] Age of the DS18B20 reading
+        self.bme_temp = np.nan  # ['C]
+        self.bme_humi = np.nan  # [%]
+        self.bme_pres = np.nan  # [bar]
+
+        # Binary wire protocol bookkeeping
+        self.frame_seq = None  # Sequence number of the last received frame
+        self.n_frames_dropped = 0
+        self.n_frames_corrupt = 0
+
+
+def parse_reading(state: State, reading):
+    """Parse a single reading of the Arduino into the separate variables of
+    `state`. Afterwards, `state.time` holds the Arduino time [s].
+
+    Args:
+        reading (list of float):
+            [millis, ds18_temp, ds18_age, bme280_temp, bme280_humi,
+            bme280_pres] as sent by the Arduino. Firmware before version 2
+            sends no `ds18_age`, which then becomes NaN.
+
+    Raises: An exception when the reading is malformed.
+    """
+    if len(reading) == 5:
+        reading = (reading[0], reading[1], np.nan, *reading[2:])
+
+    (
+        state.time,
+        state.ds_temp,
+        state.ds_age,
+        state.bme_temp,
+        state.bme_humi,
+        state.bme_pres,
+    ) = reading
+    state.time /= 1000  # Arduino time, [msec] to [s]
+    state.ds_age /= 1000  # [msec] to [s]
+    state.bme_pres /= 100  # [Pa] to [mbar]
+
+    # Catch very intermittent DS18B20 sensor errors
+    if state.ds_temp <= -127.0:
+        state.ds_temp = np.nan
+
+
+def check_firmware_version(ard) -> bool:
+    """Check whether the firmware of the Arduino is up to date, see
+    `FIRMWARE_VERSION`, and print a warning if not.
+
+    Returns True if up to date, False otherwise.
+    """
+    _success, reply = ard.query("id?")
+    version = 1  # Reported no version
+    try:
+        fields = reply.split(",")
+        if len(fields) > 2:
+            version = int(fields[2].strip().lstrip("v"))
+    except (AttributeError, ValueError):
+        pass
+
+    if version < FIRMWARE_VERSION:
+        print(
+            "Warning: The Arduino runs firmware version %i instead of %i. "
+            "Update it, see README.rst.\n  Until then, the DS18B20 reading "
+            "age is unknown and streaming, the ring buffer and binary\n  "
+            "frames are unavailable.\n" % (version, FIRMWARE_VERSION)
+        )
+        return False
+
+    return True
+
+
+def fetch_ard_frames(ard, state: State):
+    """Fetch all readings taken since the previous fetch from the ring buffer
+    of the Arduino, in one transfer.
+
+    Args:
+        ard (dvg_devices.Arduino_protocol_serial.Arduino):
+            The Arduino, sampling into its ring buffer.
+
+    Returns: (success, numpy.ndarray of shape (N, 6))
+    """
+    seq = 0 if state.frame_seq is None else state.frame_seq + 1
+    success, reply = ard.query("dump %i" % seq)
+    if not success:
+        return False, []
+
+    try:
+        n_bytes = int(reply) * FRAME_SIZE
+        data = ard.ser.read(n_bytes)
+    except Exception as err:  # pylint: disable=broad-except
+        pft(err, 3)
+        return False, []
+
+    if len(data) < n_bytes:
+        pft("Received %i of %i bytes." % (len(data), n_bytes))
+        ard.ser.reset_input_buffer()
+        return False, []
+
+    frames, _, n_corrupt = decode_frames(data)
+    state.n_frames_corrupt += n_corrupt
+
+    return True, frames_to_readings(state, frames)
+
+
+def frames_to_readings(state: State, frames: np.ndarray) -> np.ndarray:
+    """Tally dropped frames in `state` and turn the frames into an array of
+    readings as parsed by `parse_reading()`."""
+    if len(frames) == 0:
+        return np.empty((0, 6))
+
+    state.n_frames_dropped += count_dropped(frames["seq"], state.frame_seq)
+    state.frame_seq = int(frames["seq"][-1])
+
+    return np.column_stack(
+        (
+            frames["millis"],
+            frames["ds18_temp"],
+            frames["ds18_age"],
+            frames["bme280_temp"],
+            frames["bme280_humi"],
+            frames["bme280_pres"],
+        )
+    ).astype(np.float64)
+
+
+# ------------------------------------------------------------------------------
+#   Julabo_circulator_idle
+# ------------------------------------------------------------------------------
+
+
+class Julabo_circulator_idle(julabo_protocol.Julabo_circulator):
+    """A `Julabo_circulator` that sleeps out the required time gaps between
+    commands, instead of busy-waiting on them. Saves about 12 % of a CPU core
+    when polling the common readings every second.
+
+    Each successful `query_common_readings()` also adds the setpoint and the
+    bath temperature to `history`, stamped with the time at which the bath
+    temperature got queried. See `dodeca_align.py`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Samples of (setpoint, bath temperature). The setpoint is a setting
+        # and never gets interpolated.
+        self.history = SampleHistory(2, hold=(0,))
+        self._t_bath_temp = np.nan
+
+    def query_bath_temp(self, *args, **kwargs):
+        t_0 = time.perf_counter()
+        success = super().query_bath_temp(*args, **kwargs)
+        self._t_bath_temp = (t_0 + time.perf_counter()) / 2
+        return success
+
+    def query_common_readings(self) -> bool:
+        success = super().query_common_readings()
+        if success:
+            self.history.append(
+                self._t_bath_temp,
+                (self.state.setpoint, self.state.bath_temp),
+            )
+        return success
+
+    def _sleep_command_gap(self):
+        now = time.perf_counter()
+        delays = (
+            julabo_protocol.DELAY_COMMAND_IN - (now - self.state.t_prev_in),
+            julabo_protocol.DELAY_COMMAND_OUT - (now - self.state.t_prev_out),
+        )
+        delays = [delay for delay in delays if delay > 0]  # Drops NaN
+        if delays:
+            time.sleep(max(delays))
+
+    def query_(self, *args, **kwargs):
+        self._sleep_command_gap()
+        return super().query_(*args, **kwargs)
+
+    def write_(self, *args, **kwargs):
+        self._sleep_command_gap()
+        return super().write_(*args, **kwargs)
+
+
+# ------------------------------------------------------------------------------
+#   Log file format
+# ------------------------------------------------------------------------------
+
+
+def log_row_format(timings: bool = False) -> str:
+    """Format of a single row of the log file, optionally including the
+    columns of the DAQ timings."""
+    if not timings:
+        return LOG_ROW_FORMAT
+
+    return LOG_ROW_FORMAT[:-1] + LOG_TIMINGS_FORMAT + "\n"
+
+
+def log_header(comments: str, timings: bool = False) -> str:
+    """Header of the log file, ending with the line of units and the line of
+    column names. Optionally including the columns of the DAQ timings."""
+    units = LOG_UNITS + (LOG_TIMINGS_UNITS if timings else "")
+    columns = LOG_COLUMNS + (LOG_TIMINGS_COLUMNS if timings else "")
+    return (
+        "[HEADER]\n"
+        + comments
+        + "\n\n[DATA]\n"
+        + units
+        + "\n"
+        + columns
+        + "\n"
+    )
+
+
+def log_values(
+    elapsed: float,
+    state: State,
+    julabo_values=(np.nan, np.nan),
+    julabo_age: float = np.nan,
+    timings: DAQTimings = None,
+) -> tuple:
+    """Values of a single row of the log file, matching `log_row_format()`.
+
+    Args:
+        elapsed (float):
+            Time of the reading since the start of the recording [s].
+
+        julabo_values (tuple, default=(NaN, NaN)):
+            Setpoint and bath temperature of the Julabo circulator at the time
+            of the reading, see `Julabo_circulator_idle.history`. Can be left
+            out and get filled in later by `fill_julabo_values()`.
+
+        julabo_age (float, default=NaN):
+            Age of the Julabo readings at the time of the reading [s].
+
+        timings (DAQTimings, optional):
+            When given, append the DAQ timings of the reading.
+    """
+    values = (
+        elapsed,
+        state.ds_temp,
+        state.bme_temp,
+        state.bme_humi,
+        state.bme_pres,
+        julabo_values[0],
+        julabo_values[1],
+        state.ds_age,
+        julabo_age,
+    )
+    if timings is not None:
+        values += timings.log_values()
+
+    return values
+
+
+def fill_julabo_values(values: tuple, julabo_values, julabo_age) -> tuple:
+    """Fill in the Julabo readings and their age into a row of the log file,
+    as returned by `log_values()`. Matches the `fill` of
+    `dodeca_align.RowAligner`."""
+    values = list(values)
+    for idx, value in zip(LOG_JULABO_INDICES, julabo_values):
+        values[idx] = value
+    values[LOG_JULABO_AGE_INDEX] = julabo_age
+    return tuple(values)
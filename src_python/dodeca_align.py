@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Time alignment of the readings of devices that get polled at different
+rates, like the fast Arduino and the slow Julabo circulator.
+
+Each reading of the slow device gets stamped with its own time of acquisition
+and kept in a `SampleHistory`. The rows of the fast device get completed by
+the sample of the slow device at their very time: either the latest sample
+taken before it, or the interpolation between the samples around it. The
+`RowAligner` holds back the rows until the latter is possible. Each row also
+gets the age of the sample of the slow device it got completed with.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import threading
+from collections import deque
+
+import numpy as np
+
+# Alignment modes
+# fmt: off
+ALIGN_LATEST = "latest"  # Latest sample taken before the row
+ALIGN_INTERP = "interp"  # Linear interpolation between the samples around it
+ALIGN_MODES  = (ALIGN_LATEST, ALIGN_INTERP)
+# fmt: on
+
+# ------------------------------------------------------------------------------
+#   SampleHistory
+# ------------------------------------------------------------------------------
+
+
+class SampleHistory:
+    """Thread-safe history of the most recent timestamped samples of a device.
+    To be fed from the thread polling the device and read out from any other
+    thread.
+
+    Args:
+        n_values (int):
+            Number of values per sample.
+
+        capacity (int, default=64):
+            Number of most recent samples to keep.
+
+        hold (tuple of int, default=()):
+            Indices of the values that never get interpolated, but that hold
+            until the next sample, like a setpoint.
+    """
+
+    def __init__(self, n_values: int, capacity: int = 64, hold: tuple = ()):
+        self.n_values = n_values
+        self.hold = hold
+        self._samples = deque(maxlen=capacity)  # (t, np.ndarray of values)
+        self._lock = threading.Lock()
+
+    def append(self, t: float, values):
+        """Add a sample taken at time `t` [s], as obtained from
+        `time.perf_counter()`. Samples must be added in order of time."""
+        with self._lock:
+            self._samples.append((t, np.asarray(values, dtype=np.float64)))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    @property
+    def t_last(self) -> float:
+        """Time of the most recent sample [s], or NaN when there is none."""
+        with self._lock:
+            return self._samples[-1][0] if self._samples else np.nan
+
+    def sample_at(self, t: float, mode: str = ALIGN_LATEST) -> tuple:
+        """Values of the device at time `t` [s], following the alignment
+        `mode`. When no sample has been taken after `t` yet, the latest sample
+        holds, also when interpolating.
+
+        Returns: (np.ndarray of values, age [s] of the latest sample taken at
+        or before `t`). All NaN when there is no such sample.
+        """
+        with self._lock:
+            # Search backwards, as `t` mostly lies near the end
+            idx = len(self._samples) - 1
+            while idx >= 0 and self._samples[idx][0] > t:
+                idx -= 1
+
+            if idx < 0:
+                return np.full(self.n_values, np.nan), np.nan
+
+            t_0, values_0 = self._samples[idx]
+            values = values_0.copy()
+            if mode == ALIGN_INTERP and idx + 1 < len(self._samples):
+                t_1, values_1 = self._samples[idx + 1]
+                frac = (t - t_0) / (t_1 - t_0)
+                values += frac * (values_1 - values_0)
+                values[list(self.hold)] = values_0[list(self.hold)]
+
+            return values, t - t_0
+
+
+# ------------------------------------------------------------------------------
+#   RowAligner
+# ------------------------------------------------------------------------------
+
+
+class RowAligner:
+    """Completes the rows of a fast device with the samples of a slow device,
+    aligned in time. In mode `ALIGN_INTERP`, each row is held back until the
+    slow device has been sampled after it, or until `max_wait_s` has passed,
+    after which the latest sample holds. Not thread-safe.
+
+    Args:
+        history (SampleHistory):
+            The samples of the slow device.
+
+        fill (callable):
+            `fill(row, values, age)` returns the row completed with the
+            `values` of the slow device and their `age` [s].
+
+        mode (str, default=ALIGN_LATEST):
+            One of `ALIGN_MODES`.
+
+        max_wait_s (float, default=10):
+            Maximum time [s] to hold back a row in mode `ALIGN_INTERP`.
+    """
+
+    def __init__(
+        self,
+        history: SampleHistory,
+        fill,
+        mode: str = ALIGN_LATEST,
+        max_wait_s: float = 10,
+    ):
+        if mode not in ALIGN_MODES:
+            raise Exception("Unknown alignment mode '%s'." % mode)
+
+        self.history = history
+        self.fill = fill
+        self.mode = mode
+        self.max_wait_s = max_wait_s
+        self._pending = deque()  # (t, row)
+
+    def push(self, t: float, row):
+        """Add a row of the fast device, taken at time `t` [s]."""
+        self._pending.append((t, row))
+
+    def pop_ready(self, t_now: float, flush: bool = False) -> list:
+        """Pop all rows that can be completed by time `t_now` [s], in order.
+        With `flush`, pop all pending rows regardless."""
+        t_last = self.history.t_last
+        rows = []
+        while self._pending:
+            t, row = self._pending[0]
+            if not (
+                flush
+                or self.mode == ALIGN_LATEST
+                or t_last >= t  # False for NaN
+                or t_now - t >= self.max_wait_s
+            ):
+                break
+
+            self._pending.popleft()
+            values, age = self.history.sample_at(t, self.mode)
+            rows.append(self.fill(row, values, age))
+
+        return rows
+
+    def clear(self):
+        """Discard all pending rows."""
+        self._pending.clear()
@@ -0,0 +1,688 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""End-to-end benchmark of the data acquisition of the Twente Dodecahedron
+control program, running headless against simulated devices, see
+`dodeca_sim_devices.py`.
+
+It drives the actual `QDeviceIO` DAQ loop and `DAQ_function()` of `main.py`,
+including the chart updates and the file logging, at several DAQ rates, and
+reports per rate:
+    - the achieved rate of readings logged to file,
+    - the jitter of the logged sample times, i.e. the standard deviation of
+      the intervals in between them, skipping the first 10 % of warming up,
+    - the jitter of the DAQ ticks with respect to the nominal interval,
+    - the time spent per chart update, i.e. per tick of the chart timer,
+      including the painting,
+    - the CPU usage and the memory growth of the process.
+
+Usage:
+    python dodeca_benchmark.py [--rates 1 10 50] [--duration 30]
+                               [--mode {poll,stream,ring}] [--binary]
+                               [--clock-sync] [--minimized]
+                               [--latency MS] [--jitter MS] [--error-rate P]
+                               [--json FILE]
+
+    --minimized: Keep the window minimized, during which the charts do not
+                 get redrawn.
+    --json FILE: Also store the results as JSON, for comparing across
+                 versions of the code.
+
+    python dodeca_benchmark.py --compare-headless [--duration 30]
+
+    Runs `main.py` and `dodeca_headless.py` each as a separate process at the
+    same DAQ rate and compares their CPU usage and memory.
+
+    python dodeca_benchmark.py --compare-compression [--rates 1 10 100]
+                               [--hours 1]
+
+    Writes the given hours of synthetic log data at each rate uncompressed
+    and compressed by gzip and lzma, see `dodeca_compression.py`, making a
+    flush point every `LOG_FLUSH_INTERVAL_S` seconds of data, and compares
+    their disk usage, the CPU time spent on writing and the time to read them
+    back with `read_log()`. No devices involved.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import psutil
+
+import main
+from main import QtCore, QtWid
+from dodeca_acquisition import LOG_ROW_FORMAT, log_header
+from dodeca_compression import EXTS as COMPRESSION_EXTS, open_log_writer
+from dodeca_read_log import read_log
+from dodeca_sim_devices import SimArduino, SimJulabo
+
+# ------------------------------------------------------------------------------
+#   run_benchmark
+# ------------------------------------------------------------------------------
+
+
+def run_benchmark(
+    rate_Hz: float,
+    duration_s: float = 30,
+    mode: str = "poll",
+    binary: bool = False,
+    clock_sync: bool = False,
+    minimized: bool = False,
+    latency_ms: float = 0,
+    jitter_ms: float = 0,
+    error_rate: float = 0,
+) -> dict:
+    """Run the acquisition pipeline of `main.py` against simulated devices
+    for `duration_s` seconds at a DAQ rate of `rate_Hz`.
+
+    Args:
+        mode (str, default="poll"):
+            "poll"  : Query the Arduino every DAQ interval.
+            "stream": Let the Arduino push its readings.
+            "ring"  : Let the Arduino sample into its ring buffer and fetch
+                      the readings in batches every `main.DAQ_INTERVAL_MS`.
+
+        binary (bool, default=False):
+            Use the binary framed wire protocol.
+
+        clock_sync (bool, default=False):
+            Timestamp the readings by the clock of the Arduino.
+
+        minimized (bool, default=False):
+            Keep the window minimized instead of shown.
+
+        latency_ms, jitter_ms, error_rate:
+            Passed on to the simulated devices.
+
+    Returns: dict of results
+    """
+    interval_ms = round(1000 / rate_Hz)  # [ms]
+    sim_args = dict(
+        latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate
+    )
+
+    # Configure `main.py`
+    main.ARD_STREAMING = mode == "stream"
+    main.ARD_RING_BUFFER = mode == "ring"
+    main.ARD_BINARY_FRAMES = binary
+    main.ARD_CLOCK_SYNC = clock_sync
+    main.ARD_STREAM_INTERVAL_MS = interval_ms
+    main.ARD_SAMPLE_INTERVAL_MS = interval_ms
+    main.state = main.State()
+    main.ard_clock = main.DeviceClock()
+    main.timings = main.DAQTimings(
+        (main.DAQ_INTERVAL_MS if mode == "ring" else interval_ms) / 1000
+    )
+
+    # Devices
+    sim_ard = SimArduino(**sim_args)
+    sim_julabo = SimJulabo(**sim_args)
+    sim_ard.start()
+    sim_julabo.start()
+
+    main.ard = main.Arduino(
+        name="Ard", connect_to_specific_ID="Dodecahedron logger"
+    )
+    if not main.ard.connect_at_port(sim_ard.port, verbose=False):
+        raise Exception("Could not connect to the simulated Arduino.")
+
+    main.julabo = main.Julabo_circulator_idle(name="Julabo")
+    if main.julabo.connect_at_port(sim_julabo.port, verbose=False):
+        main.julabo.begin()
+
+    # Acquisition, GUI and logging, set up like in `main.py`
+    ticks = []
+
+    def timed_DAQ_function():
+        ticks.append(time.perf_counter())
+        return main.DAQ_function()
+
+    main.qdev_ard = main.QDeviceIO(main.ard)
+    if mode == "stream":
+        main.qdev_ard.create_worker_DAQ(
+            DAQ_trigger=main.DAQ_TRIGGER.CONTINUOUS,
+            DAQ_function=timed_DAQ_function,
+            critical_not_alive_count=0,
+        )
+        nominal_ms = interval_ms
+    else:
+        nominal_ms = main.DAQ_INTERVAL_MS if mode == "ring" else interval_ms
+        main.qdev_ard.create_worker_DAQ(
+            DAQ_function=timed_DAQ_function,
+            DAQ_interval_ms=nominal_ms,
+            critical_not_alive_count=0,
+        )
+
+    main.qdev_julabo = main.Julabo_circulator_qdev(
+        dev=main.julabo, DAQ_interval_ms=main.JULABO_INTERVAL_MS
+    )
+    main.julabo_aligner = main.RowAligner(
+        main.julabo.history,
+        fill=main.fill_julabo_values,
+        mode=main.JULABO_ALIGN,
+        max_wait_s=3 * main.JULABO_INTERVAL_MS / 1000,
+    )
+
+    main.window = main.MainWindow()
+    main.governor.reset()
+    chart_times = []
+
+    def timed_refresh_charts():
+        # Including the painting since the previous refresh
+        t0 = time.perf_counter() - main.window.gw.paint_time
+        main.window.refresh_charts()
+        chart_times.append(time.perf_counter() - t0)
+
+    main.log = main.create_file_logger()
+    main.binlog = main.BinaryLogWriter()
+    main.rotation = main.LogRotation(
+        max_hours=main.LOG_ROTATE_HOURS, max_MB=main.LOG_ROTATE_MB
+    )
+
+    main.timer_GUI = QtCore.QTimer()
+    main.timer_GUI.timeout.connect(main.window.refresh_GUI)
+    main.timer_charts = QtCore.QTimer()
+    main.timer_charts.timeout.connect(timed_refresh_charts)
+
+    if binary:
+        main.ard_rxbuf = bytearray()
+        main.ard.write("fmt bin")
+    if mode == "ring":
+        main.ard.write("sample %i" % interval_ms)
+    elif mode == "stream":
+        main.ard.ser.timeout = max(2, 2 * interval_ms / 1000)
+        main.ard.write("stream %i" % interval_ms)
+
+    # Run
+    proc = psutil.Process()
+    rss = []
+    log_dir = tempfile.mkdtemp(prefix="dodeca_benchmark_")
+    cwd = os.getcwd()
+    os.chdir(log_dir)
+    try:
+        if minimized:
+            main.window.showMinimized()
+        else:
+            main.window.show()
+        main.log.start_recording()
+        main.timer_GUI.start(main.GUI_INTERVAL_MS)
+        main.timer_charts.start(main.CHART_INTERVAL_MS)
+        main.qdev_ard.start()
+        main.qdev_julabo.start()
+        if mode == "stream":
+            main.qdev_ard.unpause_DAQ()
+
+        cpu_0 = sum(proc.cpu_times()[:2])
+        t_0 = time.perf_counter()
+
+        # Sample the memory usage once per second, skipping the first second
+        # of warming up
+        timer_rss = QtCore.QTimer()
+        timer_rss.timeout.connect(lambda: rss.append(proc.memory_info().rss))
+        timer_rss.start(1000)
+
+        loop = QtCore.QEventLoop()
+        QtCore.QTimer.singleShot(int(duration_s * 1000), loop.quit)
+        loop.exec()
+
+        timer_rss.stop()
+        cpu_1 = sum(proc.cpu_times()[:2])
+        t_1 = time.perf_counter()
+
+        log_filepath = main.log.filepath
+        main.stop_running()
+        main.window.hide()
+    finally:
+        os.chdir(cwd)
+
+    main.ard.close()
+    main.julabo.close()
+    sim_ard.stop()
+    sim_julabo.stop()
+
+    # Achieved rate of logged readings
+    log_time = read_log(
+        os.path.join(log_dir, log_filepath),
+        apply_lowpass_filter=False,
+        usecols=["time"],
+    ).time
+    n_rows = len(log_time)
+    if n_rows > 2:
+        achieved_Hz = (n_rows - 1) / (log_time[-1] - log_time[0])
+        sample_jitter_ms = np.std(np.diff(log_time[n_rows // 10 :])) * 1e3
+    else:
+        achieved_Hz = np.nan
+        sample_jitter_ms = np.nan
+
+    tick_dev_ms = np.abs(np.diff(ticks) * 1e3 - nominal_ms)
+    if len(tick_dev_ms) == 0:
+        tick_dev_ms = np.array([np.nan])
+    if len(chart_times) == 0:
+        chart_times = [np.nan]
+    rss_growth = (rss[-1] - rss[0]) if len(rss) > 1 else 0
+
+    return dict(
+        rate_Hz=rate_Hz,
+        mode=mode,
+        binary=binary,
+        clock_sync=clock_sync,
+        minimized=minimized,
+        duration_s=t_1 - t_0,
+        n_rows=n_rows,
+        achieved_Hz=achieved_Hz,
+        sample_jitter_ms=sample_jitter_ms,
+        n_ticks=len(ticks),
+        jitter_p50_ms=float(np.percentile(tick_dev_ms, 50)),
+        jitter_p95_ms=float(np.percentile(tick_dev_ms, 95)),
+        jitter_p99_ms=float(np.percentile(tick_dev_ms, 99)),
+        jitter_max_ms=float(np.max(tick_dev_ms)),
+        chart_mean_ms=float(np.mean(chart_times) * 1e3),
+        chart_p99_ms=float(np.percentile(chart_times, 99) * 1e3),
+        chart_interval_ms=main.governor.interval_ms("charts"),
+        refresh_budget_use=main.governor.usage(),
+        cpu_pct=(cpu_1 - cpu_0) / (t_1 - t_0) * 100,
+        rss_MB=rss[-1] / 2**20 if rss else np.nan,
+        rss_growth_MB=rss_growth / 2**20,
+        n_frames_dropped=main.state.n_frames_dropped,
+        n_frames_corrupt=main.state.n_frames_corrupt,
+        n_errors_injected=sim_ard.n_errors_injected,
+        log_dir=log_dir,
+    )
+
+
+# ------------------------------------------------------------------------------
+#   run_process_benchmark
+# ------------------------------------------------------------------------------
+
+
+def run_process_benchmark(
+    script: str, duration_s: float = 30, args=(), warmup_s: float = 5
+) -> dict:
+    """Run `script` of this folder as a separate process against simulated
+    devices and measure its CPU usage and memory for `duration_s` seconds,
+    after `warmup_s` seconds of starting up. The script finds the devices at
+    the last known ports in its `config` folder.
+
+    Returns: dict of results
+    """
+    sim_ard = SimArduino()
+    sim_julabo = SimJulabo()
+    sim_ard.start()
+    sim_julabo.start()
+
+    work_dir = tempfile.mkdtemp(prefix="dodeca_benchmark_")
+    os.mkdir(os.path.join(work_dir, "config"))
+    for filename, port in (
+        ("port_Arduino.txt", sim_ard.port),
+        ("port_Julabo.txt", sim_julabo.port),
+    ):
+        with open(os.path.join(work_dir, "config", filename), "w") as f:
+            f.write(port)
+
+    child = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(__file__), script)]
+        + list(args),
+        cwd=work_dir,
+        env=dict(os.environ, QT_QPA_PLATFORM="offscreen"),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    proc = psutil.Process(child.pid)
+    try:
+        time.sleep(warmup_s)
+        cpu_0 = sum(proc.cpu_times()[:2])
+        t_0 = time.perf_counter()
+        time.sleep(duration_s)
+        cpu_1 = sum(proc.cpu_times()[:2])
+        t_1 = time.perf_counter()
+        rss = proc.memory_info().rss
+    finally:
+        child.send_signal(signal.SIGINT)
+        try:
+            child.wait(10)
+        except subprocess.TimeoutExpired:
+            child.kill()
+            child.wait()
+        sim_ard.stop()
+        sim_julabo.stop()
+
+    return dict(
+        script=script,
+        cpu_pct=(cpu_1 - cpu_0) / (t_1 - t_0) * 100,
+        rss_MB=rss / 2**20,
+        n_commands=sim_ard.n_commands,
+    )
+
+
+# ------------------------------------------------------------------------------
+#   run_compression_benchmark
+# ------------------------------------------------------------------------------
+
+
+def synthetic_log_rows(rate_Hz: float, hours: float, seed: int = 0):
+    """Rows of log data resembling a real recording: slowly drifting
+    temperatures, humidity and pressure with sensor noise and quantization,
+    and a Julabo bath following its setpoint.
+
+    Returns: 2D array of shape (rows, columns of `LOG_ROW_FORMAT`)
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = int(rate_Hz * hours * 3600)
+    t = np.arange(n_rows) / rate_Hz
+    drift = np.sin(2 * np.pi * t / 86400)  # Daily cycle
+    rows = np.empty((n_rows, 9))
+    rows[:, 0] = t
+    rows[:, 1] = np.round((21 + drift + rng.normal(0, 0.05, n_rows)) * 16)
+    rows[:, 1] /= 16  # DS18B20 resolution of 1/16 °C
+    rows[:, 2] = 21.5 + drift + rng.normal(0, 0.05, n_rows)
+    rows[:, 3] = 45 + 5 * drift + rng.normal(0, 0.2, n_rows)
+    rows[:, 4] = 1013 + 3 * drift + rng.normal(0, 0.1, n_rows)
+    rows[:, 5] = 20
+    rows[:, 6] = 20 + rng.normal(0, 0.01, n_rows)
+    rows[:, 7] = rng.uniform(0, 0.1, n_rows)
+    rows[:, 8] = rng.uniform(0, 1, n_rows)
+    return rows
+
+
+def run_compression_benchmark(
+    rate_Hz: float, hours: float = 1, compressions=(None, "gzip", "lzma")
+) -> list:
+    """Write `hours` hours of synthetic log data at `rate_Hz` row by row, like
+    the file logger does, once per compression, and read each back.
+
+    Returns: list of dicts of results, one per compression
+    """
+    rows = synthetic_log_rows(rate_Hz, hours)
+    flush_every = max(1, int(main.LOG_FLUSH_INTERVAL_S * rate_Hz))
+    work_dir = tempfile.mkdtemp(prefix="dodeca_benchmark_")
+
+    results = []
+    for compression in compressions:
+        filepath = os.path.join(
+            work_dir,
+            "log.txt" + COMPRESSION_EXTS.get(compression, ""),
+        )
+
+        # The flush points get made by rows of data instead of by the wall
+        # clock, as the data is written faster than real-time
+        f = open_log_writer(
+            filepath, "w", compression, "utf-8", flush_interval_s=np.inf
+        )
+        cpu_0 = time.process_time()
+        f.write(log_header(""))
+        for i_row, values in enumerate(rows.tolist()):
+            f.write(LOG_ROW_FORMAT % tuple(values))
+            if (i_row + 1) % flush_every == 0:
+                f.flush()
+        f.close()
+        cpu_write = time.process_time() - cpu_0
+
+        t_0 = time.perf_counter()
+        log = read_log(filepath, apply_lowpass_filter=False)
+        t_read = time.perf_counter() - t_0
+        if len(log.time) != len(rows):
+            raise Exception(
+                "Read back %i rows instead of %i." % (len(log.time), len(rows))
+            )
+
+        n_bytes = os.path.getsize(filepath)
+        os.remove(filepath)
+        results.append(
+            dict(
+                rate_Hz=rate_Hz,
+                compression=compression or "none",
+                MB_per_day=n_bytes / hours * 24 / 2**20,
+                cpu_s_per_hour=cpu_write / hours,
+                read_s_per_hour=t_read / hours,
+            )
+        )
+
+    os.rmdir(work_dir)
+    for r in results:
+        r["ratio"] = results[0]["MB_per_day"] / r["MB_per_day"]
+
+    return results
+
+
+def print_compression_results(results: list):
+    print(
+        "\n%7s  %-6s  %10s  %6s  %12s  %12s"
+        % ("rate", "", "disk", "ratio", "write CPU", "read back")
+    )
+    print(
+        "%7s  %-6s  %10s  %6s  %12s  %12s"
+        % ("[Hz]", "", "[MB/day]", "", "[s/hour]", "[s/hour]")
+    )
+    for r in results:
+        print(
+            "%7.1f  %-6s  %10.2f  %6.1f  %12.3f  %12.3f"
+            % (
+                r["rate_Hz"],
+                r["compression"],
+                r["MB_per_day"],
+                r["ratio"],
+                r["cpu_s_per_hour"],
+                r["read_s_per_hour"],
+            )
+        )
+
+
+def print_results(results: list):
+    print(
+        "\n%7s  %-8s  %9s  %7s  %29s  %14s  %6s  %13s"
+        % (
+            "rate",
+            "mode",
+            "achieved",
+            "sample",
+            "tick jitter p50/p95/p99/max",
+            "chart mean/p99",
+            "CPU",
+            "RSS growth",
+        )
+    )
+    print(
+        "%7s  %-8s  %9s  %7s  %29s  %14s  %6s  %13s"
+        % ("[Hz]", "", "[Hz]", "jitter", "[ms]", "[ms]", "[%]", "[MB]")
+    )
+    for r in results:
+        print(
+            "%7.1f  %-8s  %9.2f  %7.2f  %6.2f /%6.2f /%6.2f /%6.2f"
+            "  %6.2f /%6.2f  %6.1f  %6.2f of %4.0f"
+            % (
+                r["rate_Hz"],
+                r["mode"]
+                + ("/b" if r["binary"] else "")
+                + ("/c" if r["clock_sync"] else "")
+                + ("/m" if r["minimized"] else ""),
+                r["achieved_Hz"],
+                r["sample_jitter_ms"],
+                r["jitter_p50_ms"],
+                r["jitter_p95_ms"],
+                r["jitter_p99_ms"],
+                r["jitter_max_ms"],
+                r["chart_mean_ms"],
+                r["chart_p99_ms"],
+                r["cpu_pct"],
+                r["rss_growth_MB"],
+                r["rss_MB"],
+            )
+        )
+        if r["n_frames_dropped"] or r["n_frames_corrupt"]:
+            print(
+                "%7s  frames dropped: %i, corrupt: %i"
+                % ("", r["n_frames_dropped"], r["n_frames_corrupt"])
+            )
+
+
+# ------------------------------------------------------------------------------
+#   Main
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Headless end-to-end DAQ benchmark against simulated "
+        "devices."
+    )
+    parser.add_argument(
+        "--rates",
+        type=float,
+        nargs="+",
+        default=[1, 10, 50],
+        help="DAQ rates to benchmark [Hz] (default: 1 10 50)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30,
+        help="duration per rate [s] (default: 30)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("poll", "stream", "ring"),
+        default="poll",
+        help="acquisition mode of the Arduino (default: poll)",
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="use the binary framed wire protocol",
+    )
+    parser.add_argument(
+        "--clock-sync",
+        action="store_true",
+        help="timestamp the readings by the clock of the Arduino",
+    )
+    parser.add_argument(
+        "--minimized",
+        action="store_true",
+        help="keep the window minimized",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0,
+        help="reply latency of the simulated devices [ms] (default: 0)",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0,
+        help="reply jitter of the simulated devices [ms] (default: 0)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="probability of a corrupt or missing reply (default: 0)",
+    )
+    parser.add_argument(
+        "--json", metavar="FILE", help="store the results as JSON"
+    )
+    parser.add_argument(
+        "--compare-headless",
+        action="store_true",
+        help="compare the CPU usage and memory of `main.py` and "
+        "`dodeca_headless.py`",
+    )
+    parser.add_argument(
+        "--compare-compression",
+        action="store_true",
+        help="compare the disk usage and CPU time of writing the log file "
+        "uncompressed, by gzip and by lzma",
+    )
+    parser.add_argument(
+        "--hours",
+        type=float,
+        default=1,
+        help="hours of synthetic log data per rate, for "
+        "--compare-compression (default: 1)",
+    )
+    args = parser.parse_args()
+
+    if args.compare_compression:
+        results = []
+        for rate_Hz in args.rates:
+            print(
+                "\nBenchmarking compression at %.1f Hz for %.2f hours of "
+                "data..." % (rate_Hz, args.hours)
+            )
+            results.extend(run_compression_benchmark(rate_Hz, args.hours))
+
+        print_compression_results(results)
+
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+            print("\nResults stored in: %s" % args.json)
+        sys.exit(0)
+
+    if args.compare_headless:
+        results = []
+        for script, script_args in (
+            ("main.py", []),
+            ("dodeca_headless.py", ["--interval", str(main.DAQ_INTERVAL_MS)]),
+        ):
+            print(
+                "\nBenchmarking '%s' at %i ms for %.0f s..."
+                % (script, main.DAQ_INTERVAL_MS, args.duration)
+            )
+            results.append(
+                run_process_benchmark(script, args.duration, script_args)
+            )
+
+        print("\n%-20s  %6s  %8s  %10s" % ("", "CPU", "RSS", "Ard"))
+        print("%-20s  %6s  %8s  %10s" % ("", "[%]", "[MB]", "[queries]"))
+        for r in results:
+            print(
+                "%-20s  %6.2f  %8.1f  %10i"
+                % (r["script"], r["cpu_pct"], r["rss_MB"], r["n_commands"])
+            )
+
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+            print("\nResults stored in: %s" % args.json)
+        sys.exit(0)
+
+    app = QtWid.QApplication.instance() or QtWid.QApplication(sys.argv[:1])
+    main.app = app
+
+    results = []
+    for rate_Hz in args.rates:
+        print(
+            "\nBenchmarking %.1f Hz, mode '%s' for %.0f s..."
+            % (rate_Hz, args.mode, args.duration)
+        )
+        results.append(
+            run_benchmark(
+                rate_Hz,
+                duration_s=args.duration,
+                mode=args.mode,
+                binary=args.binary,
+                clock_sync=args.clock_sync,
+                minimized=args.minimized,
+                latency_ms=args.latency,
+                jitter_ms=args.jitter,
+                error_rate=args.error_rate,
+            )
+        )
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print("\nResults stored in: %s" % args.json)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Binary log format of the Twente Dodecahedron control program.
+
+It holds the same header and data columns as the tab-separated text log, but
+stores each sample as a fixed-size record of float64 values at full precision.
+Reading it back is a matter of memory-mapping the data section, instead of
+parsing text.
+
+File layout:
+    magic       8 bytes     b"DODECBIN"
+    version     uint32 LE
+    data_offset uint32 LE   Byte offset of the data section
+    header      UTF-8 text  Identical to the header of the text log, ending
+                            with the line of units and the line of column
+                            names. Zero-padded up to `data_offset`.
+    data        float64 LE  Row-major, one record of `n_cols` values per sample
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import struct
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"DODECBIN"
+VERSION = 1
+EXT = ".dbin"  # File extension
+DTYPE = np.dtype("<f8")
+
+_PREAMBLE = struct.Struct("<8sII")  # magic, version, data_offset
+
+
+def is_binary_log(filepath) -> bool:
+    """Check the extension and magic bytes of the file for the binary log
+    format."""
+    filepath = Path(filepath)
+    if filepath.suffix.lower() == EXT:
+        return True
+
+    with filepath.open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# ------------------------------------------------------------------------------
+#   BinaryLogWriter
+# ------------------------------------------------------------------------------
+
+
+class BinaryLogWriter:
+    """Appends samples to a binary log file. To be used alongside the
+    `FileLogger` of the text log.
+    """
+
+    def __init__(self):
+        self.filepath = ""
+        self._filehandle = None
+        self._record = None
+
+    def open(self, filepath, header: str):
+        """Create the binary log file and write out the header.
+
+        Args:
+            filepath (pathlib.Path, str):
+                Path of the binary log file to create.
+
+            header (str):
+                Header text as written to the text log, ending with the line
+                of units and the line of column names.
+        """
+        self.close()
+
+        col_names = header.rstrip("\n").split("\n")[-1].split("\t")
+        self._record = struct.Struct("<%id" % len(col_names))
+
+        bytes_header = header.encode("utf-8")
+        data_offset = _PREAMBLE.size + len(bytes_header)
+        data_offset += -data_offset % DTYPE.itemsize  # Align data section
+
+        self.filepath = str(filepath)
+        self._filehandle = open(filepath, "wb")
+        self._filehandle.write(_PREAMBLE.pack(MAGIC, VERSION, data_offset))
+        self._filehandle.write(bytes_header)
+        self._filehandle.write(
+            b"\x00" * (data_offset - _PREAMBLE.size - len(bytes_header))
+        )
+
+    def write(self, *values):
+        """Append a single record. Must contain exactly one value per data
+        column."""
+        self._filehandle.write(self._record.pack(*values))
+
+    def close(self):
+        if self._filehandle is not None:
+            self._filehandle.close()
+            self._filehandle = None
+
+    def is_open(self) -> bool:
+        return self._filehandle is not None
+
+
+# ------------------------------------------------------------------------------
+#   read_binary_log
+# ------------------------------------------------------------------------------
+
+
+def read_binary_log(filepath):
+    """Memory-map a binary log file. A trailing partial record, as might be
+    left behind by a crash during recording, is ignored.
+
+    Args:
+        filepath (pathlib.Path, str):
+            Path to the binary log file to open.
+
+    Returns: (header, col_names, data)
+        header (str):
+            Header text, identical to the header of the text log.
+
+        col_names (list of str):
+            Names of the data columns.
+
+        data (numpy.memmap, numpy.ndarray):
+            Read-only 2D array of shape (n_rows, n_cols).
+    """
+    filepath = Path(filepath)
+    with filepath.open("rb") as f:
+        magic, version, data_offset = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise Exception(
+                "Incorrect file format. Not a Dodecahedron binary log."
+            )
+        if version > VERSION:
+            raise Exception(
+                "Unsupported binary log version %i. Expected version <= %i."
+                % (version, VERSION)
+            )
+        header = (
+            f.read(data_offset - _PREAMBLE.size)
+            .rstrip(b"\x00")
+            .decode("utf-8")
+        )
+
+    col_names = header.rstrip("\n").split("\n")[-1].split("\t")
+    n_cols = len(col_names)
+    n_rows = (
+        (filepath.stat().st_size - data_offset) // DTYPE.itemsize // n_cols
+    )
+
+    if n_rows == 0:
+        # numpy can not memory-map an empty region
+        data = np.empty((0, n_cols), dtype=DTYPE)
+    else:
+        data = np.memmap(
+            filepath,
+            dtype=DTYPE,
+            mode="r",
+            offset=data_offset,
+            shape=(n_rows, n_cols),
+        )
+
+    return header, col_names, data
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Catalog of all log files acquired by the Twente Dodecahedron control
+program in a folder, for finding and loading the data of any time range
+without having to parse every log.
+
+The catalog is a SQLite database next to the log files, see `CATALOG_FILE`.
+It holds the start and end time, the number of rows and the header comments of
+each log, and the minimum, maximum and number of NaN values of each of its
+data columns. It gets updated incrementally: only new or changed log files
+are read in, and removed ones are dropped.
+
+The `time` column of a log is relative to the date and time in its file name,
+formatted as `yyMMdd_HHmmss` in local time. This also holds for the segments
+of a rotated recording, see `dodeca_log_rotation.py`, which get cataloged as
+separate logs spanning their own part of the recording. When both a text and a
+binary log of the same recording exist, only the binary log is cataloged.
+Compressed text logs, `.txt.gz` or `.txt.xz`, get cataloged as well.
+
+Usage:
+    python dodeca_catalog.py [--folder F] [--from T0] [--to T1]
+
+    Updates the catalog of folder F, default the current folder, and lists
+    the logs overlapping with T0 to T1, formatted as yyMMdd_HHmmss.
+
+Example usage:
+    catalog = Catalog("logs")
+    catalog.update()
+    log = catalog.read_range("231220_000000", "231221_000000", ["DS_temp"])
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import argparse
+import re
+import sqlite3
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from dodeca_binary_log import EXT as BINARY_LOG_EXT
+from dodeca_compression import strip_compression_ext
+from dodeca_read_log import COLUMNS, OPTIONAL_COLUMNS, Log, read_log
+
+CATALOG_FILE = "dodeca_catalog.sqlite"  # File name, next to the log files
+SCHEMA_VERSION = 2
+
+# Log files to catalog: ######_###### [+any extra chars] .txt or .dbin, also
+# compressed: .txt.gz or .txt.xz
+LOG_FILE_PATTERN = re.compile(
+    r"\d{6}_\d{6}.*\.(txt|txt\.gz|txt\.xz|dbin)$", re.IGNORECASE
+)
+TIME_FORMAT = "%y%m%d_%H%M%S"
+
+_SCHEMA = """
+CREATE TABLE logs (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT UNIQUE NOT NULL,   -- File name within the folder
+    size        INTEGER NOT NULL,       -- [bytes]
+    mtime_ns    INTEGER NOT NULL,
+    t_zero      REAL,                   -- [s] Unix time of `time` = 0
+    t_start     REAL,                   -- [s] Unix time of the first row
+    t_end       REAL,                   -- [s] Unix time of the last row
+    n_rows      INTEGER,
+    header      TEXT,
+    error       TEXT                    -- Why the file could not be read
+);
+CREATE INDEX logs_t_start ON logs (t_start);
+CREATE INDEX logs_t_end ON logs (t_end);
+CREATE TABLE channels (
+    log_id      INTEGER NOT NULL REFERENCES logs (id) ON DELETE CASCADE,
+    name        TEXT NOT NULL,
+    min         REAL,
+    max         REAL,
+    n_nan       INTEGER NOT NULL,
+    PRIMARY KEY (log_id, name)
+);
+"""
+
+
+def parse_time(value) -> float:
+    """Convert a point in time to Unix time [s].
+
+    Args:
+        value (datetime.datetime, str, float):
+            Either a datetime, a string formatted as `yyMMdd_HHmmss` in local
+            time, like the log file names, or Unix time [s] already.
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.strptime(value, TIME_FORMAT).timestamp()
+
+    return float(value)
+
+
+def format_time(t: float) -> str:
+    """Format Unix time [s] as `yyMMdd_HHmmss` in local time."""
+    return datetime.fromtimestamp(t).strftime(TIME_FORMAT)
+
+
+class CatalogEntry:
+    """A cataloged log file.
+
+    Attributes:
+        path (pathlib.Path): Path to the log file
+        t_zero (float): Unix time [s] of `time` = 0, as in the file name
+        t_start (float): Unix time [s] of the first row
+        t_end (float): Unix time [s] of the last row
+        n_rows (int): Number of data rows
+        header (str): Header comments
+        stats (dict): Data column name -> (min, max, number of NaN values).
+            Min and max are None when the column holds NaN values only.
+    """
+
+    def __init__(self, path, t_zero, t_start, t_end, n_rows, header):
+        self.path = path
+        self.t_zero = t_zero
+        self.t_start = t_start
+        self.t_end = t_end
+        self.n_rows = n_rows
+        self.header = header
+        self.stats = {}
+
+
+# ------------------------------------------------------------------------------
+#   Catalog
+# ------------------------------------------------------------------------------
+
+
+class Catalog:
+    """SQLite catalog of the log files in `folder`. Not thread-safe.
+
+    Args:
+        folder (pathlib.Path, str, default="."):
+            Folder containing the log files and the catalog.
+    """
+
+    def __init__(self, folder="."):
+        self.folder = Path(folder)
+        self._conn = sqlite3.connect(self.folder / CATALOG_FILE)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != (
+            SCHEMA_VERSION
+        ):
+            # New or outdated catalog: (re)build from scratch
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS channels")
+                self._conn.execute("DROP TABLE IF EXISTS logs")
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute("PRAGMA user_version = %i" % SCHEMA_VERSION)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def update(self, verbose: bool = False) -> tuple:
+        """Catalog the new and changed log files in the folder and drop the
+        removed ones. Changes are detected by file size and modification time.
+
+        Returns: (number of files (re)cataloged, number of files dropped)
+        """
+        # Log files per recording, preferring the binary log
+        files = {}
+        for path in self.folder.iterdir():
+            if not LOG_FILE_PATTERN.match(path.name):
+                continue
+            stem = strip_compression_ext(path).stem
+            if stem not in files or path.suffix.lower() == BINARY_LOG_EXT:
+                files[stem] = path
+
+        known = {
+            name: (size, mtime_ns)
+            for name, size, mtime_ns in self._conn.execute(
+                "SELECT name, size, mtime_ns FROM logs"
+            )
+        }
+
+        n_updated = 0
+        names = set()
+        for path in sorted(files.values()):
+            names.add(path.name)
+            stat = path.stat()
+            if known.get(path.name) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            if verbose:
+                print("Cataloging: %s" % path.name)
+            self._add(path, stat)
+            n_updated += 1
+
+        removed = [name for name in known if name not in names]
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM logs WHERE name = ?", [(n,) for n in removed]
+            )
+
+        return n_updated, len(removed)
+
+    def query(self, t0=None, t1=None) -> list:
+        """Logs overlapping with the time range `t0` to `t1`, see
+        `parse_time()` for the accepted formats. Leave out either to leave
+        the range open at that end.
+
+        Returns: list of CatalogEntry, in order of start time
+        """
+        where = "error IS NULL"
+        params = []
+        if t0 is not None:
+            where += " AND t_end >= ?"
+            params.append(parse_time(t0))
+        if t1 is not None:
+            where += " AND t_start <= ?"
+            params.append(parse_time(t1))
+
+        entries = {}
+        for row in self._conn.execute(
+            "SELECT id, name, t_zero, t_start, t_end, n_rows, header "
+            "FROM logs WHERE %s ORDER BY t_start" % where,
+            params,
+        ):
+            entries[row[0]] = CatalogEntry(self.folder / row[1], *row[2:])
+
+        for log_id, name, v_min, v_max, n_nan in self._conn.execute(
+            "SELECT log_id, channels.name, min, max, n_nan FROM channels "
+            "JOIN logs ON logs.id = log_id WHERE %s" % where,
+            params,
+        ):
+            entries[log_id].stats[name] = (v_min, v_max, n_nan)
+
+        return list(entries.values())
+
+    def read_range(
+        self,
+        t0,
+        t1,
+        channels=None,
+        apply_lowpass_filter: bool = True,
+        use_cache: bool = False,
+    ) -> Log:
+        """Load the data of the time range `t0` to `t1`, see `parse_time()`
+        for the accepted formats. Only the logs overlapping with the range get
+        read in, see `read_log()`, and their rows within the range get
+        concatenated.
+
+        Args:
+            channels (list of str, optional):
+                Names of the data columns to read in, see `read_log(usecols)`.
+                Optional columns missing from some of the logs get filled with
+                NaN values there.
+
+            apply_lowpass_filter (bool, default=True):
+                Low-pass filter each log as a whole before taking its rows
+                within the range, see `read_log()`.
+
+            use_cache (bool, default=False):
+                See `read_log()`.
+
+        Returns: instance of Log class, as if it were a single log starting at
+        `t0`: its `filename` is `t0` formatted as `yyMMdd_HHmmss` and its
+        `time` is relative to `t0`. The header holds the name and the header
+        comments of each log read in.
+        """
+        t0 = parse_time(t0)
+        t1 = parse_time(t1)
+        names = ["time"] + [
+            name
+            for name in COLUMNS + OPTIONAL_COLUMNS
+            if name != "time" and (channels is None or name in channels)
+        ]
+
+        header = []
+        parts = {name: [] for name in names}
+        for entry in self.query(t0, t1):
+            log = read_log(
+                entry.path,
+                apply_lowpass_filter=apply_lowpass_filter,
+                usecols=channels,
+                use_cache=use_cache,
+            )
+            t = log.time + entry.t_zero
+            mask = (t >= t0) & (t <= t1)
+            n_rows = np.count_nonzero(mask)
+
+            header.append("%s:" % entry.path.name)
+            header.extend(line for line in log.header if line)
+            parts["time"].append(t[mask] - t0)
+            for name in names[1:]:
+                column = getattr(log, name)
+                if len(column) == 0:
+                    # Optional column missing from this log
+                    parts[name].append(np.full(n_rows, np.nan))
+                else:
+                    parts[name].append(column[mask])
+
+        log = Log()
+        log.filename = format_time(t0)
+        log.header = header
+        for name in names:
+            if parts[name]:
+                setattr(log, name, np.concatenate(parts[name]))
+
+        return log
+
+    # --------------------------------------------------------------------------
+    #   Private
+    # --------------------------------------------------------------------------
+
+    def _add(self, path: Path, stat):
+        """(Re)catalog a single log file."""
+        values = [path.name, stat.st_size, stat.st_mtime_ns]
+        stats = []
+        try:
+            t_zero = parse_time(path.name[:13])
+            log = read_log(path, apply_lowpass_filter=False)
+        except Exception as err:  # pylint: disable=broad-except
+            # Keep track of it, so that it only gets retried once changed
+            values += [None, None, None, None, None, str(err)]
+        else:
+            values += [
+                t_zero,
+                t_zero + (log.time[0] if len(log.time) else 0),
+                t_zero + (log.time[-1] if len(log.time) else 0),
+                len(log.time),
+                "\n".join(log.header).strip(),
+                None,
+            ]
+
+            for name in COLUMNS + OPTIONAL_COLUMNS:
+                column = getattr(log, name)
+                if len(column) == 0:
+                    continue
+
+                with warnings.catch_warnings():
+                    # All-NaN columns
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    v_min = np.nanmin(column)
+                    v_max = np.nanmax(column)
+                stats.append(
+                    (
+                        name,
+                        None if np.isnan(v_min) else float(v_min),
+                        None if np.isnan(v_max) else float(v_max),
+                        int(np.count_nonzero(np.isnan(column))),
+                    )
+                )
+
+        with self._conn:
+            self._conn.execute("DELETE FROM logs WHERE name = ?", values[:1])
+            log_id = self._conn.execute(
+                "INSERT INTO logs (name, size, mtime_ns, t_zero, t_start, "
+                "t_end, n_rows, header, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values,
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO channels (log_id, name, min, max, n_nan) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(log_id,) + row for row in stats],
+            )
+
+
+# ------------------------------------------------------------------------------
+#   Main
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Update the catalog of the log files in a folder and "
+        "list the logs overlapping with a time range."
+    )
+    parser.add_argument(
+        "--folder", default=".", help="folder of the log files (default: .)"
+    )
+    parser.add_argument(
+        "--from", dest="t0", help="start of the range, as yyMMdd_HHmmss"
+    )
+    parser.add_argument("--to", dest="t1", help="end of the range")
+    args = parser.parse_args()
+
+    with Catalog(args.folder) as catalog:
+        n_updated, n_removed = catalog.update(verbose=True)
+        print(
+            "Cataloged %i new or changed log files, dropped %i.\n"
+            % (n_updated, n_removed)
+        )
+
+        print(
+            "%-20s  %-17s  %9s  %9s  %s"
+            % ("file", "start", "[h]", "rows", "comments")
+        )
+        for entry in catalog.query(args.t0, args.t1):
+            print(
+                "%-20s  %-17s  %9.2f  %9i  %s"
+                % (
+                    entry.path.name,
+                    datetime.fromtimestamp(entry.t_start).strftime(
+                        "%d-%m-%Y %H:%M:%S"
+                    ),
+                    (entry.t_end - entry.t_start) / 3600,
+                    entry.n_rows,
+                    entry.header.split("\n")[0],
+                )
+            )
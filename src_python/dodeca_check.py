@@ -3,25 +3,82 @@
 """Scan for all log files acquired by the Twente Dodecahedron control program
 in the current folder. Those that are missing a plot figure will be processed.
 
-Useful tool for quick inspection.
+Useful tool for quick inspection. Compressed log files, `.txt.gz` or
+`.txt.xz`, are included.
+
+Usage:
+    python dodeca_check.py [--jobs N] [--profile-startup]
+
+    --jobs N: Process the log files in parallel using N worker processes.
+              N = 0 uses all CPU cores. Default: 1, i.e. serial.
+    --profile-startup: Report the start-up time per phase and per imported
+              module, see `dodeca_startup.py`.
 """
 __author__ = "Dennis van Gils"
 __authoremail__ = "vangils.dennis@gmail.com"
 __url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
-__date__ = "03-03-2021"
-__version__ = "1.0"
+__date__ = "16-10-2026"
+__version__ = "1.1"
+
+from dodeca_startup import enable_startup_profiler
 
+profiler = enable_startup_profiler()
+
+import argparse
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Note: matplotlib and the plotting are only imported once there are log files
+# to process, as they take long to load
+
+# pylint: disable=import-outside-toplevel
+
+# ------------------------------------------------------------------------------
+#   Workers
+# ------------------------------------------------------------------------------
+
+
+def init_worker():
+    """Worker processes only render to file, no need for a GUI backend."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def process_file(filename: str) -> float:
+    """Read in and plot a single log file. Returns the elapsed time [s]."""
+    import matplotlib.pyplot as plt
+    from dodeca_read_log import read_log
+    from dodeca_plot_log import plot_log
+
+    t0 = time.perf_counter()
+    log = read_log(filename, use_cache=True)
+    plot_log(log)
+    plt.close("all")  # Prevent memory build-up over many files
+
+    return time.perf_counter() - t0
 
-from dodeca_read_log import read_log
-from dodeca_plot_log import plot_log
 
 # ------------------------------------------------------------------------------
 #   Main
 # ------------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Plot all log files in the current folder that are "
+        "missing a plot figure."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes, 0 uses all CPU cores (default: 1)",
+    )
+    args = parser.parse_args()
+    n_jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+
     my_path = os.getcwd()
     file_list = [
         f
@@ -29,16 +86,71 @@ if __name__ == "__main__":
         if os.path.isfile(os.path.join(my_path, f))
     ]
 
+    todo_list = []
     for filename in file_list:
         # Look for files matching: ######_###### [+any extra chars] .txt
-        p = re.compile("\d{6}_\d{6}(.*?)\.(txt|TXT)$")
-        if p.match(filename):
+        # [+optional compression extension .gz or .xz]
+        p = re.compile(r"(\d{6}_\d{6}.*?)\.(txt|TXT)(\.gz|\.xz)?$")
+        m = p.match(filename)
+        if m:
             # Found a matching file
             # Now check if the same filename exists ending with .png
-            filename_png = filename[0:-4] + ".png"
+            filename_png = m.group(1) + ".png"
 
             if not os.path.isfile(filename_png):
                 # Figure does not yet exists. Create.
-                print("Reading file: %s" % filename)
-                log = read_log(filename)
-                plot_log(log)
+                todo_list.append(filename)
+
+    if profiler is not None:
+        profiler.mark("Log files scanned")
+
+    failures = []
+    t0 = time.perf_counter()
+
+    if n_jobs == 1:
+        for i_file, filename in enumerate(todo_list):
+            print("Reading file: %s" % filename)
+            try:
+                elapsed = process_file(filename)
+            except Exception as err:  # pylint: disable=broad-except
+                failures.append((filename, err))
+                print("FAILED: %s\n  %s" % (filename, err))
+            else:
+                print(
+                    "[%i/%i] %s  %.2f s"
+                    % (i_file + 1, len(todo_list), filename, elapsed)
+                )
+
+    else:
+        print(
+            "Processing %i files using %i workers" % (len(todo_list), n_jobs)
+        )
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=init_worker
+        ) as executor:
+            futures = {
+                executor.submit(process_file, filename): filename
+                for filename in todo_list
+            }
+            for i_file, future in enumerate(as_completed(futures)):
+                filename = futures[future]
+                try:
+                    elapsed = future.result()
+                except Exception as err:  # pylint: disable=broad-except
+                    failures.append((filename, err))
+                    print("FAILED: %s\n  %s" % (filename, err))
+                else:
+                    print(
+                        "[%i/%i] %s  %.2f s"
+                        % (i_file + 1, len(todo_list), filename, elapsed)
+                    )
+
+    if todo_list:
+        print(
+            "\nProcessed %i files in %.2f s"
+            % (len(todo_list), time.perf_counter() - t0)
+        )
+    if failures:
+        print("%i files failed:" % len(failures))
+        for filename, err in failures:
+            print("  %s: %s" % (filename, err))
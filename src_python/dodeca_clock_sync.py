@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Synchronization of the clock of a device, like `millis()` of the Arduino,
+to the clock of this PC.
+
+The readings carry a timestamp of the device clock. Their arrival at the PC is
+delayed by a latency that varies from reply to reply, but that never drops
+below some minimum. Hence, out of every `window` pairs of (device time, arrival
+time), only the pair with the smallest apparent offset is kept: it sits
+closest to the true offset. These minima get fit by a straight line, using
+exponentially weighted least squares, resolving both the offset and the drift
+between the clocks. The cost per update is constant.
+
+Mapping the device timestamps through the fit gives sample times on the PC
+clock, free of the latency jitter.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import numpy as np
+
+
+class DeviceClock:
+    """Online estimate of the offset and drift of a device clock with respect
+    to the clock of this PC. Not thread-safe.
+
+    Args:
+        window (int, default=10):
+            Number of pairs of (device time, arrival time) out of which the
+            one with the smallest latency gets kept.
+
+        time_constant (float, default=3600):
+            Time constant [s] with which older minima get forgotten, such
+            that the fit can follow a drift that changes with temperature.
+
+        min_span (float, default=60):
+            Span of device time [s] to be covered by the minima before the
+            drift gets estimated. Until then, the drift is taken as zero, as
+            the 1 ms resolution of `millis()` would dominate.
+
+        wrap (float, default=2**32 / 1000):
+            Period [s] after which the device clock wraps around, i.e. that of
+            the uint32 `millis()`.
+    """
+
+    def __init__(
+        self,
+        window: int = 10,
+        time_constant: float = 3600,
+        min_span: float = 60,
+        wrap: float = 2**32 / 1000,
+    ):
+        self.window = window
+        self.time_constant = time_constant
+        self.min_span = min_span
+        self.wrap = wrap
+        self.n_restarts = 0  # Number of detected restarts of the device
+        self.reset()
+
+    def reset(self):
+        """Forget all history."""
+        self._n_wraps = 0
+        self._t_device_last = None  # Last device time fed in, unwrapped [s]
+
+        # All fitting is done relative to the first pair, keeping the numbers
+        # small. `y` is the apparent offset: arrival time - device time.
+        self._x_ref = None
+        self._y_ref = None
+
+        self._win_n = 0
+        self._win_best = None  # (x, y) of the smallest offset in the window
+
+        # Exponentially weighted sums: 1, x, y, x*x, x*y
+        self._sums = np.zeros(5)
+        self._x_prev = None  # x of the previous minimum fed into the sums
+
+        # Fit: y = a + b * x
+        self._a = np.nan
+        self._b = 0.0
+
+    @property
+    def drift_ppm(self) -> float:
+        """Rate at which the device clock runs slow with respect to the PC
+        clock [ppm]."""
+        return self._b * 1e6
+
+    def update(self, t_device: float, t_host: float):
+        """Feed in the device time `t_device` [s] of a reading together with
+        its time of arrival `t_host` [s] on the PC clock, e.g. as obtained
+        from `time.perf_counter()`."""
+        t_unwrapped = self._unwrap(t_device)
+        if self._t_device_last is not None:
+            if t_unwrapped < self._t_device_last - self.wrap / 2:
+                self._n_wraps += 1
+                t_unwrapped += self.wrap
+            elif t_unwrapped < self._t_device_last - 1:
+                # The device clock jumped back: it got restarted
+                self.n_restarts += 1
+                self.reset()
+                t_unwrapped = t_device
+        t_device = t_unwrapped
+        self._t_device_last = t_device
+
+        if self._x_ref is None:
+            self._x_ref = t_device
+            self._y_ref = t_host - t_device
+
+        x = t_device - self._x_ref
+        y = t_host - t_device - self._y_ref
+
+        # Minimum filter
+        if self._win_best is None or y < self._win_best[1]:
+            self._win_best = (x, y)
+        self._win_n += 1
+
+        if self._x_prev is None:
+            # No fit yet: go with the smallest offset so far
+            self._a = self._win_best[1]
+
+        if self._win_n >= self.window:
+            self._fit(*self._win_best)
+            self._win_n = 0
+            self._win_best = None
+
+    def to_host(self, t_device: float) -> float:
+        """Map the device time `t_device` [s] onto the PC clock."""
+        if self._x_ref is None:
+            return np.nan
+
+        t_device = self._unwrap(t_device)
+        x = t_device - self._x_ref
+        return t_device + self._y_ref + self._a + self._b * x
+
+    # --------------------------------------------------------------------------
+    #   Private
+    # --------------------------------------------------------------------------
+
+    def _unwrap(self, t_device: float) -> float:
+        """Unwrap the device time, allowing for times that lie up to half a
+        wrap period before or after the last time fed in."""
+        t_device = t_device + self._n_wraps * self.wrap
+        if self._t_device_last is not None:
+            if t_device > self._t_device_last + self.wrap / 2:
+                t_device -= self.wrap
+        return t_device
+
+    def _fit(self, x: float, y: float):
+        if self._x_prev is not None:
+            self._sums *= np.exp(-(x - self._x_prev) / self.time_constant)
+        self._x_prev = x
+        self._sums += (1, x, y, x * x, x * y)
+
+        s_1, s_x, s_y, s_xx, s_xy = self._sums
+        mean_x = s_x / s_1
+        mean_y = s_y / s_1
+        var_x = s_xx / s_1 - mean_x**2
+
+        # Variance of a uniform distribution spanning `min_span`
+        if var_x > self.min_span**2 / 12:
+            self._b = (s_xy / s_1 - mean_x * mean_y) / var_x
+        else:
+            self._b = 0.0
+        self._a = mean_y - self._b * mean_x
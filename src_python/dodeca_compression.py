@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""On-the-fly compression of the text logs of the Twente Dodecahedron control
+program, by the gzip or lzma (xz) compressors of the standard library.
+
+The logs are highly repetitive and compress well. While recording, a flush
+point gets made at least every `flush_interval_s` seconds and on each
+`flush()`: all data written up to there can be decompressed, also when the
+PC crashes later on and the file never gets closed properly. Hence, a crash
+loses at most one flush interval of data.
+
+    - gzip: A sync flush of the deflate stream, which keeps the compression
+      dictionary. Cheap.
+
+    - lzma: The xz stream gets finished and a new one gets started, as xz
+      has no sync flush. Each stream starts from an empty dictionary, so
+      frequent flush points cost compression ratio.
+
+The compression is taken from the file extension: `.txt.gz` or `.txt.xz`.
+Reading back is done by stream-decompressing, without a temporary file.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import io
+import lzma
+import time
+import zlib
+from pathlib import Path
+
+# Compressions and their file extensions
+# fmt: off
+GZIP = "gzip"
+LZMA = "lzma"
+EXTS = {GZIP: ".gz", LZMA: ".xz"}
+# fmt: on
+
+FLUSH_INTERVAL_S = 60  # Default interval between flush points [s]
+READ_CHUNK_BYTES = 1 << 16  # Compressed bytes to decompress in one go
+
+
+def compression_of(filepath) -> str:
+    """Compression of a log file going by its extension, or None."""
+    suffix = Path(filepath).suffix.lower()
+    for compression, ext in EXTS.items():
+        if suffix == ext:
+            return compression
+
+    return None
+
+
+def strip_compression_ext(filepath) -> Path:
+    """The file path without its compression extension, if any."""
+    filepath = Path(filepath)
+    if compression_of(filepath) is None:
+        return filepath
+
+    return filepath.with_suffix("")
+
+
+# ------------------------------------------------------------------------------
+#   Writing
+# ------------------------------------------------------------------------------
+
+
+class CompressedLogWriter:
+    """Text file object writing a compressed stream, making a flush point at
+    least every `flush_interval_s` seconds. See the module docstring.
+
+    Args:
+        filepath (pathlib.Path, str):
+            Path of the file to create, or to append to in mode "a".
+
+        compression (str):
+            Either `GZIP` or `LZMA`.
+
+        mode (str, default="w"):
+            Either "w" or "a". Appending adds a new gzip member or xz stream,
+            which decompresses as if it were a single one.
+
+        flush_interval_s (float, default=FLUSH_INTERVAL_S):
+            Maximum time [s] in between flush points.
+
+        level (int, optional):
+            Compression level, 0-9. Default: 6 for both.
+    """
+
+    def __init__(
+        self,
+        filepath,
+        compression: str,
+        mode: str = "w",
+        flush_interval_s: float = FLUSH_INTERVAL_S,
+        level: int = 6,
+    ):
+        if compression not in EXTS:
+            raise Exception("Unknown compression '%s'." % compression)
+        if mode not in ("w", "a"):
+            raise Exception("Unsupported file mode '%s'." % mode)
+
+        self.compression = compression
+        self.flush_interval_s = flush_interval_s
+        self.level = level
+
+        self._file = open(filepath, mode + "b")
+        self._compressor = self._new_compressor()
+        self._t_flush = time.monotonic()
+        self._is_dirty = False  # Data written since the last flush point?
+
+    def write(self, data: str) -> int:
+        self._file.write(self._compressor.compress(data.encode("utf-8")))
+        self._is_dirty = True
+        if time.monotonic() - self._t_flush >= self.flush_interval_s:
+            self.flush()
+
+        return len(data)
+
+    def flush(self):
+        """Make a flush point and hand the data over to the OS."""
+        if self._is_dirty:
+            if self.compression == GZIP:
+                self._file.write(self._compressor.flush(zlib.Z_SYNC_FLUSH))
+            else:
+                self._file.write(self._compressor.flush())
+                self._compressor = self._new_compressor()
+            self._is_dirty = False
+
+        self._file.flush()
+        self._t_flush = time.monotonic()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        if self.compression == GZIP or self._is_dirty:
+            self._file.write(self._compressor.flush())
+        self._file.close()
+
+    def _new_compressor(self):
+        if self.compression == GZIP:
+            # Window bits 16 + 15: with gzip header and trailer
+            return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+        return lzma.LZMACompressor(format=lzma.FORMAT_XZ, preset=self.level)
+
+
+def open_log_writer(
+    filepath,
+    mode: str = "w",
+    compression: str = None,
+    encoding: str = None,
+    flush_interval_s: float = FLUSH_INTERVAL_S,
+):
+    """Open a text log file for writing, compressed or not.
+
+    Returns: a `CompressedLogWriter`, or a regular file object opened in text
+    mode with `encoding` when `compression` is None.
+    """
+    if compression is None:
+        return open(filepath, mode, encoding=encoding)
+
+    return CompressedLogWriter(
+        filepath, compression, mode, flush_interval_s=flush_interval_s
+    )
+
+
+# ------------------------------------------------------------------------------
+#   Reading
+# ------------------------------------------------------------------------------
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Raw binary stream decompressing a gzip or xz file on the fly. Handles
+    multiple concatenated gzip members or xz streams, as well as a truncated
+    final one as left behind by a crash. Seeking backwards restarts the
+    decompression from the beginning of the file."""
+
+    def __init__(self, filepath, compression: str):
+        super().__init__()
+        self.compression = compression
+        self._file = open(filepath, "rb")
+        self._rewind()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Can only seek from the start.")
+
+        if offset < self._pos:
+            self._rewind()
+
+        buffer = bytearray(READ_CHUNK_BYTES)
+        while self._pos < offset:
+            view = memoryview(buffer)[: offset - self._pos]
+            if self.readinto(view) == 0:
+                break
+
+        return self._pos
+
+    def readinto(self, b) -> int:
+        while self._offset >= len(self._pending):
+            if not self._decompress_next():
+                return 0
+
+        n_bytes = min(len(b), len(self._pending) - self._offset)
+        b[:n_bytes] = self._pending[self._offset : self._offset + n_bytes]
+        self._offset += n_bytes
+        self._pos += n_bytes
+        return n_bytes
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+    def _rewind(self):
+        self._file.seek(0)
+        self._decompressor = self._new_decompressor()
+        self._pending = b""  # Decompressed data not yet read out
+        self._offset = 0  # Read position within `_pending`
+        self._pos = 0  # Read position within the decompressed stream
+
+    def _new_decompressor(self):
+        if self.compression == GZIP:
+            return zlib.decompressobj(31)
+
+        return lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+
+    def _decompress_next(self) -> bool:
+        """Decompress the next chunk of the file into `_pending`. Returns
+        False at the end of the file."""
+        data = b""
+        if self._decompressor.eof:
+            # On to the next gzip member or xz stream
+            data = self._decompressor.unused_data
+            self._decompressor = self._new_decompressor()
+        if not data:
+            data = self._file.read(READ_CHUNK_BYTES)
+        if not data:
+            return False
+
+        self._pending = self._decompressor.decompress(data)
+        self._offset = 0
+        return True
+
+
+def open_log_reader(filepath):
+    """Open a log file for reading in binary mode, decompressing it on the fly
+    when it has the extension of a compression.
+
+    Returns: a binary file object supporting `readline()`, `read()`, `tell()`
+    and `seek()`
+    """
+    compression = compression_of(filepath)
+    if compression is None:
+        return open(filepath, "rb")
+
+    return io.BufferedReader(
+        _DecompressingReader(filepath, compression), READ_CHUNK_BYTES
+    )
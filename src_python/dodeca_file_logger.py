@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Variants of `dvg_pyqt_filelogger.FileLogger` for the Twente Dodecahedron
+control program.
+
+`RotatingFileLogger` can continue a recording in a new log file, for the log
+rotation of `dodeca_log_rotation.py`, and can compress the log file on the
+fly, see `dodeca_compression.py`.
+
+`BufferedFileLogger` additionally keeps disk I/O off the acquisition thread.
+Rows of data are queued in memory by the acquisition thread and get formatted
+and written out in bulk by a background writer thread. The writer flushes
+every `flush_rows` rows or `flush_interval_s` seconds, whichever comes first,
+optionally followed by an `os.fsync()`. Hence, the acquisition thread never
+stalls on disk I/O and a crash loses at most one flush interval of data.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import os
+import threading
+import time
+from itertools import chain
+from pathlib import Path
+from typing import Callable
+
+from dvg_debug_functions import print_fancy_traceback as pft
+from dvg_pyqt_filelogger import FileLogger
+
+from dodeca_compression import FLUSH_INTERVAL_S, open_log_writer
+
+
+class RotatingFileLogger(FileLogger):
+    """A `FileLogger` that can continue the recording in a new log file, see
+    `rotate()`, and that can compress the log file on the fly.
+
+    Args:
+        write_header_function (Callable, optional):
+            See `FileLogger`.
+
+        write_data_function (Callable, optional):
+            See `FileLogger`.
+
+        stop_function (Callable, optional):
+            Gets called when the recording stops, right before the log file
+            gets closed, e.g. to write out data held back so far.
+
+        compression (str, optional):
+            Compress the log file by "gzip" or "lzma", see
+            `dodeca_compression.py`. The file path passed to `update()` should
+            carry the matching extension.
+
+        compression_flush_s (float, default=FLUSH_INTERVAL_S):
+            Maximum time [s] in between the flush points of the compressed
+            stream, bounding the data lost on a crash.
+    """
+
+    def __init__(
+        self,
+        write_header_function: Callable = None,
+        write_data_function: Callable = None,
+        stop_function: Callable = None,
+        compression: str = None,
+        compression_flush_s: float = FLUSH_INTERVAL_S,
+    ):
+        super().__init__(
+            write_header_function=write_header_function,
+            write_data_function=write_data_function,
+        )
+        self._stop_function = stop_function
+        self.compression = compression
+        self.compression_flush_s = compression_flush_s
+        self._t_zero = None  # `time.perf_counter()` time of time zero
+
+    @property
+    def filepath(self) -> Path:
+        """Path of the log file being recorded to, or None."""
+        return self._filepath
+
+    def update(self, filepath: str = "", mode: str = "a"):
+        if self._start:
+            self._t_zero = None
+        if self._is_recording and self._stop:
+            if self._stop_function is not None:
+                self._stop_function()
+        super().update(filepath, mode)
+
+    def elapsed_at(self, t: float) -> float:
+        """Time [s] in the recording of the `time.perf_counter()` time `t`,
+        e.g. of a reading. Time zero is the creation of the log file or the
+        first `t` asked for, whichever is earlier. Hence, readings received
+        in a batch that predate the log file do not get a negative time.
+        """
+        if self._t_zero is None:
+            self._t_zero = min(t, time.perf_counter() - self.elapsed())
+        return t - self._t_zero
+
+    def rotate(self, filepath) -> bool:
+        """Continue the recording in the new log file `filepath`, opened in
+        the same mode, and close the current log file. The elapsed time keeps
+        running. When the new log file can not be created, the recording
+        continues in the current one. To be called from the thread calling
+        `update()`.
+
+        Returns True if successful, False otherwise.
+        """
+        try:
+            filehandle = self._open_file(filepath)
+        except Exception as err:  # pylint: disable=broad-except
+            pft(err, 3)
+            return False
+
+        try:
+            self._filehandle.close()
+        except Exception as err:  # pylint: disable=broad-except
+            pft(err, 3)
+
+        self._filehandle = filehandle
+        self._filepath = Path(filepath)
+        return True
+
+    def _create_log(self) -> bool:
+        try:
+            self._filehandle = self._open_file(self._filepath)
+        except Exception as err:  # pylint: disable=broad-except
+            pft(err, 3)
+            return False
+
+        return True
+
+    def _open_file(self, filepath: Path):
+        return open_log_writer(
+            filepath,
+            self._mode,
+            compression=self.compression,
+            flush_interval_s=self.compression_flush_s,
+        )
+
+
+# ------------------------------------------------------------------------------
+#   BufferedFileLogger
+# ------------------------------------------------------------------------------
+
+
+class BufferedFileLogger(RotatingFileLogger):
+    """A `FileLogger` that writes from a background thread. Use `write_row()`
+    instead of `write()` to log rows of data, such that they can be formatted
+    in bulk.
+
+    Args:
+        write_header_function (Callable, optional):
+            See `FileLogger`.
+
+        write_data_function (Callable, optional):
+            See `FileLogger`.
+
+        stop_function (Callable, optional):
+            See `RotatingFileLogger`.
+
+        row_format (str):
+            Printf-style format of a single row of data, including the line
+            ending, e.g. "%.1f\\t%.2f\\n".
+
+        compression (str, optional):
+            See `RotatingFileLogger`. Each flush to disk also makes a flush
+            point of the compressed stream.
+
+        flush_rows (int, default=60):
+            Flush to disk after this number of queued rows.
+
+        flush_interval_s (float, default=10):
+            Flush to disk at least every this number of seconds.
+
+        fsync (bool, default=True):
+            Force the OS to commit each flush to the physical disk. Without
+            it, the data might still reside in the OS cache when the PC
+            crashes.
+    """
+
+    def __init__(
+        self,
+        write_header_function: Callable = None,
+        write_data_function: Callable = None,
+        row_format: str = "",
+        flush_rows: int = 60,
+        flush_interval_s: float = 10,
+        fsync: bool = True,
+        compression: str = None,
+        stop_function: Callable = None,
+    ):
+        super().__init__(
+            write_header_function=write_header_function,
+            write_data_function=write_data_function,
+            stop_function=stop_function,
+            compression=compression,
+            compression_flush_s=flush_interval_s,
+        )
+        self.row_format = row_format
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        self.fsync = fsync
+
+        # Queue of (str) text chunks, (tuple) rows and (file object) new log
+        # files to switch over to, in order of arrival
+        self._queue = []
+        self._n_queued_rows = 0
+        self._flush_requested = False
+        self._stop_writer = False
+        self._cond = threading.Condition()
+        self._writer = None
+
+    def _create_log(self) -> bool:
+        if not super()._create_log():
+            return False
+
+        self._stop_writer = False
+        self._writer = threading.Thread(
+            target=self._run_writer, name="log_writer", daemon=True
+        )
+        self._writer.start()
+        return True
+
+    def write(self, data: str) -> bool:
+        """Queue text to be written to the log file."""
+        with self._cond:
+            self._queue.append(data)
+        return True
+
+    def write_row(self, values) -> bool:
+        """Queue a single row of data, to be formatted with `row_format`."""
+        with self._cond:
+            self._queue.append(tuple(values))
+            self._n_queued_rows += 1
+            if self._n_queued_rows >= self.flush_rows:
+                self._cond.notify()
+        return True
+
+    def rotate(self, filepath) -> bool:
+        """Create the new log file `filepath` and queue switching over to it,
+        in order with the queued data. The writer thread closes the current
+        log file after its final flush. When the new log file can not be
+        created, the recording continues in the current one.
+
+        Returns True if successful, False otherwise.
+        """
+        try:
+            filehandle = self._open_file(filepath)
+        except Exception as err:  # pylint: disable=broad-except
+            pft(err, 3)
+            return False
+
+        with self._cond:
+            self._queue.append(filehandle)
+        self._filepath = Path(filepath)
+        return True
+
+    def flush(self):
+        """Request the writer thread to flush to disk as soon as possible."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify()
+
+    def close(self):
+        """Write out all queued data, flush and close the log file."""
+        if self._writer is not None:
+            with self._cond:
+                self._stop_writer = True
+                self._cond.notify()
+            self._writer.join()
+            self._writer = None
+
+        super().close()
+
+    # --------------------------------------------------------------------------
+    #   Writer thread
+    # --------------------------------------------------------------------------
+
+    def _run_writer(self):
+        t_last_flush = time.monotonic()
+        while True:
+            with self._cond:
+                while not (
+                    self._stop_writer
+                    or self._flush_requested
+                    or self._n_queued_rows >= self.flush_rows
+                ):
+                    timeout = t_last_flush + self.flush_interval_s
+                    timeout -= time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+
+                queue = self._queue
+                stop = self._stop_writer
+                flush_requested = self._flush_requested
+                self._queue = []
+                self._n_queued_rows = 0
+                self._flush_requested = False
+
+            if not (queue or flush_requested):
+                # Nothing written since the last flush, spare the disk
+                t_last_flush = time.monotonic()
+                if stop:
+                    return
+                continue
+
+            try:
+                self._write_queue(queue)
+                self._filehandle.flush()
+                if self.fsync:
+                    os.fsync(self._filehandle.fileno())
+            except Exception as err:  # pylint: disable=broad-except
+                pft(err, 3)
+            t_last_flush = time.monotonic()
+
+            if stop:
+                return
+
+    def _write_queue(self, queue: list):
+        """Write out the queued items, formatting consecutive rows in bulk and
+        switching over to the queued new log files."""
+        rows = []
+        for item in queue + [None]:
+            if isinstance(item, tuple):
+                rows.append(item)
+                continue
+
+            if rows:
+                self._filehandle.write(
+                    (self.row_format * len(rows))
+                    % tuple(chain.from_iterable(rows))
+                )
+                rows = []
+            if isinstance(item, str):
+                self._filehandle.write(item)
+            elif item is not None:
+                self._switch_file(item)
+
+    def _switch_file(self, filehandle):
+        try:
+            self._filehandle.flush()
+            if self.fsync:
+                os.fsync(self._filehandle.fileno())
+            self._filehandle.close()
+        except Exception as err:  # pylint: disable=broad-except
+            pft(err, 3)
+
+        self._filehandle = filehandle
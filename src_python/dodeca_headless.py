@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Headless acquisition engine of the Twente Dodecahedron, for long unattended
+runs without the GUI, charts and OpenGL of `main.py`.
+
+The Arduino and the Julabo are polled concurrently by asyncio tasks, each at
+its own rate and each device getting a single worker thread for its blocking
+serial I/O. The readings are parsed, aligned and logged exactly like in
+`main.py`, see `dodeca_acquisition.py`, and a status line is printed every
+minute.
+
+Recording starts right away. Stop with Ctrl+C or by sending SIGTERM: the
+remaining readings get fetched, the Arduino is halted and the log file gets
+flushed to disk and closed properly.
+
+Usage:
+    python dodeca_headless.py [--interval MS] [--ring MS] [--clock-sync]
+                              [--julabo-interval MS] [--julabo-align MODE]
+                              [--comments TEXT] [--binary-log] [--duration S]
+                              [--rotate-hours H] [--rotate-mb MB]
+                              [--compress C] [--profile-startup]
+
+    --interval MS : DAQ interval [ms] (default: 1000)
+    --ring MS     : Let the Arduino sample into its ring buffer at this
+                    interval [ms] and fetch the readings in batches every DAQ
+                    interval.
+    --clock-sync  : Timestamp the readings by the clock of the Arduino, see
+                    `dodeca_clock_sync.py`.
+    --julabo-interval MS : Julabo poll interval [ms] (default: 1000)
+    --julabo-align MODE  : Align the Julabo readings to the Arduino readings
+                           by taking the "latest" one before, or by
+                           "interp"-olating (default: latest). See
+                           `dodeca_align.py`.
+    --comments    : Comments to write into the header of the log file.
+    --binary-log  : Also record to a binary log file, see
+                    `dodeca_binary_log.py`.
+    --duration S  : Stop after this number of seconds (default: never).
+    --rotate-hours H : Start a new segment of the log file after this number
+                       of hours of data, see `dodeca_log_rotation.py`.
+    --rotate-mb MB   : Start a new segment of the log file after this number
+                       of MB of text.
+    --compress C  : Compress the log file on the fly by "gzip" or "lzma", see
+                    `dodeca_compression.py`.
+    --profile-startup : Report the start-up time per phase and per imported
+                        module, see `dodeca_startup.py`.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+# pylint: disable=bare-except, broad-except
+
+from dodeca_startup import enable_startup_profiler
+
+profiler = enable_startup_profiler(report_at_exit=False)
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+from dvg_debug_functions import dprint, print_fancy_traceback as pft
+from dvg_devices.Arduino_protocol_serial import Arduino
+
+from dodeca_acquisition import (
+    LOG_ROW_FORMAT,
+    Julabo_circulator_idle,
+    State,
+    check_firmware_version,
+    fetch_ard_frames,
+    fill_julabo_values,
+    log_header,
+    log_values,
+    parse_reading,
+)
+from dodeca_align import ALIGN_LATEST, ALIGN_MODES, RowAligner
+from dodeca_binary_log import BinaryLogWriter, EXT as BINARY_LOG_EXT
+from dodeca_clock_sync import DeviceClock
+from dodeca_compression import EXTS as COMPRESSION_EXTS, open_log_writer
+from dodeca_log_rotation import LogRotation
+
+# Constants
+# fmt: off
+CRITICAL_NOT_ALIVE_COUNT = 3   # Consecutive failed Arduino reads, then stop
+LOG_FLUSH_INTERVAL_S     = 10  # [s]
+LOG_FSYNC                = True
+STATUS_INTERVAL_S        = 60  # [s]
+# fmt: on
+
+# ------------------------------------------------------------------------------
+#   HeadlessDAQ
+# ------------------------------------------------------------------------------
+
+
+class HeadlessDAQ:
+    """Acquires the readings of the Arduino and the Julabo and records them to
+    a log file, until `request_stop()` gets called, a termination signal is
+    received or the connection to the Arduino is lost.
+
+    Args:
+        ard (Arduino):
+            Connected Arduino.
+
+        julabo (Julabo_circulator_idle):
+            Julabo circulator, connected or not.
+
+        DAQ_interval_ms (int, default=1000):
+            Interval at which the Arduino gets polled [ms].
+
+        sample_interval_ms (int, optional):
+            When given, let the Arduino sample into its ring buffer at this
+            interval [ms] and fetch its readings in batches every
+            `DAQ_interval_ms`.
+
+        clock_sync (bool, default=False):
+            Timestamp the readings by the clock of the Arduino, mapped onto
+            the PC clock, instead of by their time of arrival.
+
+        julabo_interval_ms (int, default=1000):
+            Interval at which the Julabo gets polled [ms].
+
+        julabo_align (str, default="latest"):
+            How the Julabo readings get aligned to the Arduino readings, see
+            `dodeca_align.ALIGN_MODES`.
+
+        comments (str, default=""):
+            Comments to write into the header of the log file.
+
+        record_binary_log (bool, default=False):
+            Also record to a binary log file.
+
+        rotate_hours (float, optional):
+            Start a new segment of the log file after this number of hours of
+            data, see `dodeca_log_rotation.LogRotation`.
+
+        rotate_MB (float, optional):
+            Start a new segment of the log file after this number of MB of
+            text.
+
+        compression (str, optional):
+            Compress the log file on the fly by "gzip" or "lzma", making a
+            flush point every `LOG_FLUSH_INTERVAL_S` seconds.
+    """
+
+    def __init__(
+        self,
+        ard: Arduino,
+        julabo: Julabo_circulator_idle,
+        DAQ_interval_ms: int = 1000,
+        sample_interval_ms: int = None,
+        clock_sync: bool = False,
+        julabo_interval_ms: int = 1000,
+        julabo_align: str = ALIGN_LATEST,
+        comments: str = "",
+        record_binary_log: bool = False,
+        rotate_hours: float = None,
+        rotate_MB: float = None,
+        compression: str = None,
+    ):
+        self.ard = ard
+        self.julabo = julabo
+        self.DAQ_interval_ms = DAQ_interval_ms
+        self.sample_interval_ms = sample_interval_ms
+        self.clock_sync = clock_sync
+        self.julabo_interval_ms = julabo_interval_ms
+        self.comments = comments
+        self.record_binary_log = record_binary_log
+        self.compression = compression
+
+        self.state = State()
+        self.ard_clock = DeviceClock()
+        self.julabo_aligner = RowAligner(
+            julabo.history,
+            fill=fill_julabo_values,
+            mode=julabo_align if julabo.is_alive else ALIGN_LATEST,
+            max_wait_s=3 * julabo_interval_ms / 1000,
+        )
+        self.update_counter = 0
+        self.n_rows = 0
+        self.connection_lost = False
+        self.log_filepath = ""
+
+        self._loop = None
+        self._stop = None  # asyncio.Event
+        self._t_start = time.perf_counter()
+        self._log = None
+        self._binlog = BinaryLogWriter()
+        self._rotation = LogRotation(max_hours=rotate_hours, max_MB=rotate_MB)
+
+        # One worker thread per device, keeping its serial I/O sequential
+        self._ard_executor = ThreadPoolExecutor(1, "Ard")
+        self._julabo_executor = ThreadPoolExecutor(1, "Julabo")
+
+    def request_stop(self):
+        """Stop the acquisition gracefully. Safe to call from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    async def run(self, duration_s: float = None) -> bool:
+        """Run the acquisition until stopped, or for `duration_s` seconds.
+
+        Returns: False when the connection to the Arduino got lost, True
+        otherwise.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._install_signal_handlers()
+        if duration_s is not None:
+            self._loop.call_later(duration_s, self._stop.set)
+
+        self._start_recording()
+        if self.sample_interval_ms is not None:
+            self.ard.write("sample %i" % self.sample_interval_ms)
+
+        tasks = [
+            asyncio.ensure_future(self._run_arduino()),
+            asyncio.ensure_future(self._run_julabo()),
+            asyncio.ensure_future(self._run_flusher()),
+            asyncio.ensure_future(self._run_status()),
+        ]
+        try:
+            await self._stop.wait()
+        finally:
+            # Let the tasks finish their current device I/O
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._shut_down()
+
+        return not self.connection_lost
+
+    # --------------------------------------------------------------------------
+    #   Tasks
+    # --------------------------------------------------------------------------
+
+    async def _sleep_until(self, t_next: float, interval_ms: int) -> float:
+        """Sleep until loop time `t_next` or until stopped. Skips ticks that
+        were missed. Returns the loop time of the next tick, `interval_ms`
+        later."""
+        delay = t_next - self._loop.time()
+        if delay < 0:
+            t_next = self._loop.time()
+            delay = 0
+
+        try:
+            await asyncio.wait_for(self._stop.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+        return t_next + interval_ms / 1000
+
+    async def _run_arduino(self):
+        not_alive_count = 0
+        t_next = self._loop.time()
+        while not self._stop.is_set():
+            success = await self._update_arduino()
+            if success:
+                not_alive_count = 0
+            else:
+                not_alive_count += 1
+                dprint(
+                    "'%s' reports IOError @ %s"
+                    % (self.ard.name, time.strftime("%d-%m-%Y %H:%M:%S"))
+                )
+                if not_alive_count >= CRITICAL_NOT_ALIVE_COUNT:
+                    print("\nCRITICAL ERROR: Lost connection to Arduino.")
+                    self.connection_lost = True
+                    self._stop.set()
+                    return
+
+            t_next = await self._sleep_until(t_next, self.DAQ_interval_ms)
+
+    async def _update_arduino(self) -> bool:
+        """Read in and log the new readings of the Arduino."""
+        success, readings = await self._loop.run_in_executor(
+            self._ard_executor, self._read_arduino
+        )
+        if not success:
+            return False
+
+        self.update_counter += 1
+        if len(readings) == 0:
+            # No new readings yet
+            return True
+
+        # We will use PC time instead. Readings received in one go get spread
+        # out backwards in time, following the Arduino time in between them.
+        # Or, the Arduino time gets mapped onto the PC time.
+        t_now = time.perf_counter()
+        if self.clock_sync:
+            self.ard_clock.update(readings[-1][0] / 1000, t_now)
+
+        for reading in readings:
+            try:
+                parse_reading(self.state, reading)
+            except Exception as err:
+                pft(err, 3)
+                return False
+
+            if self.clock_sync:
+                self.state.time = self.ard_clock.to_host(self.state.time)
+            else:
+                self.state.time = t_now - (readings[-1][0] - reading[0]) / 1000
+            self._write_row()
+
+        return True
+
+    def _read_arduino(self):
+        """Blocking. Returns: (success, list of readings)"""
+        if self.sample_interval_ms is not None:
+            return fetch_ard_frames(self.ard, self.state)
+
+        success, reading = self.ard.query_ascii_values("?", delimiter="\t")
+        return success, [reading]
+
+    async def _run_julabo(self):
+        if not self.julabo.is_alive:
+            return
+
+        t_next = self._loop.time()
+        while not self._stop.is_set():
+            success = await self._loop.run_in_executor(
+                self._julabo_executor, self.julabo.query_common_readings
+            )
+            if not success:
+                dprint(
+                    "'%s' reports IOError @ %s"
+                    % (self.julabo.name, time.strftime("%d-%m-%Y %H:%M:%S"))
+                )
+
+            t_next = await self._sleep_until(t_next, self.julabo_interval_ms)
+
+    async def _run_flusher(self):
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), LOG_FLUSH_INTERVAL_S)
+            except asyncio.TimeoutError:
+                await self._flush_log()
+
+    async def _run_status(self):
+        proc = psutil.Process()
+        proc.cpu_percent()  # Start measuring
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), STATUS_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+
+            print(
+                "%s  %8.0f s  %9i rows  DS %5.1f °C  Julabo %6.2f °C  "
+                "dropped %i  corrupt %i  CPU %4.1f %%  RSS %5.1f MB"
+                % (
+                    time.strftime("%H:%M:%S"),
+                    time.perf_counter() - self._t_start,
+                    self.n_rows,
+                    self.state.ds_temp,
+                    self.julabo.state.bath_temp,
+                    self.state.n_frames_dropped,
+                    self.state.n_frames_corrupt,
+                    proc.cpu_percent(),
+                    proc.memory_info().rss / 2**20,
+                )
+            )
+
+    # --------------------------------------------------------------------------
+    #   Logging
+    # --------------------------------------------------------------------------
+
+    def _start_recording(self):
+        str_cur_datetime = time.strftime("%y%m%d_%H%M%S")
+        self.log_filepath = str_cur_datetime + ".txt"
+        if self.compression is not None:
+            self.log_filepath += COMPRESSION_EXTS[self.compression]
+        header = log_header(self.comments)
+
+        binary_filepath = str_cur_datetime + BINARY_LOG_EXT
+
+        self._log = self._open_log(self.log_filepath)
+        self._log.write(header)
+        self._t_start = time.perf_counter()
+        self._rotation.start(
+            self.log_filepath,
+            header,
+            binary_filepath if self.record_binary_log else None,
+        )
+        print("Recording to file: %s" % self.log_filepath)
+
+        if self.record_binary_log:
+            try:
+                self._binlog.open(binary_filepath, header)
+            except Exception as err:
+                pft(err, 3)
+
+    def _rotate_log(self):
+        """Continue the recording in the next segment, see `LogRotation`."""
+        filepath, binary_filepath = self._rotation.next_segment()
+        try:
+            log = self._open_log(filepath)
+        except Exception as err:
+            pft(err, 3)
+            self._rotation.abort_segment()  # Continue in the current segment
+            return
+
+        try:
+            self._log.flush()
+            if LOG_FSYNC:
+                os.fsync(self._log.fileno())
+            self._log.close()
+        except Exception as err:
+            pft(err, 3)
+        self._log = log
+        self._log.write(self._rotation.header)
+        self.log_filepath = str(filepath)
+        print("Continuing in file: %s" % self.log_filepath)
+
+        if binary_filepath is not None:
+            try:
+                self._binlog.open(binary_filepath, self._rotation.header)
+            except Exception as err:
+                pft(err, 3)
+
+    def _open_log(self, filepath):
+        return open_log_writer(
+            filepath,
+            "w",
+            compression=self.compression,
+            encoding="utf-8",
+            flush_interval_s=LOG_FLUSH_INTERVAL_S,
+        )
+
+    def _write_row(self):
+        # The Julabo readings get filled in once aligned
+        values = log_values(self.state.time - self._t_start, self.state)
+        self.julabo_aligner.push(self.state.time, values)
+        self._write_aligned_rows()
+
+    def _write_aligned_rows(self, flush: bool = False):
+        for values in self.julabo_aligner.pop_ready(
+            time.perf_counter(), flush
+        ):
+            self._write_values(values)
+
+    def _write_values(self, values: tuple):
+        if self._rotation.due(values[0]):
+            self._rotate_log()
+
+        line = LOG_ROW_FORMAT % values
+        self._log.write(line)
+        self._rotation.add_row(values[0], len(line))
+        self.n_rows += 1
+
+        if self._binlog.is_open():
+            self._binlog.write(*values)
+
+    async def _flush_log(self):
+        """Flush the log file, leaving the slow `os.fsync()` to a thread."""
+        try:
+            self._log.flush()
+            if LOG_FSYNC:
+                await self._loop.run_in_executor(
+                    None, os.fsync, self._log.fileno()
+                )
+        except Exception as err:
+            pft(err, 3)
+
+    # --------------------------------------------------------------------------
+    #   Termination
+    # --------------------------------------------------------------------------
+
+    def _install_signal_handlers(self):
+        signums = [signal.SIGINT, signal.SIGTERM]
+        if hasattr(signal, "SIGHUP"):
+            signums.append(signal.SIGHUP)  # Terminal got closed
+
+        for signum in signums:
+            try:
+                self._loop.add_signal_handler(signum, self._on_signal, signum)
+            except NotImplementedError:
+                # Windows: Fall back to a regular signal handler
+                signal.signal(
+                    signum,
+                    lambda signum, _frame: self._loop.call_soon_threadsafe(
+                        self._on_signal, signum
+                    ),
+                )
+
+    def _on_signal(self, signum):
+        print("\nReceived %s, stopping..." % signal.Signals(signum).name)
+        self._stop.set()
+
+    async def _shut_down(self):
+        if self.sample_interval_ms is not None and not self.connection_lost:
+            # Fetch the readings taken since the last fetch
+            await self._update_arduino()
+            await self._loop.run_in_executor(
+                self._ard_executor, self.ard.write, "halt"
+            )
+
+        self._write_aligned_rows(flush=True)
+        await self._flush_log()
+        self._log.close()
+        self._binlog.close()
+        self._rotation.finish()
+        if self._rotation.manifest_filepath is not None:
+            print(
+                "Recorded %i rows to the segments listed in: %s"
+                % (self.n_rows, self._rotation.manifest_filepath)
+            )
+        else:
+            print(
+                "Recorded %i rows to file: %s"
+                % (self.n_rows, self.log_filepath)
+            )
+
+        self._ard_executor.shutdown()
+        self._julabo_executor.shutdown()
+
+
+# ------------------------------------------------------------------------------
+#   Main
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Headless acquisition of the Twente Dodecahedron."
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=1000,
+        help="DAQ interval [ms] (default: 1000)",
+    )
+    parser.add_argument(
+        "--ring",
+        type=int,
+        metavar="MS",
+        help="let the Arduino sample into its ring buffer at this interval "
+        "[ms]",
+    )
+    parser.add_argument(
+        "--clock-sync",
+        action="store_true",
+        help="timestamp the readings by the clock of the Arduino",
+    )
+    parser.add_argument(
+        "--julabo-interval",
+        type=int,
+        default=1000,
+        metavar="MS",
+        help="Julabo poll interval [ms] (default: 1000)",
+    )
+    parser.add_argument(
+        "--julabo-align",
+        choices=ALIGN_MODES,
+        default=ALIGN_LATEST,
+        help="align the Julabo readings to the Arduino readings by taking the "
+        "latest one before, or by interpolating (default: latest)",
+    )
+    parser.add_argument(
+        "--comments", default="", help="comments for the log file header"
+    )
+    parser.add_argument(
+        "--binary-log",
+        action="store_true",
+        help="also record to a binary log file",
+    )
+    parser.add_argument(
+        "--duration", type=float, help="stop after this number of seconds"
+    )
+    parser.add_argument(
+        "--rotate-hours",
+        type=float,
+        metavar="H",
+        help="start a new segment of the log file after this number of hours "
+        "of data",
+    )
+    parser.add_argument(
+        "--rotate-mb",
+        type=float,
+        metavar="MB",
+        help="start a new segment of the log file after this number of MB of "
+        "text",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=list(COMPRESSION_EXTS),
+        help="compress the log file on the fly",
+    )
+    args = parser.parse_args()
+
+    # Set priority of this process to maximum in the operating system
+    print("PID: %s\n" % os.getpid())
+    try:
+        proc = psutil.Process(os.getpid())
+        if os.name == "nt":
+            proc.nice(psutil.REALTIME_PRIORITY_CLASS)  # Windows
+        else:
+            proc.nice(-20)  # Other
+    except:
+        print("Warning: Could not set process to maximum priority.\n")
+
+    # --------------------------------------------------------------------------
+    #   Connect to devices
+    # --------------------------------------------------------------------------
+
+    # Arduino
+    ard = Arduino(name="Ard", connect_to_specific_ID="Dodecahedron logger")
+    ard.serial_settings["baudrate"] = 115200
+    ard.auto_connect(filepath_last_known_port="config/port_Arduino.txt")
+
+    if not (ard.is_alive):
+        print("\nCheck connection and try resetting the Arduino.")
+        print("Exiting...\n")
+        sys.exit(0)
+
+    check_firmware_version(ard)
+
+    # Julabo
+    julabo = Julabo_circulator_idle(name="Julabo")
+    if julabo.auto_connect(filepath_last_known_port="config/port_Julabo.txt"):
+        julabo.begin()
+
+    if profiler is not None:
+        profiler.mark("Devices connected")
+        profiler.print_report()
+
+    # --------------------------------------------------------------------------
+    #   Run
+    # --------------------------------------------------------------------------
+
+    daq = HeadlessDAQ(
+        ard,
+        julabo,
+        DAQ_interval_ms=args.interval,
+        sample_interval_ms=args.ring,
+        clock_sync=args.clock_sync,
+        julabo_interval_ms=args.julabo_interval,
+        julabo_align=args.julabo_align,
+        comments=args.comments,
+        record_binary_log=args.binary_log,
+        rotate_hours=args.rotate_hours,
+        rotate_MB=args.rotate_mb,
+        compression=args.compress,
+    )
+    success = asyncio.run(daq.run(duration_s=args.duration))
+
+    ard.close()
+    julabo.close()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Level-of-detail history buffer for the live charts of the Twente
+Dodecahedron control program.
+
+The most recent samples are kept at full resolution. Older samples are kept
+as min/max roll-ups at successively coarser levels of detail, each level
+combining `factor` entries of the level below. Every level is a ring buffer
+of the same capacity, so a chart drawing from a single level has a constant
+cost, no matter how long the history spans.
+
+All channels share a single time axis and are appended in one go per sample,
+keeping them sample-aligned.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import threading
+
+import numpy as np
+
+
+class LODHistory:
+    """Thread-safe level-of-detail history of one or more channels sharing
+    the same time axis.
+
+    Args:
+        capacity (int):
+            Number of entries kept per level. Level 0 holds the last
+            `capacity` samples at full resolution.
+
+        n_channels (int, default=1):
+            Number of data channels per sample.
+
+        n_levels (int, default=3):
+            Number of levels of detail. Level `k` spans `capacity * factor**k`
+            samples.
+
+        factor (int, default=12):
+            Number of entries of level `k - 1` combined into a single min/max
+            entry of level `k`.
+
+        dtype (numpy.dtype, default=numpy.float64):
+            Data type of the channel values. The time axis is always stored as
+            float64.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        n_channels: int = 1,
+        n_levels: int = 3,
+        factor: int = 12,
+        dtype=np.float64,
+    ):
+        self.capacity = capacity
+        self.n_channels = n_channels
+        self.n_levels = n_levels
+        self.factor = factor
+        self.dtype = np.dtype(dtype)
+
+        self._lock = threading.Lock()
+        self._version = 0  # Incremented on every change of the contents
+
+        # Ring buffers per level. Level 0 holds single samples, so there the
+        # mid time equals the end time and the max equals the min.
+        self._t_end = []  # Time of last sample in entry
+        self._t_mid = []  # Time to plot the entry at
+        self._lo = []  # Minimum value per channel
+        self._hi = []  # Maximum value per channel
+        for k in range(n_levels):
+            self._t_end.append(np.full(capacity, np.nan))
+            self._lo.append(np.full((capacity, n_channels), np.nan, dtype))
+            if k == 0:
+                self._t_mid.append(self._t_end[0])
+                self._hi.append(self._lo[0])
+            else:
+                self._t_mid.append(np.full(capacity, np.nan))
+                self._hi.append(np.full((capacity, n_channels), np.nan, dtype))
+        self._count = [0] * n_levels  # Total number of entries ever pushed
+
+        # Accumulators of the entry currently being built per level
+        self._acc_n = [0] * n_levels
+        self._acc_t_first = [np.nan] * n_levels
+        self._acc_lo = np.full((n_levels, n_channels), np.nan, dtype)
+        self._acc_hi = np.full((n_levels, n_channels), np.nan, dtype)
+
+    @staticmethod
+    def _nbytes(capacity, n_channels, n_levels, dtype) -> int:
+        level_0 = capacity * (8 + n_channels * np.dtype(dtype).itemsize)
+        return level_0 + 2 * level_0 * (n_levels - 1)
+
+    @classmethod
+    def from_memory_budget(
+        cls,
+        budget_bytes: float,
+        total_samples: int,
+        n_channels: int = 1,
+        factor: int = 12,
+        dtype=np.float64,
+    ):
+        """Create the LODHistory with the largest full-resolution capacity
+        that fits within `budget_bytes`, while its coarsest level spans at
+        least `total_samples` samples.
+        """
+        n_levels = 1
+        while True:
+            capacity = int(
+                budget_bytes // cls._nbytes(1, n_channels, n_levels, dtype)
+            )
+            if capacity < factor:
+                raise ValueError(
+                    "Memory budget of %i bytes is too small." % budget_bytes
+                )
+            if capacity * factor ** (n_levels - 1) >= total_samples:
+                break
+            n_levels += 1
+
+        return cls(capacity, n_channels, n_levels, factor, dtype)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory allocated by the ring buffers."""
+        return self._nbytes(
+            self.capacity, self.n_channels, self.n_levels, self.dtype
+        )
+
+    def append(self, t: float, values):
+        """Append a single sample.
+
+        Args:
+            t (float): Time of the sample
+            values (float, list of float): One value per channel
+        """
+        values = np.asarray(values, dtype=self.dtype).reshape(self.n_channels)
+        with self._lock:
+            self._push(0, t, t, values, values)
+            self._version += 1
+
+    def clear(self):
+        with self._lock:
+            for k in range(self.n_levels):
+                self._t_end[k].fill(np.nan)
+                self._t_mid[k].fill(np.nan)
+                self._lo[k].fill(np.nan)
+                self._hi[k].fill(np.nan)
+            self._count = [0] * self.n_levels
+            self._acc_n = [0] * self.n_levels
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Number of changes made to the contents so far. A snapshot taken at
+        an equal version is still current."""
+        return self._version
+
+    def __len__(self):
+        """Number of samples at full resolution currently held."""
+        return min(self._count[0], self.capacity)
+
+    def snapshot(self, span: float, channel: int = 0):
+        """Return a copy of the history of a single channel covering the last
+        `span` time units, drawn from the finest level of detail that covers
+        it. Coarse levels return a (min, max) pair per entry. The entries
+        still being rolled up are filled in from the finer levels, so the
+        most recent samples are always included.
+
+        Returns: (x, y) as numpy.ndarray
+        """
+        with self._lock:
+            if self._count[0] == 0:
+                return np.array([]), np.array([])
+
+            t_now = self._t_end[0][(self._count[0] - 1) % self.capacity]
+            t_from = t_now - span
+
+            level = self.n_levels - 1
+            for k in range(self.n_levels):
+                if self._count[k] <= self.capacity:
+                    # Level has not wrapped around yet: holds all history
+                    level = k
+                    break
+                i_oldest = self._count[k] % self.capacity
+                if self._t_end[k][i_oldest] <= t_from:
+                    level = k
+                    break
+
+            return self._level_data(level, t_from, -np.inf, channel)
+
+    # --------------------------------------------------------------------------
+    #   Private, to be called with the lock held
+    # --------------------------------------------------------------------------
+
+    def _push(self, k: int, t_first: float, t_last: float, lo, hi):
+        idx = self._count[k] % self.capacity
+        self._t_end[k][idx] = t_last
+        self._lo[k][idx] = lo
+        if k > 0:
+            self._t_mid[k][idx] = (t_first + t_last) / 2
+            self._hi[k][idx] = hi
+        self._count[k] += 1
+
+        if k + 1 == self.n_levels:
+            return
+
+        # Roll up into the next level. `fmin` and `fmax` ignore NaNs, unless
+        # all values are NaN.
+        k += 1
+        if self._acc_n[k] == 0:
+            self._acc_t_first[k] = t_first
+            self._acc_lo[k] = lo
+            self._acc_hi[k] = hi
+        else:
+            np.fmin(self._acc_lo[k], lo, out=self._acc_lo[k])
+            np.fmax(self._acc_hi[k], hi, out=self._acc_hi[k])
+        self._acc_n[k] += 1
+
+        if self._acc_n[k] == self.factor:
+            self._acc_n[k] = 0
+            self._push(
+                k,
+                self._acc_t_first[k],
+                t_last,
+                self._acc_lo[k].copy(),
+                self._acc_hi[k].copy(),
+            )
+
+    def _ordered(self, arr: np.ndarray, k: int) -> np.ndarray:
+        """Return the contents of ring buffer `arr` of level `k` in
+        chronological order."""
+        count = self._count[k]
+        if count <= self.capacity:
+            return arr[:count]
+
+        idx = count % self.capacity
+        return np.concatenate((arr[idx:], arr[:idx]))
+
+    def _level_data(self, k: int, t_from: float, t_after: float, channel):
+        """Entries of level `k` ending at or after `t_from` and strictly after
+        `t_after`, followed by the more recent entries of the finer levels."""
+        t_end = self._ordered(self._t_end[k], k)
+        i_start = max(
+            np.searchsorted(t_end, t_from, side="left"),
+            np.searchsorted(t_end, t_after, side="right"),
+        )
+
+        if k == 0:
+            x = t_end[i_start:]
+            y = self._ordered(self._lo[k][:, channel], k)[i_start:]
+            return np.array(x), np.array(y)
+
+        t_mid = self._ordered(self._t_mid[k], k)[i_start:]
+        lo = self._ordered(self._lo[k][:, channel], k)[i_start:]
+        hi = self._ordered(self._hi[k][:, channel], k)[i_start:]
+        x = np.repeat(t_mid, 2)
+        y = np.stack((lo, hi), axis=1).ravel()
+
+        if len(t_end) > 0:
+            t_after = max(t_after, t_end[-1])
+        x_tail, y_tail = self._level_data(k - 1, t_from, t_after, channel)
+
+        return np.concatenate((x, x_tail)), np.concatenate((y, y_tail))
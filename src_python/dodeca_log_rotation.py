@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Rotation of the log file of a long recording of the Twente Dodecahedron
+control program into segments.
+
+A new segment gets started every `max_hours` hours of data or `max_MB` MB of
+text, whichever comes first. Each segment is a complete log file on its own,
+repeating the header. The `time` column continues across the segments, i.e.
+it remains relative to the start of the recording.
+
+The first segment is named like an unrotated log file, e.g.
+`231220_163225.txt`, and the next ones get a suffix, e.g.
+`231220_163225_seg002.txt`. A manifest, e.g. `231220_163225.manifest.json`,
+ties the segments together. It gets rewritten on each rotation and when the
+recording stops. Pass it to `dodeca_read_log.read_log()` to read back the
+whole recording as one log.
+
+Manifest layout:
+    {
+        "format": "dodeca-manifest",
+        "version": 1,
+        "recording": "231220_163225",
+        "rotation": {"max_hours": 24, "max_MB": null},
+        "complete": true,           # False while still recording
+        "segments": [
+            {
+                "file": "231220_163225.txt",
+                "binary_file": null,    # Binary twin, if any
+                "n_rows": 86400,
+                "t_first": 0.0,         # [s] Time of the first row
+                "t_last": 86399.0       # [s] Time of the last row
+            },
+            ...
+        ]
+    }
+The row counts and times of the segment being recorded are only up to date
+once it has been completed.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import json
+import os
+from pathlib import Path
+
+from dodeca_compression import strip_compression_ext
+
+MANIFEST_FORMAT = "dodeca-manifest"
+MANIFEST_VERSION = 1
+MANIFEST_EXT = ".manifest.json"
+
+# Time to wait before trying again to start a new segment, after its log file
+# could not be created [s]
+RETRY_INTERVAL_S = 60
+
+
+def is_manifest(filepath) -> bool:
+    """Check the file name for the manifest of a rotated recording."""
+    return Path(filepath).name.lower().endswith(MANIFEST_EXT)
+
+
+def read_manifest(filepath) -> dict:
+    """Read in the manifest of a rotated recording, see the module
+    docstring."""
+    with Path(filepath).open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != MANIFEST_FORMAT:
+        raise Exception("Incorrect file format. Not a manifest.")
+    if manifest.get("version", 0) > MANIFEST_VERSION:
+        raise Exception(
+            "Unsupported manifest version %i." % manifest["version"]
+        )
+
+    return manifest
+
+
+def segment_filepath(filepath, i_segment: int) -> Path:
+    """File path of segment number `i_segment`, counting from 1, of the
+    recording starting with the log file `filepath`. A compression extension
+    is kept at the end, e.g. `231220_163225_seg002.txt.gz`."""
+    filepath = Path(filepath)
+    if i_segment == 1:
+        return filepath
+
+    base = strip_compression_ext(filepath)
+    return filepath.with_name(
+        "%s_seg%03i%s%s"
+        % (
+            base.stem,
+            i_segment,
+            base.suffix,
+            filepath.name[len(base.name) :],
+        )
+    )
+
+
+# ------------------------------------------------------------------------------
+#   LogRotation
+# ------------------------------------------------------------------------------
+
+
+class LogRotation:
+    """Keeps track of the segments of a recording and decides when to start
+    the next one. Opening and closing the files is left to the caller. Not
+    thread-safe: to be used from the thread writing the log.
+
+    Args:
+        max_hours (float, optional):
+            Start a new segment after this number of hours of data.
+
+        max_MB (float, optional):
+            Start a new segment after this number of MB of text.
+
+    Without either, rotation is disabled: all data goes into a single log
+    file and no manifest gets written.
+
+    Example usage:
+        rotation = LogRotation(max_hours=24)
+        rotation.start("231220_163225.txt", header)
+        for each row:
+            if rotation.due(t):
+                filepath, _ = rotation.next_segment()
+                # Open `filepath`, writing the header, and close the log file.
+                # If `filepath` could not be created: rotation.abort_segment()
+            line = row_format % values
+            # Write line
+            rotation.add_row(t, len(line))
+        rotation.finish()
+    """
+
+    def __init__(self, max_hours: float = None, max_MB: float = None):
+        self.max_hours = max_hours
+        self.max_MB = max_MB
+        self.header = ""
+        self.manifest_filepath = None
+
+        self._first_filepath = None
+        self._first_binary_filepath = None
+        self._segments = []
+        self._n_bytes = 0  # Text written to the current segment [bytes]
+        self._n_bytes_prev = 0  # Idem, of the previous segment
+        self._t_retry = None  # [s] No new segment before this time
+        self._is_active = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_hours is not None or self.max_MB is not None
+
+    def is_active(self) -> bool:
+        """Is a recording in progress, i.e. started but not finished?"""
+        return self._is_active
+
+    def start(self, filepath, header: str = "", binary_filepath=None):
+        """Start keeping track of a new recording, with `filepath` as its
+        first log file. The `header` gets stored for reuse by the caller, and
+        `binary_filepath` is the binary twin of the log file, if any."""
+        self.header = header
+        self._first_filepath = Path(filepath)
+        self._first_binary_filepath = (
+            None if binary_filepath is None else Path(binary_filepath)
+        )
+        self._segments = []
+        self._t_retry = None
+        self._is_active = True
+        self.manifest_filepath = None
+        if self.enabled:
+            self.manifest_filepath = self._first_filepath.with_name(
+                strip_compression_ext(self._first_filepath).stem + MANIFEST_EXT
+            )
+
+        self._add_segment(self._first_filepath, self._first_binary_filepath)
+
+    def add_row(self, t: float, n_bytes: int = 0):
+        """Register a row of data written at time `t` [s], taking up `n_bytes`
+        bytes of text."""
+        segment = self._segments[-1]
+        if segment["n_rows"] == 0:
+            segment["t_first"] = t
+        segment["t_last"] = t
+        segment["n_rows"] += 1
+        self._n_bytes += n_bytes
+
+    def due(self, t: float) -> bool:
+        """Should the row at time `t` [s] go into a new segment?"""
+        if not (self.enabled and self._is_active):
+            return False
+
+        segment = self._segments[-1]
+        if segment["n_rows"] == 0:
+            return False
+        if self._t_retry is not None and t < self._t_retry:
+            return False
+
+        return (
+            self.max_hours is not None
+            and t - segment["t_first"] >= self.max_hours * 3600
+        ) or (
+            self.max_MB is not None and self._n_bytes >= self.max_MB * 2**20
+        )
+
+    def next_segment(self) -> tuple:
+        """Start the next segment.
+
+        Returns: (pathlib.Path of the log file, pathlib.Path of its binary
+        twin or None)
+        """
+        i_segment = len(self._segments) + 1
+        filepath = segment_filepath(self._first_filepath, i_segment)
+        binary_filepath = None
+        if self._first_binary_filepath is not None:
+            binary_filepath = segment_filepath(
+                self._first_binary_filepath, i_segment
+            )
+
+        self._add_segment(filepath, binary_filepath)
+        return filepath, binary_filepath
+
+    def abort_segment(self):
+        """The log file of the segment just started by `next_segment()` could
+        not be created. Continue the current segment instead, and try again
+        after `RETRY_INTERVAL_S` seconds of data."""
+        if len(self._segments) < 2:
+            return
+
+        self._segments.pop()
+        self._n_bytes = self._n_bytes_prev
+        self._t_retry = self._segments[-1]["t_last"] + RETRY_INTERVAL_S
+        self._write_manifest()
+
+    def finish(self):
+        """Mark the recording as complete."""
+        if self._is_active:
+            self._is_active = False
+            self._write_manifest()
+
+    # --------------------------------------------------------------------------
+    #   Private
+    # --------------------------------------------------------------------------
+
+    def _add_segment(self, filepath: Path, binary_filepath: Path):
+        self._segments.append(
+            {
+                "file": filepath.name,
+                "binary_file": (
+                    None if binary_filepath is None else binary_filepath.name
+                ),
+                "n_rows": 0,
+                "t_first": None,
+                "t_last": None,
+            }
+        )
+        self._n_bytes_prev = self._n_bytes
+        self._n_bytes = 0
+        self._write_manifest()
+
+    def _write_manifest(self):
+        if self.manifest_filepath is None:
+            return
+
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "version": MANIFEST_VERSION,
+            "recording": strip_compression_ext(self._first_filepath).stem,
+            "rotation": {"max_hours": self.max_hours, "max_MB": self.max_MB},
+            "complete": not self._is_active,
+            "segments": self._segments,
+        }
+
+        # Write to a temporary file first, so that a crash can never leave a
+        # partial manifest behind under the final name
+        tmp_path = self.manifest_filepath.with_name(
+            self.manifest_filepath.name + ".tmp"
+        )
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=4)
+            os.replace(tmp_path, self.manifest_filepath)
+        except OSError as err:
+            print("Warning: Could not write the manifest.\n  %s" % err)
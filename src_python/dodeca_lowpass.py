@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Zero-phase low-pass filtering of the timeseries of the logs acquired by the
+Twente Dodecahedron control program, as used by `dodeca_read_log.py`.
+
+A Butterworth filter in second-order sections is run forwards and backwards
+over the data, identical to `scipy.signal.sosfiltfilt()` with its default odd
+padding. On top of that:
+
+    - The series gets split at gaps in time, like a pause of the recording,
+      and each segment gets filtered on its own. A gap no longer rings into
+      the data around it.
+
+    - Short runs of NaN values get interpolated linearly before filtering and
+      come out filtered. Runs spanning longer than a gap split the series as
+      well and stay NaN.
+
+    - Segments get processed in chunks, carrying over the filter state. The
+      memory used on top of the returned array stays bounded, however long
+      the series, and the outcome is identical for any chunk size.
+
+Segments too short to be filtered are returned unfiltered.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import numpy as np
+from scipy import signal
+
+# Defaults
+# fmt: off
+GAP_FACTOR    = 5        # Time steps this many times the typical one are gaps
+CHUNK_SAMPLES = 1 << 16  # Number of samples to filter in one go
+# fmt: on
+
+# ------------------------------------------------------------------------------
+#   Filter design
+# ------------------------------------------------------------------------------
+
+
+def design_lowpass(f3db: float, order: int, f_s: float) -> np.ndarray:
+    """Butterworth low-pass filter in second-order sections.
+
+    Args:
+        f3db (float): Cut-off frequency [Hz]
+        order (int): Filter order
+        f_s (float): Sampling frequency [Hz]
+
+    Returns: numpy.ndarray of shape (n_sections, 6)
+    """
+    return signal.butter(order, f3db / (f_s / 2), "lowpass", output="sos")
+
+
+def padlen(sos: np.ndarray) -> int:
+    """Number of samples of odd padding at either end of the series, matching
+    the default of `scipy.signal.sosfiltfilt()`."""
+    n_trivial = min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum())
+    return 3 * (2 * len(sos) + 1 - n_trivial)
+
+
+# ------------------------------------------------------------------------------
+#   Filtering
+# ------------------------------------------------------------------------------
+
+
+def sosfiltfilt_chunked(
+    sos: np.ndarray, x: np.ndarray, chunk_samples: int = CHUNK_SAMPLES
+):
+    """Filter the finite series `x` forwards and backwards in place, in chunks
+    of `chunk_samples`. Identical to `x[:] = scipy.signal.sosfiltfilt(sos, x)`.
+
+    Args:
+        x (numpy.ndarray):
+            Writable float64 array, longer than `padlen(sos)` samples.
+    """
+    n_pad = padlen(sos)
+    if len(x) <= n_pad:
+        raise ValueError(
+            "Series of %i samples is too short to be filtered." % len(x)
+        )
+
+    # Odd extensions at both ends, taken before `x` gets overwritten
+    left = 2 * x[0] - x[n_pad:0:-1]
+    right = 2 * x[-1] - x[-2 : -n_pad - 2 : -1]
+    zi = signal.sosfilt_zi(sos)
+
+    # Forward
+    _, z = signal.sosfilt(sos, left, zi=zi * left[0])
+    for i in range(0, len(x), chunk_samples):
+        x[i : i + chunk_samples], z = signal.sosfilt(
+            sos, x[i : i + chunk_samples], zi=z
+        )
+    right, _ = signal.sosfilt(sos, right, zi=z)
+
+    # Backward, starting at the end of the right extension
+    _, z = signal.sosfilt(sos, right[::-1], zi=zi * right[-1])
+    for i_end in range(len(x), 0, -chunk_samples):
+        i = max(i_end - chunk_samples, 0)
+        y, z = signal.sosfilt(sos, x[i:i_end][::-1], zi=z)
+        x[i:i_end] = y[::-1]
+
+
+def find_segments(
+    t: np.ndarray,
+    y: np.ndarray,
+    max_step: float,
+    chunk_samples: int = CHUNK_SAMPLES,
+) -> list:
+    """Split a series into segments at steps in time larger than `max_step`,
+    at non-increasing or non-finite times and at runs of NaN values in `y`
+    spanning longer than `max_step`.
+
+    Returns: list of (start, stop) indices of the segments, trimmed of NaN
+    values at either end.
+    """
+    segments = []
+    start = stop = None  # Of the current segment
+    t_prev = np.nan  # Time of the last finite sample
+
+    for i in range(0, len(y), chunk_samples):
+        t_chunk = t[i : i + chunk_samples]
+        idx = np.flatnonzero(
+            np.isfinite(y[i : i + chunk_samples]) & np.isfinite(t_chunk)
+        )
+        if len(idx) == 0:
+            continue
+
+        # Split in between consecutive finite samples lying too far apart
+        t_valid = t_chunk[idx]
+        dt = np.diff(t_valid, prepend=t_prev)
+        for j in np.flatnonzero(~((dt > 0) & (dt <= max_step))):  # Also NaN
+            if start is not None:
+                segments.append((start, i + idx[j - 1] + 1 if j else stop))
+            start = i + idx[j]
+
+        stop = i + idx[-1] + 1
+        t_prev = t_valid[-1]
+
+    if start is not None:
+        segments.append((start, stop))
+
+    return segments
+
+
+def fill_nan(t: np.ndarray, x: np.ndarray, chunk_samples: int = CHUNK_SAMPLES):
+    """Linearly interpolate the NaN values of `x` in place, in chunks of
+    `chunk_samples`. The first and last value of `x` must be finite."""
+    for i in range(0, len(x), chunk_samples):
+        if not np.isnan(x[i : i + chunk_samples]).any():
+            continue
+
+        # Widen the chunk to the finite values around it. The value before it
+        # got filled in already.
+        lo = max(i - 1, 0)
+        hi = min(i + chunk_samples, len(x) - 1)
+        while np.isnan(x[hi]):
+            hi += 1
+
+        t_win = t[lo : hi + 1]
+        x_win = x[lo : hi + 1]
+        nan = np.isnan(x_win)
+        x_win[nan] = np.interp(t_win[nan], t_win[~nan], x_win[~nan])
+
+
+def lowpass_filtfilt(
+    t: np.ndarray,
+    y: np.ndarray,
+    f3db: float,
+    order: int,
+    gap_factor: float = GAP_FACTOR,
+    chunk_samples: int = CHUNK_SAMPLES,
+) -> np.ndarray:
+    """Zero-phase low-pass filter the series `y` sampled at times `t` [s].
+
+    Args:
+        t (numpy.ndarray):
+            Sample times [s], increasing. The sampling frequency is taken as
+            the inverse of the median time step.
+
+        y (numpy.ndarray):
+            Sample values, may contain NaN values. Not altered.
+
+        f3db (float):
+            Cut-off frequency [Hz].
+
+        order (int):
+            Butterworth filter order.
+
+        gap_factor (float, default=GAP_FACTOR):
+            Time steps larger than `gap_factor` times the median time step
+            split the series.
+
+        chunk_samples (int, default=CHUNK_SAMPLES):
+            Number of samples to process in one go.
+
+    Returns: The filtered series as a new float64 numpy.ndarray.
+    """
+    dt = np.median(np.diff(t), overwrite_input=True) if len(t) > 1 else 0
+    if not dt > 0:  # Also NaN
+        return np.array(y, dtype=np.float64)
+
+    sos = design_lowpass(f3db, order, 1 / dt)
+    n_pad = padlen(sos)
+
+    out = np.full(len(y), np.nan)
+    for start, stop in find_segments(t, y, gap_factor * dt, chunk_samples):
+        seg = out[start:stop]
+        seg[:] = y[start:stop]
+        fill_nan(t[start:stop], seg, chunk_samples)
+
+        if len(seg) > n_pad:
+            sosfiltfilt_chunked(sos, seg, chunk_samples)
+
+    return out
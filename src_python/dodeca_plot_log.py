@@ -6,21 +6,22 @@ program. The plot will be saved as image to disk.
 __author__ = "Dennis van Gils"
 __authoremail__ = "vangils.dennis@gmail.com"
 __url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
-__date__ = "03-03-2021"
-__version__ = "1.0"
+__date__ = "16-10-2026"
+__version__ = "1.1"
+
+from dodeca_startup import enable_startup_profiler
+
+profiler = enable_startup_profiler()
 
 import sys
 import os
 import numpy as np
 
-import tkinter
-from tkinter import filedialog
-
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-
 from dodeca_read_log import read_log, Log
 
+# Note: matplotlib and tkinter are only imported when needed, as they take
+# long to load
+
 # Characters
 CHAR_PM = u"\u00B1"
 CHAR_DEG = u"\u00B0"
@@ -40,21 +41,102 @@ cm = (
     / 255
 )
 
+# Default maximum number of points to plot per timeseries. The saved figure is
+# ~1300 px wide per axis, so this allows for a min/max pair per pixel column.
+MAX_POINTS = 3000
+
+# ------------------------------------------------------------------------------
+#   decimate_minmax
+# ------------------------------------------------------------------------------
+
+
+def _minmax_bins(x: np.ndarray, y: np.ndarray):
+    """Reduce each row of the 2D arrays `x` and `y`, i.e. each bin, to the
+    samples holding the minimum and maximum value. Bins containing NaNs get
+    an additional NaN sample at the location of the first NaN, so that the
+    plotted line gets interrupted.
+    """
+    isnan = np.isnan(y)
+    has_nan = isnan.any(axis=1)
+    all_nan = isnan.all(axis=1)
+    i_min = np.argmin(np.where(isnan, np.inf, y), axis=1)
+    i_max = np.argmax(np.where(isnan, -np.inf, y), axis=1)
+    i_nan = np.argmax(isnan, axis=1)
+
+    idx = np.stack((i_min, i_max, i_nan), axis=1)
+    valid = np.stack((~all_nan, ~all_nan & (i_max != i_min), has_nan), axis=1)
+
+    # Keep the samples in chronological order within each bin
+    order = np.argsort(idx, axis=1)
+    idx = np.take_along_axis(idx, order, axis=1)
+    valid = np.take_along_axis(valid, order, axis=1)
+    xs = np.take_along_axis(x, idx, axis=1)
+    ys = np.take_along_axis(y, idx, axis=1)
+
+    return xs[valid], ys[valid]
+
+
+def decimate_minmax(
+    x: np.ndarray, y: np.ndarray, max_points: int = MAX_POINTS
+):
+    """Decimate a timeseries for plotting, while preserving its visual
+    envelope. The samples are divided into bins of equal size of which only
+    the minimum and maximum samples are kept, such that spikes remain visible.
+    Gaps of NaN values will remain visible as well.
+
+    Args:
+        x (numpy.ndarray): Time values, monotonically increasing
+        y (numpy.ndarray): Signal values, may contain NaNs
+        max_points (int, default=MAX_POINTS):
+            Approximate upper limit of the number of returned samples.
+
+    Returns: (x, y) as decimated copies, or the originals when they already
+    count fewer than `max_points` samples.
+    """
+    n = len(y)
+    if max_points is None or n <= max_points:
+        return x, y
+
+    bin_size = int(np.ceil(n / (max_points // 2)))
+    n_full = n // bin_size * bin_size
+
+    x_out, y_out = _minmax_bins(
+        x[:n_full].reshape(-1, bin_size), y[:n_full].reshape(-1, bin_size)
+    )
+    if n_full < n:
+        x_tail, y_tail = _minmax_bins(x[None, n_full:], y[None, n_full:])
+        x_out = np.concatenate((x_out, x_tail))
+        y_out = np.concatenate((y_out, y_tail))
+
+    return x_out, y_out
+
+
 # ------------------------------------------------------------------------------
 #   plot_log
 # ------------------------------------------------------------------------------
 
 
-def plot_log(log: Log):
+def plot_log(log: Log, max_points: int = MAX_POINTS):
     """
     Args:
         log (dodeca_read_log.Log): Log data structure
+        max_points (int, default=MAX_POINTS):
+            Decimate each timeseries to approximately this number of points
+            using `decimate_minmax()`, keeping the rendering time bounded for
+            long logs. Pass None to plot every sample.
     """
 
+    def decimated(y: np.ndarray):
+        return decimate_minmax(log.time, y, max_points)
+
     # --------------------------------------------------------------------------
     #   Prepare figure
     # --------------------------------------------------------------------------
 
+    # pylint: disable=import-outside-toplevel
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+
     mpl.style.use("dark_background")
     mpl.rcParams["font.size"] = 12
     # mpl.rcParams['font.weight'] = "bold"
@@ -67,7 +149,7 @@ def plot_log(log: Log):
     mpl.rcParams["grid.color"] = "0.25"
 
     fig1 = plt.figure(figsize=(16, 10), dpi=90)
-    fig1.canvas.set_window_title("%s" % log.filename)
+    fig1.canvas.manager.set_window_title("%s" % log.filename)
 
     ax1 = fig1.add_subplot(4, 1, 1)
     ax2 = fig1.add_subplot(4, 1, 2, sharex=ax1)
@@ -76,10 +158,10 @@ def plot_log(log: Log):
 
     # Julabo temperatures
     ax1.plot(
-        log.time, log.Julabo_setp, "-", color=cm[4], label=("Julabo setp."),
+        *decimated(log.Julabo_setp), "-", color=cm[4], label=("Julabo setp."),
     )
     ax1.plot(
-        log.time, log.Julabo_bath, "-", color=cm[5], label=("Julabo bath"),
+        *decimated(log.Julabo_bath), "-", color=cm[5], label=("Julabo bath"),
     )
 
     ax1.set_title("%s\nJulabo temperatures" % (log.filename))
@@ -88,8 +170,8 @@ def plot_log(log: Log):
     ax1.grid(True)
 
     # Arduino temperatures
-    ax2.plot(log.time, log.DS_temp, color=cm[0], label="DS temp.")
-    ax2.plot(log.time, log.BME_temp, color=cm[1], label="BME temp.")
+    ax2.plot(*decimated(log.DS_temp), color=cm[0], label="DS temp.")
+    ax2.plot(*decimated(log.BME_temp), color=cm[1], label="BME temp.")
 
     ax2.set_title("Arduino temperatures (%s 0.5 K)" % CHAR_PM)
     ax2.set_xlabel("time (s)")
@@ -97,7 +179,7 @@ def plot_log(log: Log):
     ax2.grid(True)
 
     # Arduino humitidy
-    ax3.plot(log.time, log.BME_humi, color=cm[2], label="BME humi.")
+    ax3.plot(*decimated(log.BME_humi), color=cm[2], label="BME humi.")
 
     ax3.set_title("Humidity (%s 3 %%)" % CHAR_PM)
     ax3.set_xlabel("time (s)")
@@ -105,7 +187,7 @@ def plot_log(log: Log):
     ax3.grid(True)
 
     # Arduino pressure
-    ax4.plot(log.time, log.BME_pres, color=cm[3], label="BME pres.")
+    ax4.plot(*decimated(log.BME_pres), color=cm[3], label="BME pres.")
 
     ax4.set_title("Pressure (%s 1 mbar)" % CHAR_PM)
     ax4.set_xlabel("time (s)")
@@ -154,20 +236,37 @@ if __name__ == "__main__":
         filename = arg
         filename_supplied = True
 
-    root = tkinter.Tk()
-    root.withdraw()  # Disable root window
-
     if not filename_supplied:
+        # pylint: disable=import-outside-toplevel
+        import tkinter
+        from tkinter import filedialog
+
+        root = tkinter.Tk()
+        root.withdraw()  # Disable root window
         filename = filedialog.askopenfilename(
             initialdir=os.getcwd(),
             title="Select data file",
-            filetypes=(("text files", "*.txt"), ("all files", "*.*")),
+            filetypes=(
+                ("text files", "*.txt"),
+                ("compressed text files", "*.txt.gz *.txt.xz"),
+                ("all files", "*.*"),
+            ),
         )
+        root.destroy()  # Close file dialog
+
     if filename == "":
         sys.exit(0)
 
-    root.destroy()  # Close file dialog
-
     print("Reading file: %s" % filename)
-    plot_log(read_log(filename))
+    log = read_log(filename)
+    if profiler is not None:
+        profiler.mark("Log read")
+
+    plot_log(log)
+    if profiler is not None:
+        profiler.mark("Log plotted")
+        profiler.print_report()
+
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+
     plt.show()
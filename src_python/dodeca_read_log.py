@@ -1,20 +1,66 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """Reads in a log file acquired with the Twente Dodecahedron control program.
-A 2nd order Butterworth low-pass filter with a cut-off frequency of 0.1 Hz and
-zero-phase distortion will be applied to the DS18B20 and BME280 timeseries.
-Validated.
+By default, a 2nd order Butterworth low-pass filter with a cut-off frequency
+of 0.1 Hz and zero-phase distortion will be applied to the DS18B20 and BME280
+timeseries, see `dodeca_lowpass`. Validated.
 """
 __author__ = "Dennis van Gils"
 __authoremail__ = "vangils.dennis@gmail.com"
 __url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
-__date__ = "03-03-2021"
-__version__ = "1.0"
+__date__ = "16-10-2026"
+__version__ = "1.1"
+
+import json
+import os
+import warnings
 
 import numpy as np
-from scipy import signal
 from pathlib import Path
 
+from dodeca_binary_log import is_binary_log, read_binary_log
+from dodeca_compression import (
+    compression_of,
+    open_log_reader,
+    strip_compression_ext,
+)
+from dodeca_log_rotation import is_manifest, read_manifest
+
+# Data columns as written by `dodeca_acquisition.log_values()`
+COLUMNS = (
+    "time",
+    "DS_temp",
+    "BME_temp",
+    "BME_humi",
+    "BME_pres",
+    "Julabo_setp",
+    "Julabo_bath",
+)
+
+# Data columns that were added later on or that are only logged on demand, and
+# might be missing from the log
+OPTIONAL_COLUMNS = (
+    "DS_age",
+    "Julabo_age",
+    "DAQ_tick",
+    "DAQ_query",
+    "DAQ_parse",
+    "DAQ_append",
+)
+
+# Default number of data rows to parse in one go
+CHUNK_ROWS = 65536
+
+# Default low-pass filter settings
+LOWPASS_F3DB = 0.1  # Cut-off frequency [Hz]
+LOWPASS_ORDER = 2  # Butterworth filter order
+LOWPASS_CHANNELS = ("DS_temp", "BME_temp", "BME_humi", "BME_pres")
+LOWPASS_GAP_FACTOR = 5  # Split at time steps this many times the typical one
+
+# Cache of parsed logs, see `read_log(use_cache=True)`
+CACHE_DIR = ".dodeca_cache"  # Folder name, created next to the log files
+CACHE_MAX_BYTES = 2 * 1024**3  # Evict least recently used above this size
+
 
 class Log:
     def __init__(self):
@@ -27,20 +73,380 @@ class Log:
         self.BME_pres = np.array([])
         self.Julabo_setp = np.array([])
         self.Julabo_bath = np.array([])
+        self.DS_age = np.array([])
+        self.Julabo_age = np.array([])
+        self.DAQ_tick = np.array([])  # [ms] Lateness of the DAQ tick
+        self.DAQ_query = np.array([])  # [ms]
+        self.DAQ_parse = np.array([])  # [ms]
+        self.DAQ_append = np.array([])  # [ms]
+
+
+def _decode(line: bytes) -> str:
+    """The header comments are written in the locale of the recording PC,
+    which is not necessarily UTF-8.
+    """
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        return line.decode("latin-1")
+
+
+def _parse_line(line: bytes, n_cols: int) -> np.ndarray:
+    """Slow but tolerant fallback parser for a single data line. Empty or
+    malformed fields will become NaN.
+    """
+    row = np.full(n_cols, np.nan)
+    for i_col, field in enumerate(line.split(b"\t")[:n_cols]):
+        try:
+            row[i_col] = float(field)
+        except ValueError:
+            pass
+
+    return row
+
+
+def _parse_chunk(lines: list, n_cols: int) -> np.ndarray:
+    """Parse a list of tab-separated data lines into a 2D float array of shape
+    (len(lines), n_cols). The whole chunk is handed to numpy's C parser at
+    once. Should that fail, e.g. due to an empty field or a line with a wrong
+    number of fields, we fall back to parsing line by line.
+    """
+    # The bulk parse does not see line boundaries, so ragged lines could add
+    # up to the right number of values and get shifted into the wrong rows
+    if not all(line.count(b"\t") == n_cols - 1 for line in lines):
+        return _parse_lines(lines, n_cols)
+
+    with warnings.catch_warnings():
+        # Turn numpy's 'unmatched data' deprecation warning into an error
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(b"".join(lines), sep=" ")
+        except (ValueError, DeprecationWarning):
+            values = None
+
+    if values is not None and values.size == len(lines) * n_cols:
+        return values.reshape(len(lines), n_cols)
+
+    return _parse_lines(lines, n_cols)
+
+
+def _parse_lines(lines: list, n_cols: int) -> np.ndarray:
+    """Parse a list of data lines one by one, see `_parse_line()`."""
+    return np.array([_parse_line(line, n_cols) for line in lines]).reshape(
+        len(lines), n_cols
+    )
+
+
+def _scan_header(readline) -> list:
+    """Scan the first lines for the start of the header and data sections.
+
+    Args:
+        readline (callable):
+            Returns the next line of the file as (str).
+
+    Returns: The header lines as list of (str)
+    """
+    MAX_LINES = 100  # Stop scanning after this number of lines
+    str_header = []
+    for _ in range(MAX_LINES):
+        str_line = readline().strip()
+
+        if str_line.upper() == "[HEADER]":
+            # Simply skip
+            pass
+        elif str_line.upper() == "[DATA]":
+            # Found data section
+            return str_header
+        else:
+            # We must be in the header section now
+            str_header.append(str_line)
+
+    raise Exception("Incorrect file format. Could not find [DATA] " "section.")
+
+
+def _parse_usecols(usecols) -> list:
+    """Validate the requested data columns and always include `time`."""
+    all_columns = COLUMNS + OPTIONAL_COLUMNS
+    if usecols is None:
+        return list(all_columns)
+
+    for name in usecols:
+        if name not in all_columns:
+            raise Exception("Unknown data column '%s'." % name)
+
+    return [name for name in all_columns if name == "time" or name in usecols]
+
+
+def _check_columns(usecols, col_names) -> list:
+    """Check the file for the requested data columns. Returns the columns
+    present in the file, leaving out the optional ones that are missing."""
+    for name in usecols:
+        if name not in col_names and name not in OPTIONAL_COLUMNS:
+            raise Exception(
+                "Incorrect file format. Could not find data column '%s'."
+                % name
+            )
+
+    return [name for name in usecols if name in col_names]
+
+
+def _read_text_data(f, col_names, usecols, chunk_rows) -> np.ndarray:
+    """Read in the data section of a text log file, starting at the current
+    position of binary file handle `f` until the end of the file.
+
+    Returns: 2D array of shape (len(usecols), n_rows)
+    """
+    n_cols = len(col_names)
+    col_idx = [col_names.index(name) for name in usecols]
+
+    # Count the data rows, so that we can preallocate the columns
+    data_start = f.tell()
+    n_rows = 0
+    last_block = b"\n"
+    for block in iter(lambda: f.read(1 << 20), b""):
+        n_rows += block.count(b"\n")
+        last_block = block
+    if not last_block.endswith(b"\n"):
+        n_rows += 1  # Final line without line ending
+    f.seek(data_start)
+
+    columns = np.empty((len(usecols), n_rows))
+    i_row = 0
+    while True:
+        # Read roughly `chunk_rows` lines, assuming ~64 bytes per line
+        lines = f.readlines(chunk_rows * 64)
+        if not lines:
+            break
+
+        # Lines consisting of whitespace only carry no data
+        lines = [line for line in lines if not line.isspace()]
+        if not lines:
+            continue
+
+        chunk = _parse_chunk(lines, n_cols)
+        columns[:, i_row : i_row + len(chunk)] = chunk[:, col_idx].T
+        i_row += len(chunk)
+
+    return columns[:, :i_row]
+
+
+# ------------------------------------------------------------------------------
+#   Cache
+# ------------------------------------------------------------------------------
+
+
+def _cache_key(filepath: Path, lowpass) -> str:
+    """Everything that determines the outcome of `read_log()`, bar the
+    requested columns. Pass the low-pass filter settings as a list, or None
+    when not filtering."""
+    stat = filepath.stat()
+    return json.dumps(
+        {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "lowpass": lowpass,
+        },
+        sort_keys=True,
+    )
+
+
+def _cache_path(filepath: Path) -> Path:
+    return filepath.parent / CACHE_DIR / (filepath.name + ".npz")
+
+
+def _load_cache(filepath: Path, key: str, usecols):
+    """Returns a Log when a valid cache entry covering all columns `usecols`
+    exists, otherwise None."""
+    cache_path = _cache_path(filepath)
+    try:
+        with np.load(cache_path) as npz:
+            if str(npz["key"]) != key:
+                return None
+            if not all(name in npz.files for name in usecols):
+                return None
+
+            log = Log()
+            log.filename = str(npz["filename"])
+            log.header = [str(line) for line in npz["header"]]
+            for name in usecols:
+                setattr(log, name, npz[name])
+    except Exception:  # pylint: disable=broad-except
+        # Missing, stale or corrupt entry
+        return None
+
+    # Mark as recently used for the eviction policy
+    os.utime(cache_path)
+    return log
+
+
+def _save_cache(filepath: Path, key: str, log: Log, usecols):
+    cache_path = _cache_path(filepath)
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+
+        # Write to a temporary file first, so that a crash can never leave a
+        # partial entry behind under the final name
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            np.savez(
+                f,
+                key=np.array(key),
+                filename=np.array(log.filename),
+                header=np.array(log.header, dtype=str),
+                **{name: getattr(log, name) for name in usecols},
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError as err:
+        print("Warning: Could not write to cache.\n  %s" % err)
+        return
+
+    _evict_cache(cache_path.parent, keep=cache_path)
+
+
+def _evict_cache(cache_dir: Path, keep: Path):
+    """Remove the least recently used entries until the total size of the
+    cache folder is below `CACHE_MAX_BYTES`. Entry `keep` is spared."""
+    entries = []
+    for entry in cache_dir.iterdir():
+        if entry == keep:
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+
+    total_bytes = keep.stat().st_size + sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total_bytes <= CACHE_MAX_BYTES:
+            break
+        try:
+            entry.unlink()
+        except OSError:
+            continue
+        total_bytes -= size
 
 
-def read_log(filepath=None, apply_lowpass_filter: bool = True):
+# ------------------------------------------------------------------------------
+#   read_log
+# ------------------------------------------------------------------------------
+
+
+def _apply_lowpass_filter(log: Log, f3db, order, channels):
+    """Low-pass filter the columns `channels` of the log that got read in,
+    see `read_log()`."""
+    # Imported here, as SciPy takes a second to load and is not needed
+    # otherwise
+    # pylint: disable=import-outside-toplevel
+    from dodeca_lowpass import lowpass_filtfilt
+
+    for name in channels:
+        if len(getattr(log, name)) > 0:
+            setattr(
+                log,
+                name,
+                lowpass_filtfilt(
+                    log.time,
+                    getattr(log, name),
+                    f3db,
+                    order,
+                    gap_factor=LOWPASS_GAP_FACTOR,
+                ),
+            )
+
+
+def _read_segments(filepath: Path, chunk_rows, usecols, use_cache) -> Log:
+    """Read in and concatenate the segments listed in a manifest, unfiltered."""
+    manifest = read_manifest(filepath)
+    segments = []
+    for segment in manifest["segments"]:
+        segment_path = filepath.parent / segment["file"]
+        if segment["binary_file"] is not None:
+            binary_path = filepath.parent / segment["binary_file"]
+            if binary_path.is_file():
+                segment_path = binary_path
+
+        segments.append(
+            read_log(
+                segment_path,
+                apply_lowpass_filter=False,
+                chunk_rows=chunk_rows,
+                usecols=usecols,
+                use_cache=use_cache,
+            )
+        )
+
+    log = Log()
+    log.filename = manifest["recording"]
+    log.header = segments[0].header
+    for name in usecols:
+        columns = [getattr(segment, name) for segment in segments]
+        if all(len(column) > 0 for column in columns):
+            setattr(log, name, np.concatenate(columns))
+
+    return log
+
+
+def read_log(
+    filepath=None,
+    apply_lowpass_filter: bool = True,
+    chunk_rows: int = CHUNK_ROWS,
+    usecols=None,
+    use_cache: bool = False,
+    lowpass_f3db: float = LOWPASS_F3DB,
+    lowpass_order: int = LOWPASS_ORDER,
+    lowpass_channels=LOWPASS_CHANNELS,
+):
     """Reads in a log file acquired with the Twente Dodecahedron control
     program.
 
     Args:
         filepath (pathlib.Path, str):
-            Path to the data file to open.
+            Path to the data file to open. Either a text log or a binary log,
+            see `dodeca_binary_log`. The columns of a binary log will be
+            returned as zero-copy views into a read-only memory map. A text
+            log compressed by gzip or lzma, i.e. `.txt.gz` or `.txt.xz`, gets
+            decompressed on the fly, see `dodeca_compression`.
+
+            Or the manifest of a recording rotated into segments, see
+            `dodeca_log_rotation`. The segments get read in and concatenated
+            into a single log, preferring their binary twins when present.
+            Only the segments get cached.
 
         apply_lowpass_filter (bool, default=True):
-            Apply a 2nd order Butterworth low-pass filter with a cut-off
-            frequency of 0.1 Hz and zero-phase distortion to the DS18B20 and
-            BME280 timeseries?
+            Apply a Butterworth low-pass filter with zero-phase distortion to
+            the timeseries of `lowpass_channels`? The series get split at
+            gaps in time and at long runs of NaN values, see
+            `dodeca_lowpass.lowpass_filtfilt()`. The filtered columns are
+            returned as new float64 arrays.
+
+        chunk_rows (int, default=CHUNK_ROWS):
+            Number of data rows to parse in one go. Limits the peak memory
+            usage on top of the final arrays. Only applies to text logs.
+
+        usecols (list of str, optional):
+            Names of the data columns to read in, e.g. ["DS_temp", "BME_temp"].
+            Column `time` is always read in. Columns left out will remain an
+            empty array in the returned Log, as will optional columns
+            missing from the file, see `OPTIONAL_COLUMNS`. Default: all
+            columns.
+
+        use_cache (bool, default=False):
+            Store the parsed and filtered columns in a cache folder next to
+            the log file, see `CACHE_DIR`. Repeated reads of an unchanged log
+            file will be served from the cache, skipping the parsing and
+            filtering. Changes to the file size or modification time will
+            invalidate the cache entry.
+
+        lowpass_f3db (float, default=LOWPASS_F3DB):
+            Cut-off frequency [Hz] of the low-pass filter.
+
+        lowpass_order (int, default=LOWPASS_ORDER):
+            Order of the low-pass filter.
+
+        lowpass_channels (list of str, default=LOWPASS_CHANNELS):
+            Names of the data columns to low-pass filter. Columns not read in
+            are skipped.
 
     Returns: instance of Log class
     """
@@ -56,71 +462,216 @@ def read_log(filepath=None, apply_lowpass_filter: bool = True):
     if not filepath.is_file():
         raise Exception("File can not be found\n %s" % filepath.name)
 
-    with filepath.open() as f:
-        log = Log()
+    usecols = _parse_usecols(usecols)
 
-        # Scan the first lines for the start of the header and data sections
-        MAX_LINES = 100  # Stop scanning after this number of lines
-        str_header = []
-        success = False
-        for i_line in range(MAX_LINES):
-            str_line = f.readline().strip()
-
-            if str_line.upper() == "[HEADER]":
-                # Simply skip
-                pass
-            elif str_line.upper() == "[DATA]":
-                # Found data section. Exit loop.
-                i_line_data = i_line
-                success = True
-                break
-            else:
-                # We must be in the header section now
-                str_header.append(str_line)
-
-        if not success:
-            raise Exception(
-                "Incorrect file format. Could not find [DATA] " "section."
+    if is_manifest(filepath):
+        log = _read_segments(filepath, chunk_rows, usecols, use_cache)
+        if apply_lowpass_filter:
+            _apply_lowpass_filter(
+                log, lowpass_f3db, lowpass_order, lowpass_channels
             )
+        return log
 
-        # Read in all data columns including column names
-        tmp_table = np.genfromtxt(
-            filepath.name,
-            delimiter="\t",
-            names=True,
-            skip_header=i_line_data + 2,
+    if use_cache:
+        cache_key = _cache_key(
+            filepath,
+            (
+                [
+                    lowpass_f3db,
+                    lowpass_order,
+                    sorted(lowpass_channels),
+                    LOWPASS_GAP_FACTOR,
+                ]
+                if apply_lowpass_filter
+                else None
+            ),
         )
+        log = _load_cache(filepath, cache_key, usecols)
+        if log is not None:
+            return log
+
+    log = Log()
+    log.filename = strip_compression_ext(filepath).stem
+    requested_cols = usecols
+
+    if is_binary_log(filepath):
+        # Memory-map the data section. No parsing needed.
+        header, col_names, data = read_binary_log(filepath)
+        header_lines = iter(header.split("\n"))
+        str_header = _scan_header(lambda: next(header_lines, ""))
+        usecols = _check_columns(usecols, col_names)
+
+        # Zero-copy views into the memory map
+        for name in usecols:
+            setattr(log, name, data[:, col_names.index(name)])
+
+    else:
+        with open_log_reader(filepath) as f:
+            str_header = _scan_header(lambda: _decode(f.readline()))
+
+            # Skip the units line and read in the column names
+            f.readline()
+            col_names = _decode(f.readline()).split()
+            usecols = _check_columns(usecols, col_names)
+
+            columns = _read_text_data(f, col_names, usecols, chunk_rows)
 
         # Rebuild into a Matlab style 'struct'
-        log.filename = filepath.name[0:-4]
-        log.header = str_header
-        log.time = tmp_table["time"]
-        log.DS_temp = tmp_table["DS_temp"]
-        log.BME_temp = tmp_table["BME_temp"]
-        log.BME_humi = tmp_table["BME_humi"]
-        log.BME_pres = tmp_table["BME_pres"]
-        log.Julabo_setp = tmp_table["Julabo_setp"]
-        log.Julabo_bath = tmp_table["Julabo_bath"]
+        for name, column in zip(usecols, columns):
+            setattr(log, name, column)
 
-        if apply_lowpass_filter:
-            # Apply low-pass filtering to specific timeseries
-            f_s = 1 / np.mean(
-                np.diff(log.time)
-            )  # Original sampling frequency [Hz]
-            f3dB_LP = 0.1  # Low-pass cut-off frequency: 0.1 [Hz]
-            filt_b, filt_a = signal.butter(2, f3dB_LP / (f_s / 2), "lowpass")
-
-            # Fill in the occasional NaN's in the DS_temp signal
-            mask = np.isnan(log.DS_temp)
-            log.DS_temp[mask] = np.interp(
-                np.flatnonzero(mask), np.flatnonzero(~mask), log.DS_temp[~mask]
-            )
+    log.header = str_header
+
+    if apply_lowpass_filter:
+        _apply_lowpass_filter(
+            log, lowpass_f3db, lowpass_order, lowpass_channels
+        )
 
-            log.DS_temp = signal.filtfilt(filt_b, filt_a, log.DS_temp)
-            log.BME_temp = signal.filtfilt(filt_b, filt_a, log.BME_temp)
-            log.BME_humi = signal.filtfilt(filt_b, filt_a, log.BME_humi)
-            log.BME_pres = signal.filtfilt(filt_b, filt_a, log.BME_pres)
-            # log.Julabo_setp = signal.filtfilt(filt_b, filt_a, log.Julabo_setp)
-            # log.Julabo_bath = signal.filtfilt(filt_b, filt_a, log.Julabo_bath)
+    if use_cache:
+        # Missing optional columns get stored as empty arrays
+        _save_cache(filepath, cache_key, log, requested_cols)
 
     return log
+
+
+# ------------------------------------------------------------------------------
+#   LogTailer
+# ------------------------------------------------------------------------------
+
+
+class LogTailer:
+    """Incrementally reads in a log file that is still being recorded. Each
+    call to `read_new()` only reads and parses the rows that got appended
+    since the previous call. A partially written final line is left alone
+    until it has been completed.
+
+    No low-pass filter is applied, as the zero-phase filter needs the full
+    timeseries.
+
+    Compressed log files are not supported, as they can not be read from an
+    arbitrary position.
+
+    Args:
+        filepath (pathlib.Path, str):
+            Path to the data file to follow. Either a text log or a binary
+            log, see `dodeca_binary_log`.
+
+        chunk_rows (int, default=CHUNK_ROWS):
+            Number of data rows to parse in one go.
+
+        usecols (list of str, optional):
+            Names of the data columns to read in, see `read_log()`.
+
+    Example usage:
+        tailer = LogTailer("231220_163225.txt")
+        while True:
+            new = tailer.read_new()
+            print(new.time)
+            time.sleep(1)
+    """
+
+    def __init__(self, filepath, chunk_rows: int = CHUNK_ROWS, usecols=None):
+        self.filepath = Path(filepath)
+        if compression_of(self.filepath) is not None:
+            raise Exception("Compressed log files can not be tailed.")
+
+        self.chunk_rows = chunk_rows
+        self.usecols = _parse_usecols(usecols)
+        self.offset = 0  # Byte offset just past the last complete line
+
+        self._header = None
+        self._col_names = None
+        self._present_cols = None  # Columns of `usecols` present in the file
+        self._n_rows = 0  # Number of rows read from a binary log
+
+    def reset(self):
+        """Start reading from the beginning of the file again."""
+        self.offset = 0
+        self._header = None
+        self._col_names = None
+        self._present_cols = None
+        self._n_rows = 0
+
+    def read_new(self) -> Log:
+        """Returns a Log containing only the rows that got appended since the
+        previous call. The arrays are empty when there is no new data.
+        """
+        if self.filepath.stat().st_size < self.offset:
+            # File got truncated or replaced: start over
+            self.reset()
+
+        log = Log()
+        log.filename = self.filepath.stem
+
+        if is_binary_log(self.filepath):
+            header, col_names, data = read_binary_log(self.filepath)
+            if self._header is None:
+                header_lines = iter(header.split("\n"))
+                self._header = _scan_header(lambda: next(header_lines, ""))
+                self._present_cols = _check_columns(self.usecols, col_names)
+
+            # Only the new rows get loaded from the memory map
+            col_idx = [col_names.index(name) for name in self._present_cols]
+            columns = data[self._n_rows :, col_idx].T
+            self._n_rows = len(data)
+            self.offset = self.filepath.stat().st_size
+
+        else:
+            with self.filepath.open("rb") as f:
+                if self._header is None and not self._read_header(f):
+                    # Header is still being written
+                    log.header = []
+                    return log
+
+                f.seek(self.offset)
+                data = f.read()
+
+            # Ignore a partially written final line
+            n_bytes = data.rfind(b"\n") + 1
+            self.offset += n_bytes
+            lines = [
+                line
+                for line in data[:n_bytes].splitlines(keepends=True)
+                if not line.isspace()
+            ]
+
+            col_idx = [
+                self._col_names.index(name) for name in self._present_cols
+            ]
+            columns = np.empty((len(col_idx), len(lines)))
+            for i_row in range(0, len(lines), self.chunk_rows):
+                chunk = _parse_chunk(
+                    lines[i_row : i_row + self.chunk_rows],
+                    len(self._col_names),
+                )
+                columns[:, i_row : i_row + len(chunk)] = chunk[:, col_idx].T
+
+        log.header = self._header
+        for name, column in zip(self._present_cols, columns):
+            setattr(log, name, column)
+
+        return log
+
+    def _read_header(self, f) -> bool:
+        """Try to read in the header of a text log file. Returns False when
+        the header is not yet completely written to disk.
+        """
+
+        def readline():
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                raise EOFError
+            return _decode(line)
+
+        try:
+            header = _scan_header(readline)
+            readline()  # Units line
+            col_names = readline().split()
+        except EOFError:
+            return False
+
+        self._present_cols = _check_columns(self.usecols, col_names)
+        self._header = header
+        self._col_names = col_names
+        self.offset = f.tell()
+        return True
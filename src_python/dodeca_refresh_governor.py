@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Adaptive refresh rates of the GUI of the Twente Dodecahedron control
+program.
+
+The GUI and the charts get refreshed periodically. Redrawing them costs time
+in the main thread, which rises with the machine load, the number of points
+drawn and the use of OpenGL or antialiasing. The `RefreshGovernor` measures
+the cost of each refresh and stretches its interval such that all refreshes
+together stay within a budget fraction of the wall time. The main thread then
+keeps spare time to handle the other events, like the signals of the DAQ
+thread, on slow or busy PCs too.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import numpy as np
+
+
+class _Refresh:
+    def __init__(self, share, min_interval_ms, max_interval_ms):
+        self.share = share
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.interval_ms = min_interval_ms
+        self.cost = np.nan  # Moving average of the cost per refresh [s]
+
+
+class RefreshGovernor:
+    """Adapts the intervals of periodic refreshes to their cost, keeping them
+    within a budget. Not thread-safe: to be used from the main thread only.
+
+    Args:
+        budget (float, default=0.1):
+            Fraction of the wall time that all refreshes together may take.
+
+        smoothing (float, default=0.2):
+            Weight of the most recent cost in its moving average.
+    """
+
+    def __init__(self, budget: float = 0.1, smoothing: float = 0.2):
+        self.budget = budget
+        self.smoothing = smoothing
+        self._refreshes = {}
+
+    def add_refresh(
+        self,
+        name: str,
+        share: float,
+        min_interval_ms: int,
+        max_interval_ms: int,
+    ):
+        """Register a periodic refresh that may take up the fraction `share`
+        of the budget. Its interval [ms] gets kept within the given range,
+        starting out at `min_interval_ms`."""
+        self._refreshes[name] = _Refresh(
+            share, min_interval_ms, max_interval_ms
+        )
+
+    def add_cost(self, name: str, cost: float) -> int:
+        """Register the `cost` [s] of a single refresh, i.e. the time it took.
+
+        Returns: The new interval [ms] of the refresh.
+        """
+        refresh = self._refreshes[name]
+        if np.isnan(refresh.cost):
+            refresh.cost = cost
+        else:
+            refresh.cost += self.smoothing * (cost - refresh.cost)
+
+        interval_ms = refresh.cost * 1e3 / (self.budget * refresh.share)
+        refresh.interval_ms = int(
+            np.clip(
+                interval_ms, refresh.min_interval_ms, refresh.max_interval_ms
+            )
+        )
+        return refresh.interval_ms
+
+    def reset(self):
+        """Forget the costs and return to the minimum intervals."""
+        for refresh in self._refreshes.values():
+            refresh.interval_ms = refresh.min_interval_ms
+            refresh.cost = np.nan
+
+    def interval_ms(self, name: str) -> int:
+        """Current interval [ms] of a refresh."""
+        return self._refreshes[name].interval_ms
+
+    def usage(self) -> float:
+        """Fraction of the budget currently in use by all refreshes."""
+        usage = 0.0
+        for refresh in self._refreshes.values():
+            if not np.isnan(refresh.cost):
+                usage += refresh.cost * 1e3 / refresh.interval_ms
+        return usage / self.budget
+
+    def report(self) -> str:
+        """Rate of each refresh and the use of the budget."""
+        return "%s\nBudget use: %.0f %%" % (
+            "  ".join(
+                "%s: %.1f Hz" % (name, 1e3 / refresh.interval_ms)
+                for name, refresh in self._refreshes.items()
+            ),
+            self.usage() * 100,
+        )
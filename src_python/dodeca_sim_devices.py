@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Simulated stand-ins for the Arduino and the Julabo FP51 circulator of the
+Twente Dodecahedron, for development and benchmarking without the hardware.
+
+Each simulated device serves its serial protocol over a pseudo-terminal
+(Linux and macOS only). Hand its `port` to `connect_at_port()` of the regular
+`dvg_devices` classes and they will not know the difference. The latency and
+jitter of the replies can be configured and errors can be injected.
+
+Example usage:
+    from dvg_devices.Arduino_protocol_serial import Arduino
+    from dodeca_sim_devices import SimArduino
+
+    sim = SimArduino(latency_ms=2, jitter_ms=1)
+    sim.start()
+    ard = Arduino(name="Ard", connect_to_specific_ID="Dodecahedron logger")
+    ard.connect_at_port(sim.port)
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from dodeca_acquisition import FIRMWARE_VERSION
+from dodeca_wire_protocol import FRAME_DTYPE, encode_frame
+
+# ------------------------------------------------------------------------------
+#   SimSerialDevice
+# ------------------------------------------------------------------------------
+
+
+class SimSerialDevice:
+    """Serves a simulated device over a pseudo-terminal. Subclasses implement
+    `handle()` to reply to a single incoming command.
+
+    Args:
+        latency_ms (float, default=0):
+            Fixed delay before each reply [ms].
+
+        jitter_ms (float, default=0):
+            Additional uniformly distributed random delay before each reply
+            [ms].
+
+        error_rate (float, default=0):
+            Probability of a reply to go missing or to get corrupted, half of
+            the time each.
+
+        seed (int, optional):
+            Seed of the random generator of the jitter and error injection.
+    """
+
+    read_termination = b"\n"
+    write_termination = b"\n"
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        seed=None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.port = ""
+
+        self.n_commands = 0
+        self.n_errors_injected = 0
+
+        self._rng = random.Random(seed)
+        self._master = None
+        self._slave = None
+        self._running = False
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Open the pseudo-terminal and start serving. The device can be
+        reached at `port` afterwards."""
+        import tty  # Not available on Windows
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._serve, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = None
+        self._slave = None
+
+    def handle(self, cmd: str):
+        """Reply to a single command. To be implemented by subclasses.
+
+        Returns: The reply without termination (str, bytes), or None when no
+        reply is due.
+        """
+        raise NotImplementedError
+
+    def send(self, reply, terminate: bool = True):
+        """Send `reply` to the host, subject to error injection."""
+        if isinstance(reply, str):
+            reply = reply.encode()
+        if terminate:
+            reply += self.write_termination
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.n_errors_injected += 1
+            if self._rng.random() < 0.5:
+                return  # Reply goes missing
+
+            reply = bytearray(reply)
+            reply[self._rng.randrange(len(reply))] ^= 0x40
+            reply = bytes(reply)
+
+        with self._write_lock:
+            try:
+                os.write(self._master, reply)
+            except (OSError, TypeError):
+                pass  # Stopped
+
+    def _delay(self):
+        delay_ms = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def _serve(self):
+        buf = b""
+        while self._running:
+            try:
+                data = os.read(self._master, 4096)
+            except (OSError, TypeError):
+                return  # Stopped
+
+            buf += data
+            while self.read_termination in buf:
+                line, buf = buf.split(self.read_termination, 1)
+                self.n_commands += 1
+                reply = self.handle(line.decode(errors="replace").strip())
+                if reply is not None:
+                    self._delay()
+                    self.send(reply)
+
+
+# ------------------------------------------------------------------------------
+#   SimArduino
+# ------------------------------------------------------------------------------
+
+
+class SimArduino(SimSerialDevice):
+    """Simulates the firmware of `src_mcu/src/main.cpp`, including streaming,
+    sampling into the ring buffer, binary frames and the background DS18B20
+    conversion. The sensor readings slowly wander about room conditions.
+    """
+
+    RING_LEN = 2048
+    DS18_CONVERSION_MS = 750
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sampling = False
+        self.streaming = False
+        self.binary_frames = False
+        self.sample_interval_ms = 1000
+
+        self._t0 = time.perf_counter()
+        self._seq = 0
+        self._ring = deque(maxlen=self.RING_LEN)
+        self._lock = threading.Lock()  # Guards the readings and ring buffer
+        self._timer = None
+
+    def millis(self) -> int:
+        return int((time.perf_counter() - self._t0) * 1000) % 2**32
+
+    def start(self):
+        super().start()
+        self._timer = threading.Thread(
+            target=self._run_timer, name="SimArduino_timer", daemon=True
+        )
+        self._timer.start()
+
+    def take_reading(self) -> bytes:
+        """Take a reading and store it in the ring buffer as a frame."""
+        with self._lock:
+            now = self.millis()
+            t = now / 1000
+            ds18_done = now - now % self.DS18_CONVERSION_MS
+            frame = encode_frame(
+                self._seq,
+                now,
+                # The DS18B20 has a resolution of 1/16 °C at 12 bit
+                round((22 + np.sin(ds18_done / 6e5)) * 16) / 16,
+                now - ds18_done,
+                21.5 + np.sin(t / 600) + self._rng.gauss(0, 0.02),
+                45 + 5 * np.sin(t / 1800) + self._rng.gauss(0, 0.1),
+                101325 + 100 * np.sin(t / 3600) + self._rng.gauss(0, 5),
+            )
+            self._ring.append(frame)
+            self._seq += 1
+
+        return frame
+
+    def send_reading(self, frame: bytes):
+        if self.binary_frames:
+            self.send(frame, terminate=False)
+            return
+
+        f = np.frombuffer(frame, FRAME_DTYPE)[0]
+        self.send(
+            "%i\t%.1f\t%i\t%.1f\t%.1f\t%.0f"
+            % (
+                f["millis"],
+                f["ds18_temp"],
+                f["ds18_age"],
+                f["bme280_temp"],
+                f["bme280_humi"],
+                f["bme280_pres"],
+            )
+        )
+
+    def handle(self, cmd: str):
+        if cmd == "id?":
+            return "Arduino, Dodecahedron logger, v%i" % FIRMWARE_VERSION
+
+        if cmd.startswith("stream"):
+            self._start_sampling(cmd[6:])
+            self.streaming = True
+        elif cmd.startswith("sample"):
+            self._start_sampling(cmd[6:])
+            self.streaming = False
+            with self._lock:
+                self._ring.clear()
+        elif cmd == "halt":
+            self.sampling = False
+            self.streaming = False
+        elif cmd.startswith("dump"):
+            self._delay()
+            self._dump(int(cmd[4:] or 0))
+        elif cmd == "fmt bin":
+            self.binary_frames = True
+        elif cmd == "fmt txt":
+            self.binary_frames = False
+        else:
+            # The reading is taken upon arrival of the query. The latency
+            # applies to the reply.
+            frame = self.take_reading()
+            self._delay()
+            self.send_reading(frame)
+
+        return None
+
+    def _start_sampling(self, str_interval: str):
+        try:
+            self.sample_interval_ms = max(int(str_interval), 1)
+        except ValueError:
+            self.sample_interval_ms = 1
+        self.sampling = True
+
+    def _dump(self, seq: int):
+        with self._lock:
+            frames = [
+                frame
+                for frame in self._ring
+                if int.from_bytes(frame[2:6], "little") >= seq
+            ]
+        self.send(
+            ("%i\n" % len(frames)).encode() + b"".join(frames),
+            terminate=False,
+        )
+
+    def _run_timer(self):
+        tick = time.perf_counter()
+        while self._running:
+            if not self.sampling:
+                time.sleep(0.001)
+                tick = time.perf_counter()
+                continue
+
+            # Keep a fixed rate without drift, like the firmware
+            tick += self.sample_interval_ms / 1000
+            time.sleep(max(0, tick - time.perf_counter()))
+            if self.sampling:
+                frame = self.take_reading()
+                if self.streaming:
+                    self._delay()
+                    self.send_reading(frame)
+
+
+# ------------------------------------------------------------------------------
+#   SimJulabo
+# ------------------------------------------------------------------------------
+
+
+class SimJulabo(SimSerialDevice):
+    """Simulates the RS232 protocol of a Julabo FP51 circulator, as used by
+    `dvg_devices.Julabo_circulator_protocol_RS232`. When running, the bath
+    temperature relaxes towards the setpoint.
+    """
+
+    read_termination = b"\r"
+    write_termination = b"\r\n"
+
+    TAU = 600  # Time constant of the bath temperature [s]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.running = False
+        self.setpoint_preset = 0  # 0-based, i.e. preset #1
+        self.setpoints = [20.0, 30.0, 40.0]
+        self.sub_temp = -10.0
+        self.over_temp = 80.0
+        self.safe_temp = 90.0
+        self._bath_temp = 21.0
+        self._t_bath = time.perf_counter()
+
+    def bath_temp(self) -> float:
+        now = time.perf_counter()
+        if self.running:
+            target = self.setpoints[self.setpoint_preset]
+            self._bath_temp = target + (self._bath_temp - target) * np.exp(
+                -(now - self._t_bath) / self.TAU
+            )
+        self._t_bath = now
+        return self._bath_temp
+
+    def handle(self, cmd: str):
+        # fmt: off
+        queries = {
+            "VERSION"   : lambda: "JULABO HIGHTECH FP51 VERSION 4.0",
+            "STATUS"    : lambda: "0%i MANUAL START" % (2 + self.running),
+            "IN_SP_00"  : lambda: "%.2f" % self.setpoints[0],
+            "IN_SP_01"  : lambda: "%.2f" % self.setpoints[1],
+            "IN_SP_02"  : lambda: "%.2f" % self.setpoints[2],
+            "IN_SP_03"  : lambda: "%.2f" % self.over_temp,
+            "IN_SP_04"  : lambda: "%.2f" % self.sub_temp,
+            "IN_SP_06"  : lambda: "0",  # Temperature unit: 'C
+            "IN_PV_00"  : lambda: "%.2f" % self.bath_temp(),
+            "IN_PV_02"  : lambda: "%.2f" % (self.bath_temp() + 0.1),
+            "IN_PV_03"  : lambda: "%.2f" % (self.bath_temp() + 0.5),
+            "IN_PV_04"  : lambda: "%.2f" % self.safe_temp,
+            "IN_MODE_01": lambda: "%i" % self.setpoint_preset,
+            "IN_MODE_05": lambda: "%i" % self.running,
+        }
+        # fmt: on
+        if cmd in queries:
+            return queries[cmd]()
+
+        # OUT commands set a value and do not reply
+        try:
+            name, value = cmd.split(" ", 1)
+            if name == "OUT_MODE_05":
+                self.bath_temp()  # Settle the bath temperature so far
+                self.running = bool(int(value))
+            elif name == "OUT_MODE_01":
+                self.setpoint_preset = int(value)
+            elif name in ("OUT_SP_00", "OUT_SP_01", "OUT_SP_02"):
+                self.setpoints[int(name[-1])] = float(value)
+            elif name == "OUT_SP_03":
+                self.over_temp = float(value)
+            elif name == "OUT_SP_04":
+                self.sub_temp = float(value)
+        except ValueError:
+            pass  # Unknown command, the Julabo stays silent
+
+        return None
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Start-up profiling of the Twente Dodecahedron control program and its
+analysis scripts, enabled by passing `--profile-startup` on the command line.
+
+The profiler hooks into the import system and times the loading of every
+module, both cumulative, i.e. including the modules it imports in turn, and
+self. Together with the time of reaching marked phases of the start-up, like
+having connected to the devices, it gets printed as a report.
+
+To be imported before any other module, as only later imports get timed:
+
+    from dodeca_startup import enable_startup_profiler
+    profiler = enable_startup_profiler()
+
+Only depends on the standard library.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import atexit
+import sys
+import time
+
+CLI_FLAG = "--profile-startup"
+
+# ------------------------------------------------------------------------------
+#   StartupProfiler
+# ------------------------------------------------------------------------------
+
+
+class _TimedLoader:
+    """Wraps the loader of a module, timing its creation and execution."""
+
+    def __init__(self, loader, profiler, name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        # Extension modules get loaded here already
+        if not hasattr(self._loader, "create_module"):
+            return None
+
+        self._profiler._enter(self._name)
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._profiler._exit()
+
+    def exec_module(self, module):
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit()
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class StartupProfiler:
+    """Import hook timing the loading of each module from the moment of
+    `install()` on. Not thread-safe: meant for the start-up, which runs in the
+    main thread.
+    """
+
+    def __init__(self):
+        self.t_0 = time.perf_counter()
+        self.cumulative = {}  # Module name -> [s]
+        self.self_time = {}  # Module name -> [s]
+        self.marks = []  # (label, time since `t_0` [s])
+        self._stack = []  # [module name, t_start, time spent in children]
+        self._reported = False
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        """Find the module by the other finders and wrap its loader."""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def mark(self, label: str):
+        """Mark having reached a phase of the start-up."""
+        self.marks.append((label, time.perf_counter() - self.t_0))
+
+    def report(self, n_modules: int = 25) -> str:
+        """Phases reached and the `n_modules` slowest modules to load."""
+        lines = ["Start-up profile", "%9s  %s" % ("[ms]", "phase")]
+        for label, t in self.marks:
+            lines.append("%9.1f  %s" % (t * 1e3, label))
+
+        lines.append(
+            "\n%9s  %9s  %s" % ("cumul.", "self", "module (slowest first)")
+        )
+        lines.append("%9s  %9s" % ("[ms]", "[ms]"))
+        slowest = sorted(
+            self.cumulative, key=self.cumulative.get, reverse=True
+        )
+        for name in slowest[:n_modules]:
+            lines.append(
+                "%9.1f  %9.1f  %s"
+                % (
+                    self.cumulative[name] * 1e3,
+                    self.self_time[name] * 1e3,
+                    name,
+                )
+            )
+        lines.append(
+            "%i modules imported in %.1f ms"
+            % (
+                len(self.cumulative),
+                sum(self.self_time.values()) * 1e3,
+            )
+        )
+        return "\n".join(lines)
+
+    def print_report(self, n_modules: int = 25):
+        """Print the report, only once."""
+        if not self._reported:
+            self._reported = True
+            print("\n" + self.report(n_modules) + "\n")
+
+    # --------------------------------------------------------------------------
+    #   Private
+    # --------------------------------------------------------------------------
+
+    def _enter(self, name: str):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        name, t_start, t_children = self._stack.pop()
+        elapsed = time.perf_counter() - t_start
+        self.cumulative[name] = self.cumulative.get(name, 0) + elapsed
+        self.self_time[name] = (
+            self.self_time.get(name, 0) + elapsed - t_children
+        )
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+
+def enable_startup_profiler(report_at_exit: bool = True):
+    """Install a `StartupProfiler` when `--profile-startup` was passed on the
+    command line. The flag gets removed from `sys.argv`, keeping it out of the
+    way of the argument parsing of the script.
+
+    Args:
+        report_at_exit (bool, default=True):
+            Print the report when the interpreter exits, unless it got
+            printed before by `StartupProfiler.print_report()`.
+
+    Returns: The installed `StartupProfiler`, or None when not requested.
+    """
+    if CLI_FLAG not in sys.argv:
+        return None
+
+    sys.argv.remove(CLI_FLAG)
+    profiler = StartupProfiler()
+    profiler.install()
+    if report_at_exit:
+        atexit.register(profiler.print_report)
+
+    return profiler
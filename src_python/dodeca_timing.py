@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Timing instrumentation of the data acquisition of the Twente Dodecahedron
+control program.
+
+Each DAQ tick gets timed per stage: the lateness of the tick with respect to
+its schedule, the serial query round trip, the parsing of the readings, the
+appending to the chart history and the logging to file. The timings feed
+streaming histograms, from which percentiles can be drawn at any time at a
+constant cost and memory, no matter how long the acquisition runs.
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import threading
+
+import numpy as np
+
+# Timed stages of a DAQ tick
+# fmt: off
+STAGES = (
+    "tick",    # |Actual - scheduled| time of the tick
+    "query",   # Serial query round trip, or waiting for the stream
+    "parse",   # Parsing a reading into the state variables
+    "append",  # Appending a reading to the chart history
+    "log",     # Logging a reading to file
+)
+# fmt: on
+
+# Stages logged per reading as extra columns, see `dodeca_acquisition.py`
+LOGGED_STAGES = ("tick", "query", "parse", "append")
+
+# ------------------------------------------------------------------------------
+#   StreamingHistogram
+# ------------------------------------------------------------------------------
+
+
+class StreamingHistogram:
+    """Histogram with logarithmically spaced bins, accumulating an unbounded
+    number of positive values in constant memory. Percentiles are resolved to
+    within a relative error of `10**(1 / bins_per_decade) - 1`, i.e. 12 % by
+    default. The maximum is kept exactly.
+
+    Args:
+        lo (float, default=1e-6):
+            Lower edge of the bins. Smaller values are counted as `lo`.
+
+        hi (float, default=1e2):
+            Upper edge of the bins. Larger values are counted as `hi`.
+
+        bins_per_decade (int, default=20):
+            Number of bins per factor of ten.
+    """
+
+    def __init__(
+        self, lo: float = 1e-6, hi: float = 1e2, bins_per_decade: int = 20
+    ):
+        self.lo = lo
+        self.hi = hi
+        self.bins_per_decade = bins_per_decade
+
+        n_bins = int(np.ceil(np.log10(hi / lo) * bins_per_decade))
+        self._edges = lo * 10 ** (np.arange(n_bins + 1) / bins_per_decade)
+        self._counts = np.zeros(n_bins, dtype=np.int64)
+        self.count = 0
+        self.max = np.nan
+
+    def add(self, value: float):
+        if not value >= 0:  # Also catches NaN
+            return
+
+        idx = int(
+            np.log10(max(value, self.lo) / self.lo) * self.bins_per_decade
+        )
+        self._counts[min(idx, len(self._counts) - 1)] += 1
+        self.count += 1
+        if not value <= self.max:  # Also True for the initial NaN
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Value below which `q` percent of the values fall, taken as the
+        geometric center of its bin and capped at the maximum."""
+        if self.count == 0:
+            return np.nan
+
+        rank = q / 100 * self.count
+        idx = int(np.searchsorted(np.cumsum(self._counts), max(rank, 1)))
+        center = np.sqrt(self._edges[idx] * self._edges[idx + 1])
+        return min(center, self.max)
+
+    def reset(self):
+        self._counts.fill(0)
+        self.count = 0
+        self.max = np.nan
+
+
+# ------------------------------------------------------------------------------
+#   DAQTimings
+# ------------------------------------------------------------------------------
+
+
+class DAQTimings:
+    """Thread-safe timings of the DAQ ticks, per stage in `STAGES`. To be fed
+    from the DAQ thread and read out from any other thread.
+
+    Args:
+        interval_s (float):
+            Nominal interval between DAQ ticks [s], against which the tick
+            lateness is determined.
+    """
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self.hist = {stage: StreamingHistogram() for stage in STAGES}
+
+        # Timings of the most recent tick and reading [s]. The tick lateness
+        # is signed here: negative when early.
+        self.last = dict.fromkeys(STAGES, np.nan)
+
+        self._lock = threading.Lock()
+        self._t_anchor = None  # Time of the first tick of the schedule
+        self._k = 0  # Slot of the previous tick in the schedule
+
+    def tick(self, t: float):
+        """Register a DAQ tick at time `t` [s], as obtained from
+        `time.perf_counter()`. The schedule is anchored at the first tick.
+        Ticks skipped after a stall count once as late."""
+        with self._lock:
+            if self._t_anchor is None:
+                self._t_anchor = t
+                self._k = 0
+                late = 0.0
+            else:
+                self._k += 1
+                late = t - (self._t_anchor + self._k * self.interval_s)
+                if late < -self.interval_s / 2:
+                    # The schedule got shifted: start a new one
+                    self._t_anchor = t
+                    self._k = 0
+                    late = 0.0
+                else:
+                    # Continue at the slot we are in now. The small offset
+                    # guards against rounding down at the slot boundaries.
+                    slot = int((t - self._t_anchor) / self.interval_s + 1e-6)
+                    self._k = max(self._k, slot)
+
+            self.last["tick"] = late
+            self.hist["tick"].add(abs(late))
+
+    def add(self, stage: str, duration: float):
+        """Register the `duration` [s] of a stage."""
+        with self._lock:
+            self.last[stage] = duration
+            self.hist[stage].add(duration)
+
+    def reset(self):
+        """Clear the histograms and restart the tick schedule."""
+        with self._lock:
+            for hist in self.hist.values():
+                hist.reset()
+            self.last = dict.fromkeys(STAGES, np.nan)
+            self._t_anchor = None
+
+    def percentiles(self, stage: str, qs=(50, 95, 99)) -> list:
+        """Percentiles `qs` of a stage followed by its maximum [s]."""
+        with self._lock:
+            hist = self.hist[stage]
+            return [hist.percentile(q) for q in qs] + [hist.max]
+
+    def report(self) -> str:
+        """Table of the p50, p95, p99 and maximum per stage in [ms]."""
+        lines = ["%-7s%8s%8s%8s%8s" % ("[ms]", "p50", "p95", "p99", "max")]
+        for stage in STAGES:
+            lines.append(
+                "%-7s%8.2f%8.2f%8.2f%8.2f"
+                % ((stage,) + tuple(np.array(self.percentiles(stage)) * 1e3))
+            )
+        return "\n".join(lines)
+
+    def log_values(self) -> tuple:
+        """Timings of the most recent reading in `LOGGED_STAGES` [ms]."""
+        with self._lock:
+            return tuple(self.last[stage] * 1e3 for stage in LOGGED_STAGES)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Binary framed wire protocol between the Arduino of the Twente Dodecahedron
+and the control program, as an alternative to the tab-separated text replies.
+
+Each reading is sent as a fixed-size frame, carrying the sensor values at full
+float32 precision. A sequence number reveals dropped frames and a checksum
+reveals corrupted ones. Many frames can be decoded at once.
+
+Frame layout, little-endian and without padding:
+    sync        2 bytes     b"\\xAA\\x55"
+    seq         uint32      Incremented by one for each frame sent
+    millis      uint32      Arduino time [ms]
+    ds18_temp   float32     ['C]
+    ds18_age    uint32      Age of `ds18_temp` [ms]
+    bme280_temp float32     ['C]
+    bme280_humi float32     [%]
+    bme280_pres float32     [Pa]
+    crc         uint16      CRC-16/CCITT-FALSE over `seq` up to `crc`
+"""
+__author__ = "Dennis van Gils"
+__authoremail__ = "vangils.dennis@gmail.com"
+__url__ = "https://github.com/Dennis-van-Gils/project-Dodecahedron"
+__date__ = "16-10-2026"
+__version__ = "1.0"
+
+import numpy as np
+
+SYNC = b"\xaa\x55"
+
+FRAME_DTYPE = np.dtype(
+    [
+        ("sync", "S2"),
+        ("seq", "<u4"),
+        ("millis", "<u4"),
+        ("ds18_temp", "<f4"),
+        ("ds18_age", "<u4"),
+        ("bme280_temp", "<f4"),
+        ("bme280_humi", "<f4"),
+        ("bme280_pres", "<f4"),
+        ("crc", "<u2"),
+    ]
+)
+FRAME_SIZE = FRAME_DTYPE.itemsize  # 32 bytes
+
+# Byte range of the frame covered by the checksum
+_CRC_START = len(SYNC)
+_CRC_STOP = FRAME_SIZE - 2
+
+
+def _make_crc_table() -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint16)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table[i] = crc & 0xFFFF
+    return table
+
+
+_CRC_TABLE = _make_crc_table()
+
+
+def crc16(data: bytes) -> int:
+    """CRC-16/CCITT-FALSE: polynomial 0x1021, initial value 0xFFFF."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ int(_CRC_TABLE[(crc >> 8) ^ byte])
+    return crc
+
+
+def _crc16_rows(rows: np.ndarray) -> np.ndarray:
+    """Vectorized `crc16()` over each row of a 2D uint8 array."""
+    crc = np.full(rows.shape[0], 0xFFFF, dtype=np.uint16)
+    for col in rows.T:
+        crc = (crc << 8) ^ _CRC_TABLE[(crc >> 8) ^ col]
+    return crc
+
+
+# ------------------------------------------------------------------------------
+#   Encode
+# ------------------------------------------------------------------------------
+
+
+def encode_frame(
+    seq: int,
+    millis: int,
+    ds18_temp: float,
+    ds18_age: int,
+    bme280_temp: float,
+    bme280_humi: float,
+    bme280_pres: float,
+) -> bytes:
+    """Pack a single reading into a frame, like the Arduino does."""
+    frame = np.zeros(1, dtype=FRAME_DTYPE)
+    frame["sync"] = SYNC
+    frame["seq"] = seq
+    frame["millis"] = millis
+    frame["ds18_temp"] = ds18_temp
+    frame["ds18_age"] = ds18_age
+    frame["bme280_temp"] = bme280_temp
+    frame["bme280_humi"] = bme280_humi
+    frame["bme280_pres"] = bme280_pres
+
+    raw = frame.tobytes()
+    frame["crc"] = crc16(raw[_CRC_START:_CRC_STOP])
+    return frame.tobytes()
+
+
+# ------------------------------------------------------------------------------
+#   Decode
+# ------------------------------------------------------------------------------
+
+
+def decode_frames(buf):
+    """Decode all complete frames contained in `buf`. Garbage and corrupted
+    frames are skipped by hunting for the next sync marker.
+
+    Args:
+        buf (bytes, bytearray):
+            Received bytes, starting at the oldest unprocessed byte.
+
+    Returns: (frames, n_consumed, n_corrupt)
+        frames (numpy.ndarray):
+            Structured array of dtype `FRAME_DTYPE` holding the valid frames.
+
+        n_consumed (int):
+            Number of bytes processed from the start of `buf`. The remaining
+            bytes hold an incomplete frame and should be kept for the next
+            call, prepended to the newly received bytes.
+
+        n_corrupt (int):
+            Number of frames rejected on their checksum.
+    """
+    buf = bytes(buf)
+    chunks = []
+    n_corrupt = 0
+    pos = 0
+
+    while len(buf) - pos >= FRAME_SIZE:
+        if buf[pos : pos + len(SYNC)] != SYNC:
+            # Out of sync: hunt for the next sync marker
+            idx = buf.find(SYNC, pos + 1)
+            if idx == -1:
+                # Keep a trailing byte that might be the start of a marker
+                pos = len(buf) - (len(SYNC) - 1)
+                break
+            pos = idx
+            continue
+
+        # Check all whole frames from here on in one go. Normally, they are
+        # back-to-back and all valid.
+        n_frames = (len(buf) - pos) // FRAME_SIZE
+        frames = np.frombuffer(buf, FRAME_DTYPE, n_frames, pos)
+        rows = np.frombuffer(buf, np.uint8, n_frames * FRAME_SIZE, pos)
+        rows = rows.reshape(n_frames, FRAME_SIZE)
+        valid = (frames["sync"] == SYNC) & (
+            _crc16_rows(rows[:, _CRC_START:_CRC_STOP]) == frames["crc"]
+        )
+
+        n_valid = n_frames if valid.all() else int(np.argmin(valid))
+        chunks.append(frames[:n_valid])
+        pos += n_valid * FRAME_SIZE
+
+        if n_valid < n_frames:
+            if frames["sync"][n_valid] == SYNC:
+                n_corrupt += 1
+            # Resync after the start of the offending frame
+            idx = buf.find(SYNC, pos + 1)
+            pos = idx if idx != -1 else len(buf) - (len(SYNC) - 1)
+
+    if chunks:
+        frames = np.concatenate(chunks)
+    else:
+        frames = np.empty(0, dtype=FRAME_DTYPE)
+
+    return frames, max(pos, 0), n_corrupt
+
+
+def count_dropped(seq: np.ndarray, last_seq=None) -> int:
+    """Count the frames missing from the sequence numbers `seq`, which follow
+    up on the previously received sequence number `last_seq`, if any."""
+    seq = np.asarray(seq, dtype=np.int64)
+    if last_seq is not None:
+        seq = np.concatenate(([last_seq], seq))
+    if len(seq) < 2:
+        return 0
+
+    gaps = (np.diff(seq) - 1) % 2**32  # Allow the uint32 to wrap around
+    return int(gaps[gaps < 2**31].sum())
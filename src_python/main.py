@@ -9,6 +9,12 @@ __date__ = "20-12-2023"
 __version__ = "2.0"
 # pylint: disable=bare-except, broad-except
 
+# Report the start-up time per phase and per imported module, when passing
+# `--profile-startup`. Needs to come before all other imports.
+from dodeca_startup import enable_startup_profiler
+
+profiler = enable_startup_profiler(report_at_exit=False)
+
 import os
 import sys
 import time
@@ -85,6 +91,51 @@ QT_VERSION = QtCore.QT_VERSION_STR if QT_LIB in (PYQT5, PYQT6) else QtCore.__ver
 # \end[Mechanism to support both PyQt and PySide]
 # -----------------------------------------------
 
+from dvg_devices.Arduino_protocol_serial import Arduino
+from dodeca_acquisition import Julabo_circulator_idle, check_firmware_version
+
+if __name__ == "__main__":
+    if profiler is not None:
+        profiler.mark("Qt loaded")
+
+    # Set priority of this process to maximum in the operating system
+    print("PID: %s\n" % os.getpid())
+    try:
+        proc = psutil.Process(os.getpid())
+        if os.name == "nt":
+            proc.nice(psutil.REALTIME_PRIORITY_CLASS)  # Windows
+        else:
+            proc.nice(-20)  # Other
+    except:
+        print("Warning: Could not set process to maximum priority.\n")
+
+    # --------------------------------------------------------------------------
+    #   Connect to devices
+    # --------------------------------------------------------------------------
+
+    # Done before loading the GUI stack below, which takes most of the
+    # start-up time, such that a missing device gets reported right away
+
+    # Arduino
+    ard = Arduino(name="Ard", connect_to_specific_ID="Dodecahedron logger")
+    ard.serial_settings["baudrate"] = 115200
+    ard.auto_connect(filepath_last_known_port="config/port_Arduino.txt")
+
+    if not (ard.is_alive):
+        print("\nCheck connection and try resetting the Arduino.")
+        print("Exiting...\n")
+        sys.exit(0)
+
+    check_firmware_version(ard)
+
+    # Julabo
+    julabo = Julabo_circulator_idle(name="Julabo")
+    if julabo.auto_connect(filepath_last_known_port="config/port_Julabo.txt"):
+        julabo.begin()
+
+    if profiler is not None:
+        profiler.mark("Devices connected")
+
 import pyqtgraph as pg
 
 print(f"{QT_LIB:9s} {QT_VERSION}")
@@ -112,17 +163,35 @@ from dvg_pyqt_controls import (
     SS_TEXTBOX_READ_ONLY,
     SS_GROUP,
 )
-from dvg_pyqt_filelogger import FileLogger
 from dvg_pyqtgraph_threadsafe import (
     HistoryChartCurve,
     LegendSelect,
     PlotManager,
 )
 
-from dvg_devices.Arduino_protocol_serial import Arduino
-from dvg_devices.Julabo_circulator_protocol_RS232 import Julabo_circulator
 from dvg_devices.Julabo_circulator_qdev import Julabo_circulator_qdev
-from dvg_qdeviceio import QDeviceIO
+from dvg_qdeviceio import QDeviceIO, DAQ_TRIGGER
+
+from dodeca_acquisition import (
+    State,
+    fetch_ard_frames,
+    fill_julabo_values,
+    frames_to_readings,
+    log_header,
+    log_row_format,
+    log_values,
+    parse_reading,
+)
+from dodeca_align import ALIGN_LATEST, RowAligner
+from dodeca_binary_log import BinaryLogWriter, EXT as BINARY_LOG_EXT
+from dodeca_clock_sync import DeviceClock
+from dodeca_compression import EXTS as COMPRESSION_EXTS
+from dodeca_file_logger import BufferedFileLogger, RotatingFileLogger
+from dodeca_log_rotation import LogRotation
+from dodeca_wire_protocol import FRAME_DTYPE, FRAME_SIZE, decode_frames
+from dodeca_lod_history import LODHistory
+from dodeca_refresh_governor import RefreshGovernor
+from dodeca_timing import DAQTimings
 
 # Global pyqtgraph configuration
 # pg.setConfigOptions(leftButtonPan=False)
@@ -130,9 +199,102 @@ pg.setConfigOption("foreground", "#EEE")
 
 # Constants
 # fmt: off
-DAQ_INTERVAL_MS    = 1000  # [ms]
-CHART_INTERVAL_MS  = 500   # [ms]
-CHART_HISTORY_TIME = 7200  # [s]
+DAQ_INTERVAL_MS     = 1000    # [ms]
+GUI_INTERVAL_MS     = 100     # [ms]
+CHART_INTERVAL_MS   = 500     # [ms]
+CHART_COALESCE_MS   = 50      # [ms] Bundles redraws requested in a burst
+CHART_HISTORY_TIME  = 604800  # [s] Total history, coarser with age
+CHART_MEMORY_BUDGET = 2e6     # [bytes] Sets the span of full resolution
+CHART_LOD_FACTOR    = 12      # Roll-up factor between levels of detail
+# fmt: on
+
+# Let the Arduino push its readings at a fixed rate, instead of polling it every
+# `DAQ_INTERVAL_MS`? A dedicated thread then continuously reads in the stream,
+# taking the serial round trip out of each sample.
+# fmt: off
+ARD_STREAMING          = False
+ARD_STREAM_INTERVAL_MS = 1000  # [ms]
+# fmt: on
+
+# Let the Arduino send its readings as binary frames at full precision, with a
+# sequence number and checksum, instead of as text? See
+# `dodeca_wire_protocol.py`.
+ARD_BINARY_FRAMES = False
+
+# Let the Arduino take its readings on its own timer into an on-board ring
+# buffer, and fetch all new readings in one batch every `DAQ_INTERVAL_MS`?
+# Makes the acquisition immune to stalls of this PC shorter than the span of the
+# ring buffer, 2048 readings. Always uses binary frames. Overrules
+# `ARD_STREAMING`.
+# fmt: off
+ARD_RING_BUFFER        = False
+ARD_SAMPLE_INTERVAL_MS = 1000  # [ms]
+# fmt: on
+
+# Timestamp the readings by the clock of the Arduino, instead of by their time
+# of arrival at this PC? The offset and drift between both clocks get estimated
+# online, see `dodeca_clock_sync.py`. Takes the serial latency jitter out of the
+# sample times in the charts and the log.
+ARD_CLOCK_SYNC = False
+
+# The Julabo gets polled on its own thread at its own rate, never delaying the
+# Arduino. Its readings get timestamped and aligned to the time of each Arduino
+# reading, by taking the latest Julabo reading before it ("latest") or by
+# interpolating the bath temperature between the Julabo readings around it
+# ("interp"). The latter holds back the logging of each row until the next
+# Julabo reading is in. The age of the Julabo readings gets logged as well.
+# fmt: off
+JULABO_INTERVAL_MS = 1000      # [ms]
+JULABO_ALIGN       = "latest"  # "latest" or "interp"
+# fmt: on
+
+# Also record to a memory-mappable binary log file, next to the text log? See
+# `dodeca_binary_log.py`. It can be read back by `dodeca_read_log.read_log()`.
+RECORD_BINARY_LOG = False
+
+# Queue the log data in memory and write it out in bulk from a background
+# thread? Keeps disk I/O off the DAQ thread. The data gets flushed to disk every
+# `LOG_FLUSH_ROWS` rows or `LOG_FLUSH_INTERVAL_S` seconds, which bounds the
+# data lost on a crash. See `dodeca_file_logger.py`.
+# fmt: off
+LOG_BUFFERED         = False
+LOG_FLUSH_ROWS       = 60    # [rows]
+LOG_FLUSH_INTERVAL_S = 10    # [s]
+LOG_FSYNC            = True  # Force each flush onto the physical disk?
+# fmt: on
+
+# Split long recordings into segments of at most `LOG_ROTATE_HOURS` hours of
+# data or `LOG_ROTATE_MB` MB of text, whichever comes first? None disables
+# either. Each segment repeats the header and continues the time column, and a
+# manifest ties the segments together. Passing the manifest to
+# `dodeca_read_log.read_log()` reads back the whole recording. See
+# `dodeca_log_rotation.py`.
+# fmt: off
+LOG_ROTATE_HOURS = None  # [h]
+LOG_ROTATE_MB    = None  # [MB]
+# fmt: on
+
+# Compress the log file on the fly by "gzip" or "lzma"? None disables it. A
+# flush point gets made at least every `LOG_FLUSH_INTERVAL_S` seconds, which
+# bounds the data lost on a crash. The log files get the extension `.txt.gz` or
+# `.txt.xz` and can be read back by `dodeca_read_log.read_log()` as usual. At low
+# DAQ rates, gzip compresses better than lzma, see `dodeca_compression.py` and
+# `python dodeca_benchmark.py --compare-compression`.
+LOG_COMPRESSION = None
+
+# Also log the timings of each reading as extra columns, i.e. the lateness of
+# the DAQ tick and the time spent on the serial query, on parsing and on
+# appending to the chart history? See `dodeca_timing.py`.
+LOG_DAQ_TIMINGS = False
+
+# Stretch the refresh intervals of the GUI and the charts when redrawing them
+# gets costly, e.g. on a slow or busy PC, such that together they take up at
+# most `REFRESH_BUDGET` of the time of the main thread? Up to
+# `REFRESH_MAX_STRETCH` times their nominal interval `GUI_INTERVAL_MS` and
+# `CHART_INTERVAL_MS`. See `dodeca_refresh_governor.py`.
+# fmt: off
+REFRESH_BUDGET      = 0.1  # Fraction of wall time, shared 1:3 by GUI:charts
+REFRESH_MAX_STRETCH = 10
 # fmt: on
 
 # Show debug info in terminal? Warning: Slow! Do not leave on unintentionally.
@@ -152,21 +314,142 @@ def get_current_date_time():
 #   Arduino state
 # ------------------------------------------------------------------------------
 
+state = State()
+
 
-class State(object):
-    """Reflects the actual readings, parsed into separate variables, of the
-    Arduino. There should only be one instance of the State class.
+def ard_sample_interval_ms() -> int:
+    """Interval [ms] at which the Arduino takes its readings, following the
+    acquisition mode. Sets the number of samples spanning the chart history.
     """
+    if ARD_RING_BUFFER:
+        return ARD_SAMPLE_INTERVAL_MS
+    if ARD_STREAMING:
+        return ARD_STREAM_INTERVAL_MS
+    return DAQ_INTERVAL_MS
 
-    def __init__(self):
-        self.time = np.nan  # [s]
-        self.ds_temp = np.nan  # ['C]
-        self.bme_temp = np.nan  # ['C]
-        self.bme_humi = np.nan  # [%]
-        self.bme_pres = np.nan  # [bar]
 
+# Timings of the DAQ ticks, against their nominal interval
+if ARD_STREAMING and not ARD_RING_BUFFER:
+    timings = DAQTimings(ARD_STREAM_INTERVAL_MS / 1000)
+else:
+    timings = DAQTimings(DAQ_INTERVAL_MS / 1000)
+
+# Maps the Arduino time onto the PC time, when `ARD_CLOCK_SYNC`
+ard_clock = DeviceClock()
+
+# Adapts the refresh intervals of the GUI and the charts to their cost
+governor = RefreshGovernor(REFRESH_BUDGET)
+governor.add_refresh(
+    "GUI", 0.25, GUI_INTERVAL_MS, GUI_INTERVAL_MS * REFRESH_MAX_STRETCH
+)
+governor.add_refresh(
+    "charts", 0.75, CHART_INTERVAL_MS, CHART_INTERVAL_MS * REFRESH_MAX_STRETCH
+)
+
+# ------------------------------------------------------------------------------
+#   TimedGraphicsLayoutWidget
+# ------------------------------------------------------------------------------
+
+
+class TimedGraphicsLayoutWidget(pg.GraphicsLayoutWidget):
+    """A `GraphicsLayoutWidget` keeping track of the time spent on painting
+    it. Painting happens in the event loop, after the curves have been given
+    their new data."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.paint_time = 0.0  # Accumulated time spent on painting [s]
+
+    def paintEvent(self, ev):  # pylint: disable=invalid-name
+        t_0 = time.perf_counter()
+        super().paintEvent(ev)
+        self.paint_time += time.perf_counter() - t_0
+
+
+# ------------------------------------------------------------------------------
+#   LODHistoryChartCurve
+# ------------------------------------------------------------------------------
+
+
+class LODHistoryChartCurve(HistoryChartCurve):
+    """A `HistoryChartCurve` backed by a level-of-detail history instead of a
+    single ring buffer, see `dodeca_lod_history.LODHistory`. Each redraw takes
+    the level of detail matching the currently shown x-range, e.g. as set by
+    the preset buttons of the `PlotManager`. Hence, the redraw cost stays
+    constant however long the history gets.
+
+    Several curves can share a single multi-channel history, each drawing its
+    own `channel` out of it.
+
+    A redraw is only needed when the curve is visible and when the history
+    got appended to or the shown x-range changed since the last redraw, see
+    `is_stale()`.
+    """
+
+    def __init__(
+        self,
+        history: LODHistory,
+        linked_curve: pg.PlotDataItem,
+        channel: int = 0,
+    ):
+        # The ring buffers of the base class will remain unused
+        super().__init__(capacity=1, linked_curve=linked_curve)
+        self.capacity = history.capacity
+        self.history = history
+        self.channel = channel
+        self._snapshot_span = np.nan
+        self._snapshot_version = -1  # Version of the history in the snapshot
+
+    def appendData(self, x, y):
+        """Only valid for a history with a single channel. Append to the
+        shared history directly otherwise."""
+        self.history.append(x, y)
+
+    def extendData(self, x_list, y_list):
+        for x, y in zip(x_list, y_list):
+            self.history.append(x, y)
+
+    def clear(self):
+        self.history.clear()
+        self.update()
+
+    def update(self, create_snapshot: bool = True):
+        span = self._shown_span()
+
+        # A change of x-range might require a different level of detail
+        if create_snapshot or span != self._snapshot_span:
+            # Read the version first: appends racing the snapshot will then
+            # leave the curve stale, instead of getting missed
+            self._snapshot_version = self.history.version
+            self._snapshot_x, self._snapshot_y = self.history.snapshot(
+                span, self.channel
+            )
+            self._snapshot_span = span
+
+        super().update(create_snapshot=False)
+
+    def is_stale(self) -> bool:
+        """Does the curve need a redraw to be up-to-date on screen?"""
+        if not self.curve.isVisible():
+            return False
+
+        return (
+            self.history.version != self._snapshot_version
+            or self._shown_span() != self._snapshot_span
+        )
+
+    def _shown_span(self) -> float:
+        """Span of history [s] currently shown."""
+        view_box = self.curve.getViewBox()
+        if view_box is None:
+            return np.inf
+
+        return max(-view_box.viewRange()[0][0] * self.x_axis_divisor, 0)
+
+    @property
+    def size(self):
+        return (len(self.history), len(self.history))
 
-state = State()
 
 # ------------------------------------------------------------------------------
 #   MainWindow
@@ -189,11 +472,13 @@ class MainWindow(QtWid.QWidget):
         self.qlbl_update_counter = QtWid.QLabel("0")
         self.qlbl_DAQ_rate = QtWid.QLabel("DAQ: nan Hz")
         self.qlbl_DAQ_rate.setStyleSheet("QLabel {min-width: 7em}")
+        self.qlbl_refresh = QtWid.QLabel("")
 
         vbox_left = QtWid.QVBoxLayout()
         vbox_left.addWidget(self.qlbl_update_counter, stretch=0)
         vbox_left.addStretch(1)
         vbox_left.addWidget(self.qlbl_DAQ_rate, stretch=0)
+        vbox_left.addWidget(self.qlbl_refresh, stretch=0)
 
         # Middle box
         self.qlbl_title = QtWid.QLabel(
@@ -241,7 +526,7 @@ class MainWindow(QtWid.QWidget):
         #  Charts
         # -------------------------
 
-        self.gw = pg.GraphicsLayoutWidget()
+        self.gw = TimedGraphicsLayoutWidget()
 
         # Plot: Julabo temperatures
         p = {"color": "#EEE", "font-size": "10pt"}
@@ -271,8 +556,21 @@ class MainWindow(QtWid.QWidget):
             plot.setAutoVisible(y=True)
             plot.setRange(xRange=[-CHART_HISTORY_TIME, 0])
 
+        # Level-of-detail history of all channels shared by the curves. One
+        # sample contains, in order: Julabo setpoint, Julabo bath temperature,
+        # DS temperature, BME temperature, BME humidity and BME pressure.
+        self.history = LODHistory.from_memory_budget(
+            budget_bytes=CHART_MEMORY_BUDGET,
+            total_samples=round(
+                CHART_HISTORY_TIME * 1e3 / ard_sample_interval_ms()
+            ),
+            n_channels=6,
+            factor=CHART_LOD_FACTOR,
+            dtype=np.float32,
+        )
+
         # Curves
-        capacity = round(CHART_HISTORY_TIME * 1e3 / DAQ_INTERVAL_MS)
+
         PEN_01 = pg.mkPen(color=[255, 255, 0], width=3)
         PEN_02 = pg.mkPen(color=[252, 15, 192], width=3)
         PEN_03 = pg.mkPen(color=[0, 255, 255], width=3)
@@ -280,30 +578,36 @@ class MainWindow(QtWid.QWidget):
         PEN_05 = pg.mkPen(color=[255, 127, 39], width=3)
         PEN_06 = pg.mkPen(color=[0, 255, 0], width=3)
 
-        self.tscurve_julabo_setp = HistoryChartCurve(
-            capacity=capacity,
+        self.tscurve_julabo_setp = LODHistoryChartCurve(
+            history=self.history,
+            channel=0,
             linked_curve=self.pi_julabo.plot(pen=PEN_05, name="Julabo setp."),
         )
 
-        self.tscurve_julabo_bath = HistoryChartCurve(
-            capacity=capacity,
+        self.tscurve_julabo_bath = LODHistoryChartCurve(
+            history=self.history,
+            channel=1,
             linked_curve=self.pi_julabo.plot(pen=PEN_06, name="Julabo bath"),
         )
 
-        self.tscurve_ds_temp = HistoryChartCurve(
-            capacity=capacity,
+        self.tscurve_ds_temp = LODHistoryChartCurve(
+            history=self.history,
+            channel=2,
             linked_curve=self.pi_temp.plot(pen=PEN_01, name="DS temp."),
         )
-        self.tscurve_bme_temp = HistoryChartCurve(
-            capacity=capacity,
+        self.tscurve_bme_temp = LODHistoryChartCurve(
+            history=self.history,
+            channel=3,
             linked_curve=self.pi_temp.plot(pen=PEN_02, name="BME temp."),
         )
-        self.tscurve_bme_humi = HistoryChartCurve(
-            capacity=capacity,
+        self.tscurve_bme_humi = LODHistoryChartCurve(
+            history=self.history,
+            channel=4,
             linked_curve=self.pi_humi.plot(pen=PEN_03, name="BME humi."),
         )
-        self.tscurve_bme_pres = HistoryChartCurve(
-            capacity=capacity,
+        self.tscurve_bme_pres = LODHistoryChartCurve(
+            history=self.history,
+            channel=5,
             linked_curve=self.pi_pres.plot(pen=PEN_04, name="BME pres."),
         )
 
@@ -316,6 +620,17 @@ class MainWindow(QtWid.QWidget):
             self.tscurve_bme_pres,
         ]
 
+        # Redraw right away when a curve gets shown again or the x-range
+        # changes, bundling a burst of such requests into a single redraw
+        self.timer_chart_redraw = QtCore.QTimer(self)
+        self.timer_chart_redraw.setSingleShot(True)
+        self.timer_chart_redraw.setInterval(CHART_COALESCE_MS)
+        self.timer_chart_redraw.timeout.connect(self.update_chart)
+        for tscurve in self.tscurves:
+            tscurve.curve.visibleChanged.connect(self.request_chart_update)
+        for plot in self.plots:
+            plot.sigXRangeChanged.connect(self.request_chart_update)
+
         #  Group `Readings`
         # -------------------------
 
@@ -397,6 +712,18 @@ class MainWindow(QtWid.QWidget):
                     "x_axis_divisor": 60,
                     "x_axis_range": (-120, 0),
                 },
+                {
+                    "button_label": "24 h",
+                    "x_axis_label": "history (hour)",
+                    "x_axis_divisor": 3600,
+                    "x_axis_range": (-24, 0),
+                },
+                {
+                    "button_label": "7 days",
+                    "x_axis_label": "history (day)",
+                    "x_axis_divisor": 86400,
+                    "x_axis_range": (-7, 0),
+                },
             ],
         )
         self.plot_manager.add_clear_button(linked_curves=self.tscurves)
@@ -405,10 +732,25 @@ class MainWindow(QtWid.QWidget):
         qgrp_chart = QtWid.QGroupBox("Charts")
         qgrp_chart.setLayout(self.plot_manager.grid)
 
+        #  Group 'DAQ timings'
+        # -------------------------
+
+        self.qlbl_timings = QtWid.QLabel(font=QtGui.QFont("Courier New", 8))
+        self.qpbt_reset_timings = QtWid.QPushButton("Reset")
+        self.qpbt_reset_timings.clicked.connect(lambda: timings.reset())
+
+        grid = QtWid.QGridLayout()
+        grid.addWidget(self.qlbl_timings, 0, 0)
+        grid.addWidget(self.qpbt_reset_timings, 1, 0, QtCore.Qt.AlignLeft)
+
+        qgrp_timings = QtWid.QGroupBox("DAQ timings")
+        qgrp_timings.setLayout(grid)
+
         vbox = QtWid.QVBoxLayout()
         vbox.addWidget(qgrp_readings)
         vbox.addWidget(qgrp_comments)
         vbox.addWidget(qgrp_chart, alignment=QtCore.Qt.AlignLeft)
+        vbox.addWidget(qgrp_timings)
         vbox.addStretch()
 
         # Round up bottom frame
@@ -449,14 +791,60 @@ class MainWindow(QtWid.QWidget):
         self.qlin_bme_temp.setText("%.1f" % state.bme_temp)
         self.qlin_bme_humi.setText("%.1f" % state.bme_humi)
         self.qlin_bme_pres.setText("%.1f" % state.bme_pres)
+        if ARD_CLOCK_SYNC:
+            self.qlbl_timings.setText(
+                timings.report()
+                + "\n\nArduino clock drift: %+.1f ppm" % ard_clock.drift_ppm
+            )
+        else:
+            self.qlbl_timings.setText(timings.report())
+        self.qlbl_refresh.setText(governor.report())
+
+    @Slot()
+    def refresh_GUI(self):
+        """Update the GUI and adapt the refresh interval to its cost."""
+        t_0 = time.perf_counter()
+        self.update_GUI()
+        interval_ms = governor.add_cost("GUI", time.perf_counter() - t_0)
+        if interval_ms != timer_GUI.interval():
+            timer_GUI.setInterval(interval_ms)
+
+    @Slot()
+    def refresh_charts(self):
+        """Update the charts and adapt the refresh interval to their cost,
+        including the painting since the previous refresh."""
+        t_0 = time.perf_counter()
+        self.update_chart()
+        cost = time.perf_counter() - t_0 + self.gw.paint_time
+        self.gw.paint_time = 0.0
+        interval_ms = governor.add_cost("charts", cost)
+        if interval_ms != timer_charts.interval():
+            timer_charts.setInterval(interval_ms)
+
+    @Slot()
+    def request_chart_update(self):
+        if not self.timer_chart_redraw.isActive():
+            self.timer_chart_redraw.start()
 
     @Slot()
     def update_chart(self):
+        """Redraw the curves that are stale. Skipped altogether while the
+        window is minimized or, where the platform reports it, fully covered
+        by other windows."""
+        window_handle = self.windowHandle()
+        if (
+            self.isMinimized()
+            or window_handle is None
+            or not window_handle.isExposed()
+        ):
+            return
+
         if DEBUG:
             tprint("update_chart")
 
         for tscurve in self.tscurves:
-            tscurve.update()
+            if tscurve.is_stale():
+                tscurve.update()
 
 
 # ------------------------------------------------------------------------------
@@ -467,8 +855,14 @@ class MainWindow(QtWid.QWidget):
 def stop_running():
     app.processEvents()
     qdev_ard.quit()
+    if (ARD_STREAMING or ARD_RING_BUFFER) and ard.is_alive:
+        ard.write("halt")
     qdev_julabo.quit()
+    if log.is_recording():
+        flush_aligned_rows_to_log()
     log.close()
+    binlog.close()
+    rotation.finish()
 
     print("Stopping timers................ ", end="")
     timer_GUI.stop()
@@ -508,11 +902,35 @@ def about_to_quit():
 
 
 def DAQ_function():
+    t_tick = time.perf_counter()
+
     # Date-time keeping
     str_cur_date, str_cur_time, str_cur_datetime = get_current_date_time()
 
-    # Query the Arduino for its state
-    success, tmp_state = ard.query_ascii_values("?", delimiter="\t")
+    t_query = time.perf_counter()
+    if ARD_RING_BUFFER:
+        # Fetch all new readings from the ring buffer of the Arduino
+        success, readings = fetch_ard_frames(ard, state)
+    elif ARD_BINARY_FRAMES:
+        # Decode all frames received so far, waiting for at least one
+        success, readings = read_ard_frames()
+    elif ARD_STREAMING:
+        # Wait for the next reading pushed by the Arduino
+        success, tmp_state = read_ard_stream()
+        readings = [tmp_state]
+    else:
+        # Query the Arduino for its state
+        success, tmp_state = ard.query_ascii_values("?", delimiter="\t")
+        readings = [tmp_state]
+
+    t_read = time.perf_counter()
+    timings.add("query", t_read - t_query)
+    if ARD_STREAMING and not ARD_RING_BUFFER:
+        # The stream sets the pace, not the worker
+        timings.tick(t_read)
+    else:
+        timings.tick(t_tick)
+
     if not (success):
         dprint(
             "'%s' reports IOError @ %s %s"
@@ -520,69 +938,231 @@ def DAQ_function():
         )
         return False
 
-    # Parse readings into separate state variables
-    try:
-        (
+    if len(readings) == 0:
+        # No new readings yet
+        return True
+
+    # We will use PC time instead. Readings received in one go get spread out
+    # backwards in time, following the Arduino time in between them. Or, when
+    # `ARD_CLOCK_SYNC`, the Arduino time gets mapped onto the PC time.
+    t_now = time.perf_counter()
+    if ARD_CLOCK_SYNC:
+        # The most recent reading bounds the clock offset the closest
+        ard_clock.update(readings[-1][0] / 1000, t_now)
+
+    for tmp_state in readings:
+        t_0 = time.perf_counter()
+
+        # Parse readings into separate state variables
+        try:
+            parse_reading(state, tmp_state)
+        except Exception as err:
+            pft(err, 3)
+            dprint(
+                "'%s' reports IOError @ %s %s"
+                % (ard.name, str_cur_date, str_cur_time)
+            )
+            return False
+
+        if ARD_CLOCK_SYNC:
+            state.time = ard_clock.to_host(state.time)
+        else:
+            state.time = t_now - (readings[-1][0] - tmp_state[0]) / 1000
+
+        t_1 = time.perf_counter()
+        timings.add("parse", t_1 - t_0)
+
+        # Add readings to the chart history shared by all curves
+        julabo_values, _ = julabo.history.sample_at(state.time)
+        window.history.append(
             state.time,
-            state.ds_temp,
-            state.bme_temp,
-            state.bme_humi,
-            state.bme_pres,
-        ) = tmp_state
-        state.time /= 1000  # Arduino time, [msec] to [s]
-        state.bme_pres /= 100  # [Pa] to [mbar]
-    except Exception as err:
-        pft(err, 3)
-        dprint(
-            "'%s' reports IOError @ %s %s"
-            % (ard.name, str_cur_date, str_cur_time)
+            (
+                julabo_values[0],
+                julabo_values[1],
+                state.ds_temp,
+                state.bme_temp,
+                state.bme_humi,
+                state.bme_pres,
+            ),
         )
-        return False
 
-    # Catch very intermittent DS18B20 sensor errors
-    if state.ds_temp <= -127.0:
-        state.ds_temp = np.nan
+        t_2 = time.perf_counter()
+        timings.add("append", t_2 - t_1)
+
+        # Logging to file
+        if RECORD_BINARY_LOG and not log.is_recording():
+            # In case a recording is about to start
+            binlog.filepath = str_cur_datetime + BINARY_LOG_EXT
 
-    # We will use PC time instead
-    state.time = time.perf_counter()
+        log.update(
+            filepath=str_cur_datetime
+            + ".txt"
+            + COMPRESSION_EXTS.get(LOG_COMPRESSION, ""),
+            mode="w",
+        )
+
+        if binlog.is_open() and not log.is_recording():
+            binlog.close()
 
-    # Add readings to chart histories
-    window.tscurve_julabo_setp.appendData(state.time, julabo.state.setpoint)
-    window.tscurve_julabo_bath.appendData(state.time, julabo.state.bath_temp)
-    window.tscurve_ds_temp.appendData(state.time, state.ds_temp)
-    window.tscurve_bme_temp.appendData(state.time, state.bme_temp)
-    window.tscurve_bme_humi.appendData(state.time, state.bme_humi)
-    window.tscurve_bme_pres.appendData(state.time, state.bme_pres)
+        if rotation.is_active() and not log.is_recording():
+            rotation.finish()
 
-    # Logging to file
-    log.update(filepath=str_cur_datetime + ".txt", mode="w")
+        timings.add("log", time.perf_counter() - t_2)
 
     # Return success
     return True
 
 
+def read_ard_stream():
+    """Read in the next line of the stream of readings pushed by the Arduino.
+    Blocks until a full line has been received or the serial read timeout
+    has expired.
+
+    Returns: (success, list of float)
+    """
+    success, reply = ard.readline()
+    if not success:
+        return False, []
+
+    try:
+        return True, list(map(float, reply.split("\t")))
+    except ValueError as err:
+        pft(err, 3)
+        return False, []
+
+
+def read_ard_frames():
+    """Read in and decode the binary frames sent by the Arduino. When not
+    streaming, the Arduino is queried for a single frame first. Blocks until
+    at least one frame has been received or the serial read timeout has
+    expired. Dropped and corrupted frames are tallied in `state`.
+
+    Returns: (success, numpy.ndarray of shape (N, 6))
+    """
+    if not ARD_STREAMING:
+        if not ard.write("?"):
+            return False, []
+
+    frames = np.empty(0, dtype=FRAME_DTYPE)
+    while len(frames) == 0:
+        try:
+            data = ard.ser.read(
+                max(1, FRAME_SIZE - len(ard_rxbuf), ard.ser.in_waiting)
+            )
+        except Exception as err:
+            pft(err)
+            return False, []
+
+        if len(data) == 0:
+            pft("Received 0 bytes. Read probably timed out.")
+            return False, []
+
+        ard_rxbuf.extend(data)
+        frames, n_consumed, n_corrupt = decode_frames(ard_rxbuf)
+        del ard_rxbuf[:n_consumed]
+        state.n_frames_corrupt += n_corrupt
+
+    return True, frames_to_readings(state, frames)
+
+
 def write_header_to_log():
-    log.write("[HEADER]\n")
-    log.write(window.qtxt_comments.toPlainText())
-    log.write("\n\n[DATA]\n")
-    log.write("[s]\t[±0.5 °C]\t[±0.5 °C]\t[±3 pct]\t[±1 mbar]\t[°C]\t[°C]\n")
-    log.write(
-        "time\tDS_temp\tBME_temp\tBME_humi\tBME_pres\tJulabo_setp\tJulabo_bath\n"
+    header = log_header(
+        window.qtxt_comments.toPlainText(), timings=LOG_DAQ_TIMINGS
+    )
+    log.write(header)
+    julabo_aligner.clear()
+    rotation.start(
+        log.filepath,
+        header,
+        binlog.filepath if RECORD_BINARY_LOG else None,
     )
 
+    if RECORD_BINARY_LOG:
+        try:
+            binlog.open(binlog.filepath, header)
+        except Exception as err:
+            pft(err, 3)
+
 
 def write_data_to_log():
-    log.write(
-        "%.1f\t%.1f\t%.1f\t%.1f\t%.1f\t%.2f\t%.2f\n"
-        % (
-            log.elapsed(),
-            state.ds_temp,
-            state.bme_temp,
-            state.bme_humi,
-            state.bme_pres,
-            julabo.state.setpoint,
-            julabo.state.bath_temp,
+    # The Julabo readings get filled in once aligned
+    values = log_values(
+        # Readings received in a batch lie in the past
+        log.elapsed_at(state.time),
+        state,
+        timings=timings if LOG_DAQ_TIMINGS else None,
+    )
+    julabo_aligner.push(state.time, values)
+    write_aligned_rows_to_log()
+
+
+def write_aligned_rows_to_log(flush: bool = False):
+    for values in julabo_aligner.pop_ready(time.perf_counter(), flush):
+        write_row_to_log(values)
+
+
+def flush_aligned_rows_to_log():
+    """Write out the rows still waiting on the Julabo, at the end of the
+    recording."""
+    write_aligned_rows_to_log(flush=True)
+
+
+def write_row_to_log(values: tuple):
+    if rotation.due(values[0]):
+        rotate_log()
+
+    if LOG_BUFFERED:
+        log.write_row(values)
+        # Only format the row for its length when rotating by size
+        n_bytes = len(log.row_format % values) if LOG_ROTATE_MB else 0
+    else:
+        line = log_row_format(LOG_DAQ_TIMINGS) % values
+        log.write(line)
+        n_bytes = len(line)
+    rotation.add_row(values[0], n_bytes)
+
+    if binlog.is_open():
+        binlog.write(*values)
+
+
+def rotate_log():
+    """Continue the recording in the next segment, see `LogRotation`."""
+    filepath, binary_filepath = rotation.next_segment()
+    if not log.rotate(filepath):
+        rotation.abort_segment()  # Continue in the current segment
+        return
+
+    log.write(rotation.header)
+
+    if binary_filepath is not None:
+        binlog.close()
+        try:
+            binlog.open(binary_filepath, rotation.header)
+        except Exception as err:
+            pft(err, 3)
+
+
+def create_file_logger() -> RotatingFileLogger:
+    """File logger set up according to `LOG_BUFFERED` and `LOG_COMPRESSION`,
+    writing through `write_header_to_log()` and `write_data_to_log()`."""
+    if LOG_BUFFERED:
+        return BufferedFileLogger(
+            write_header_function=write_header_to_log,
+            write_data_function=write_data_to_log,
+            stop_function=flush_aligned_rows_to_log,
+            row_format=log_row_format(LOG_DAQ_TIMINGS),
+            flush_rows=LOG_FLUSH_ROWS,
+            flush_interval_s=LOG_FLUSH_INTERVAL_S,
+            fsync=LOG_FSYNC,
+            compression=LOG_COMPRESSION,
         )
+
+    return RotatingFileLogger(
+        write_header_function=write_header_to_log,
+        write_data_function=write_data_to_log,
+        stop_function=flush_aligned_rows_to_log,
+        compression=LOG_COMPRESSION,
+        compression_flush_s=LOG_FLUSH_INTERVAL_S,
     )
 
 
@@ -591,35 +1171,8 @@ def write_data_to_log():
 # ------------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    # Set priority of this process to maximum in the operating system
-    print("PID: %s\n" % os.getpid())
-    try:
-        proc = psutil.Process(os.getpid())
-        if os.name == "nt":
-            proc.nice(psutil.REALTIME_PRIORITY_CLASS)  # Windows
-        else:
-            proc.nice(-20)  # Other
-    except:
-        print("Warning: Could not set process to maximum priority.\n")
-
-    # --------------------------------------------------------------------------
-    #   Connect to devices
-    # --------------------------------------------------------------------------
-
-    # Arduino
-    ard = Arduino(name="Ard", connect_to_specific_ID="Dodecahedron logger")
-    ard.serial_settings["baudrate"] = 115200
-    ard.auto_connect(filepath_last_known_port="config/port_Arduino.txt")
-
-    if not (ard.is_alive):
-        print("\nCheck connection and try resetting the Arduino.")
-        print("Exiting...\n")
-        sys.exit(0)
-
-    # Julabo
-    julabo = Julabo_circulator(name="Julabo")
-    if julabo.auto_connect(filepath_last_known_port="config/port_Julabo.txt"):
-        julabo.begin()
+    if profiler is not None:
+        profiler.mark("GUI stack loaded")
 
     # --------------------------------------------------------------------------
     #   Create application
@@ -636,16 +1189,33 @@ if __name__ == "__main__":
 
     # Arduino
     qdev_ard = QDeviceIO(ard)
-    qdev_ard.create_worker_DAQ(
-        DAQ_function=DAQ_function,
-        DAQ_interval_ms=DAQ_INTERVAL_MS,
-        critical_not_alive_count=3,
-        debug=DEBUG,
-    )
+    if ARD_STREAMING and not ARD_RING_BUFFER:
+        # The worker continuously blocks on reading in the next line
+        qdev_ard.create_worker_DAQ(
+            DAQ_trigger=DAQ_TRIGGER.CONTINUOUS,
+            DAQ_function=DAQ_function,
+            critical_not_alive_count=3,
+            debug=DEBUG,
+        )
+    else:
+        qdev_ard.create_worker_DAQ(
+            DAQ_function=DAQ_function,
+            DAQ_interval_ms=DAQ_INTERVAL_MS,
+            critical_not_alive_count=3,
+            debug=DEBUG,
+        )
 
     # Julabo
     qdev_julabo = Julabo_circulator_qdev(
-        dev=julabo, DAQ_interval_ms=DAQ_INTERVAL_MS, debug=DEBUG
+        dev=julabo, DAQ_interval_ms=JULABO_INTERVAL_MS, debug=DEBUG
+    )
+
+    # Aligns the Julabo readings to the Arduino readings in the log
+    julabo_aligner = RowAligner(
+        julabo.history,
+        fill=fill_julabo_values,
+        mode=JULABO_ALIGN if julabo.is_alive else ALIGN_LATEST,
+        max_wait_s=3 * JULABO_INTERVAL_MS / 1000,
     )
 
     # --------------------------------------------------------------------------
@@ -655,17 +1225,13 @@ if __name__ == "__main__":
     window = MainWindow()
 
     # Connect signals
-    qdev_ard.signal_DAQ_updated.connect(window.update_GUI)
     qdev_ard.signal_connection_lost.connect(notify_connection_lost)
 
     # --------------------------------------------------------------------------
     #   File logger
     # --------------------------------------------------------------------------
 
-    log = FileLogger(
-        write_header_function=write_header_to_log,
-        write_data_function=write_data_to_log,
-    )
+    log = create_file_logger()
     log.signal_recording_started.connect(
         lambda filepath: window.qpbt_record.setText(
             "Recording to file: %s" % filepath
@@ -675,26 +1241,54 @@ if __name__ == "__main__":
         lambda: window.qpbt_record.setText("Click to start recording to file")
     )
 
+    # Optional binary twin of the text log
+    binlog = BinaryLogWriter()
+
+    # Splits long recordings into segments
+    rotation = LogRotation(max_hours=LOG_ROTATE_HOURS, max_MB=LOG_ROTATE_MB)
+
     # --------------------------------------------------------------------------
     #   Timers
     # --------------------------------------------------------------------------
 
+    # The GUI does not get refreshed on every `signal_DAQ_updated`, as that
+    # would tie the redrawing to the DAQ rate
     timer_GUI = QtCore.QTimer()
-    timer_GUI.timeout.connect(window.update_GUI)
-    timer_GUI.start(100)
+    timer_GUI.timeout.connect(window.refresh_GUI)
+    timer_GUI.start(GUI_INTERVAL_MS)
 
     timer_charts = QtCore.QTimer()
-    timer_charts.timeout.connect(window.update_chart)
+    timer_charts.timeout.connect(window.refresh_charts)
     timer_charts.start(CHART_INTERVAL_MS)
 
     # --------------------------------------------------------------------------
     #   Start the main GUI event loop
     # --------------------------------------------------------------------------
 
+    if ARD_BINARY_FRAMES:
+        ard_rxbuf = bytearray()  # Received bytes not yet decoded into frames
+        ard.write("fmt bin")
+
+    if ARD_RING_BUFFER:
+        ard.write("sample %i" % ARD_SAMPLE_INTERVAL_MS)
+    elif ARD_STREAMING:
+        # Allow for the read timeout to span at least two readings
+        ard.ser.timeout = max(2, 2 * ARD_STREAM_INTERVAL_MS / 1000)
+        ard.ser.reset_input_buffer()
+        ard.write("stream %i" % ARD_STREAM_INTERVAL_MS)
+
     qdev_ard.start()
     qdev_julabo.start()
 
+    if ARD_STREAMING and not ARD_RING_BUFFER:
+        # Worker in mode CONTINUOUS starts up paused
+        qdev_ard.unpause_DAQ()
+
     window.show()
+    if profiler is not None:
+        profiler.mark("Window shown")
+        profiler.print_report()
+
     if QT_LIB in (PYQT5, PYSIDE2):
         sys.exit(app.exec_())
     else: